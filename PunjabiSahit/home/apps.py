@@ -2,4 +2,10 @@ from django.apps import AppConfig
 
 class HomeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "home"
\ No newline at end of file
+    name = "home"
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
+        # Register system checks
+        from . import checks  # noqa: F401
@@ -0,0 +1,192 @@
+"""
+Prefix autocomplete for dictionary headwords.
+
+Each process keeps an in-memory index of the live dictionary entries: one
+sorted list of (normalized headword, entry id) pairs covering the Gurmukhi,
+Shahmukhi and Roman headwords. A prefix query is a bisect into that list, so
+answering a keystroke never touches the database or the search backend.
+
+The index is updated in place when an entry is published, unpublished or
+deleted in this process, and rebuilt in the background by the other
+processes (see home.process_index).
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+from .process_index import ProcessIndex
+from .utils import normalize_gurmukhi
+
+# Cache key of the counter that is bumped whenever the dictionary changes
+AUTOCOMPLETE_GENERATION_KEY = 'dictionary_autocomplete:generation'
+
+# Rebuild the index at least this often (seconds), so view counts stay fresh
+AUTOCOMPLETE_MAX_AGE = 60 * 60
+
+# Maximum number of suggestions returned for a query
+AUTOCOMPLETE_MAX_RESULTS = 20
+
+# Prefixes up to this length match many entries, so their ranked results are cached
+SHORT_PREFIX_LENGTH = 2
+
+# Headword fields that are indexed
+HEADWORD_FIELDS = ['headword_gurmukhi', 'headword_shahmukhi', 'headword_roman_simple']
+
+
+def normalize_prefix(text):
+    """
+    Normalize a headword or typed prefix for matching.
+
+    Args:
+        text (str): Text in any of the three scripts
+
+    Returns:
+        str: The text without zero-width characters, collapsed spaces and case
+    """
+    return normalize_gurmukhi(text).casefold()
+
+
+class AutocompleteIndex:
+    """
+    Sorted in-memory index of dictionary headwords.
+
+    Args:
+        rows: Iterable of dicts with 'id', 'url_path', 'view_count' and the
+              HEADWORD_FIELDS of each entry
+    """
+
+    def __init__(self, rows=()):
+        self.entries = {}
+        self.keys = []
+        self._ranked = {}
+        # Lookups run in request threads while entries are added and removed
+        self._lock = threading.RLock()
+
+        for row in rows:
+            self.entries[row['id']] = row
+            self.keys.extend((key, row['id']) for key in self._row_keys(row))
+        self.keys.sort()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _row_keys(row):
+        # A headword spelled the same in two scripts only needs one key
+        return {normalize_prefix(row[field]) for field in HEADWORD_FIELDS if row.get(field)}
+
+    def _forget_prefixes(self, row):
+        for key in self._row_keys(row):
+            for length in range(1, SHORT_PREFIX_LENGTH + 1):
+                self._ranked.pop(key[:length], None)
+
+    def add(self, row):
+        """Add an entry, replacing any previous version of it"""
+        with self._lock:
+            self.remove(row['id'])
+            self.entries[row['id']] = row
+            for key in self._row_keys(row):
+                insort(self.keys, (key, row['id']))
+            self._forget_prefixes(row)
+
+    def remove(self, entry_id):
+        """Remove an entry if it is in the index"""
+        with self._lock:
+            row = self.entries.pop(entry_id, None)
+            if row is None:
+                return
+            for key in self._row_keys(row):
+                position = bisect_left(self.keys, (key, entry_id))
+                if position < len(self.keys) and self.keys[position] == (key, entry_id):
+                    del self.keys[position]
+            self._forget_prefixes(row)
+
+    def _matching_ids(self, prefix):
+        keys = self.keys
+        position = bisect_left(keys, (prefix,))
+        matches = set()
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            matches.add(keys[position][1])
+            position += 1
+        return matches
+
+    def _rank(self, prefix):
+        view_count = lambda entry_id: self.entries[entry_id]['view_count']
+        return heapq.nlargest(AUTOCOMPLETE_MAX_RESULTS, self._matching_ids(prefix), key=view_count)
+
+    def lookup(self, prefix, limit=10):
+        """
+        Find the most viewed entries with a headword starting with prefix.
+
+        Args:
+            prefix (str): The text typed so far
+            limit (int): Maximum number of entries to return
+
+        Returns:
+            list: Entry rows, most viewed first
+        """
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if len(prefix) <= SHORT_PREFIX_LENGTH:
+                if prefix not in self._ranked:
+                    self._ranked[prefix] = self._rank(prefix)
+                ranked = self._ranked[prefix]
+            else:
+                ranked = self._rank(prefix)
+
+            return [self.entries[entry_id] for entry_id in ranked[:limit]]
+
+
+def _entry_rows(**filters):
+    from .models import DictionaryEntryPage
+
+    return (
+        DictionaryEntryPage.objects.live().public().filter(**filters)
+        .values('id', 'url_path', 'view_count', *HEADWORD_FIELDS)
+    )
+
+
+def _update_index(index, entry_ids):
+    rows = {row['id']: row for row in _entry_rows(pk__in=entry_ids)}
+    for entry_id in entry_ids:
+        if entry_id in rows:
+            index.add(rows[entry_id])
+        else:
+            index.remove(entry_id)
+
+
+autocomplete_index = ProcessIndex(
+    AUTOCOMPLETE_GENERATION_KEY,
+    build=lambda: AutocompleteIndex(_entry_rows()),
+    update=_update_index,
+    max_age=AUTOCOMPLETE_MAX_AGE,
+)
+
+
+def get_autocomplete_index():
+    """
+    Return this process's autocomplete index. It is built on first use and
+    rebuilt in the background when another process has changed the
+    dictionary or it is older than AUTOCOMPLETE_MAX_AGE.
+
+    Returns:
+        AutocompleteIndex: The index
+    """
+    return autocomplete_index.get()
+
+
+def refresh_autocomplete_entry(entry):
+    """
+    Update the index after an entry was published, unpublished or deleted.
+
+    The change is applied when the transaction commits: in place in this
+    process, while other processes rebuild their index.
+
+    Args:
+        entry: The DictionaryEntryPage that changed
+    """
+    autocomplete_index.changed(entry.pk)
@@ -0,0 +1,107 @@
+"""
+In-memory hit buffers that write counts to the database in batches.
+
+Counting a hit with a database write per request puts a write (and its row
+lock) on the hot path of every view. A HitBuffer instead adds the hit to a
+per-process counter and hands the accumulated counts to its flush function
+once enough hits have arrived or enough time has passed since the first one
+(a timer thread flushes batches that stop growing). Buffers are also flushed
+when the process exits.
+
+At most one batch of hits per process can be lost if a worker is killed.
+"""
+
+import atexit
+import logging
+import threading
+import time
+import weakref
+from collections import Counter
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Buffers to flush when the process exits
+_buffers = weakref.WeakSet()
+
+
+class HitBuffer:
+    """
+    Thread-safe counter of hits per key, flushed in batches.
+
+    Args:
+        flush: Function called with a dict of {key: count} to persist
+        max_hits (int): Flush once this many hits are buffered
+        max_age (float): Flush once the oldest buffered hit is this many seconds old
+    """
+
+    def __init__(self, flush, max_hits=500, max_age=30):
+        self._flush = flush
+        self.max_hits = max_hits
+        self.max_age = max_age
+        self._counts = Counter()
+        self._hits = 0
+        self._started_at = None
+        # Number of the current batch, so a timer only flushes the batch it was started for
+        self._batch = 0
+        self._lock = threading.Lock()
+        _buffers.add(self)
+
+    def add(self, key, count=1):
+        """Count a hit for key, flushing the buffer if it is full or old enough"""
+        with self._lock:
+            self._counts[key] += count
+            self._hits += count
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+                self._start_timer()
+            due = self._hits >= self.max_hits or time.monotonic() - self._started_at >= self.max_age
+            counts = self._take() if due else None
+        if counts:
+            self._write(counts)
+
+    def flush(self):
+        """Write all buffered hits now"""
+        with self._lock:
+            counts = self._take()
+        if counts:
+            self._write(counts)
+
+    def _start_timer(self):
+        timer = threading.Timer(self.max_age, self._flush_batch, [self._batch])
+        timer.daemon = True
+        timer.start()
+
+    def _flush_batch(self, batch):
+        """Flush a batch that no hit has flushed within max_age, from its timer thread"""
+        try:
+            with self._lock:
+                counts = self._take() if batch == self._batch else None
+            if counts:
+                self._write(counts)
+        finally:
+            # Database connections are per thread, and this thread is done
+            connections.close_all()
+
+    def _take(self):
+        counts = dict(self._counts)
+        self._counts.clear()
+        self._hits = 0
+        self._started_at = None
+        self._batch += 1
+        return counts
+
+    def _write(self, counts):
+        # Writing happens outside the lock, so other requests keep counting
+        try:
+            self._flush(counts)
+        except Exception:
+            logger.exception("Failed to flush %d buffered hit counts", len(counts))
+
+
+@atexit.register
+def flush_all_buffers():
+    """Flush every buffer in this process"""
+    for buffer in list(_buffers):
+        buffer.flush()
@@ -0,0 +1,291 @@
+"""
+Offline bundle of the dictionary, idioms and phrases for the mobile/offline readers.
+
+The bundle is a single read-only SQLite file:
+
+- `entries`: one row per live page (rowid = page id) with its headwords, its
+  Gurmukhi collation key (see home.utils.gurmukhi_collation_bytes) and all its
+  exported fields as JSON. Indexed on (type, collation_key), so alphabetical
+  listing and prefix lookups are index range scans.
+- `entries_fts`: an FTS5 index of the headwords and English meanings.
+- `meta`: when the bundle was built, its schema version and entry count.
+
+A bundle can be built from scratch, or from the previous bundle plus the pages
+published since it was built (and minus the pages that are no longer live).
+"""
+
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import time
+import unicodedata
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.html import strip_tags
+
+from .export import EXPORT_TYPES, iter_export_rows
+from .utils import gurmukhi_collation_bytes
+
+# Bumped whenever the schema changes; older bundles are then rebuilt from scratch
+BUNDLE_SCHEMA_VERSION = 1
+
+# The columns of `entries` filled from each page type
+BUNDLE_FIELDS = {
+    'dictionary_entry': {
+        'gurmukhi': 'headword_gurmukhi',
+        'shahmukhi': 'headword_shahmukhi',
+        'roman': 'headword_roman_simple',
+        'meaning': 'enriched_definition_english',
+    },
+    'idiom': {
+        'gurmukhi': 'idiom_gurmukhi',
+        'shahmukhi': 'idiom_shahmukhi',
+        'roman': 'transliteration_roman_simple',
+        'meaning': 'definition_english',
+    },
+    'phrase': {
+        'gurmukhi': 'phrase_gurmukhi',
+        'shahmukhi': 'phrase_shahmukhi',
+        'roman': 'roman_simple',
+        'meaning': 'meaning_english',
+    },
+}
+
+# FTS5's unicode61 tokenizer splits words on combining marks, which would break
+# Gurmukhi words at every vowel sign (and Shahmukhi ones at every harakat)
+_TOKEN_CHARS = ''.join(
+    chr(code_point)
+    for block in (range(0x0600, 0x0700), range(0x0A00, 0x0A80))
+    for code_point in block
+    if unicodedata.category(chr(code_point)).startswith('M')
+)
+
+SCHEMA = f"""
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    gurmukhi TEXT NOT NULL,
+    shahmukhi TEXT NOT NULL,
+    roman TEXT NOT NULL,
+    collation_key BLOB NOT NULL,
+    published_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX entries_type_collation_idx ON entries (type, collation_key);
+CREATE INDEX entries_roman_idx ON entries (roman COLLATE NOCASE);
+CREATE VIRTUAL TABLE entries_fts USING fts5(
+    gurmukhi, shahmukhi, roman, meaning,
+    tokenize="unicode61 remove_diacritics 0 tokenchars '{_TOKEN_CHARS}'"
+);
+"""
+
+
+def _entry_values(row):
+    fields = BUNDLE_FIELDS[row['type']]
+    gurmukhi = row[fields['gurmukhi']] or ''
+    published_at = row['last_published_at']
+    return (
+        row['id'],
+        row['type'],
+        gurmukhi,
+        row[fields['shahmukhi']] or '',
+        row[fields['roman']] or '',
+        gurmukhi_collation_bytes(gurmukhi),
+        published_at.isoformat() if published_at else None,
+        json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False),
+    )
+
+
+def _write_rows(connection, rows, batch_size):
+    """Insert or replace rows in `entries` and `entries_fts`, returning the number written"""
+    count = 0
+    batch = []
+
+    for row in rows:
+        if row.get('removed'):
+            # Removed pages are deleted by _delete_missing
+            continue
+        batch.append((_entry_values(row), strip_tags(row[BUNDLE_FIELDS[row['type']]['meaning']] or '')))
+        if len(batch) >= batch_size:
+            _write_batch(connection, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        _write_batch(connection, batch)
+        count += len(batch)
+    return count
+
+
+def _write_batch(connection, batch):
+    connection.executemany("DELETE FROM entries_fts WHERE rowid = ?", [(values[0],) for values, _ in batch])
+    connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [values for values, _ in batch])
+    connection.executemany(
+        "INSERT INTO entries_fts (rowid, gurmukhi, shahmukhi, roman, meaning) VALUES (?, ?, ?, ?, ?)",
+        [(values[0], values[2], values[3], values[4], meaning) for values, meaning in batch],
+    )
+
+
+def _delete_missing(connection, types):
+    """Delete pages that are no longer live from the bundle, returning the number deleted"""
+    live_ids = set()
+    for type_name in types:
+        live_ids.update(EXPORT_TYPES[type_name].objects.live().public().values_list('pk', flat=True))
+
+    stale_ids = [(pk,) for (pk,) in connection.execute("SELECT id FROM entries") if pk not in live_ids]
+    connection.executemany("DELETE FROM entries WHERE id = ?", stale_ids)
+    connection.executemany("DELETE FROM entries_fts WHERE rowid = ?", stale_ids)
+    return len(stale_ids)
+
+
+def _read_meta(path):
+    """Return the meta table of an existing bundle, or None if it can't be reused"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != BUNDLE_SCHEMA_VERSION:
+                return None
+            return dict(connection.execute("SELECT key, value FROM meta"))
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError:
+        return None
+
+
+def build_bundle(output, previous=None, batch_size=1000):
+    """
+    Build the offline bundle.
+
+    Args:
+        output (str): Path of the bundle to write. It is replaced atomically.
+        previous (str): Path of an earlier bundle to update instead of starting
+                        from scratch (ignored if missing or from an older schema)
+        batch_size (int): Number of rows inserted per statement
+
+    Returns:
+        dict: Statistics: 'incremental', 'written', 'deleted', 'total' and 'size' (bytes)
+    """
+    built_at = timezone.now()
+    types = list(EXPORT_TYPES)
+    previous_meta = _read_meta(previous)
+    since = parse_datetime(previous_meta['built_at']) if previous_meta else None
+
+    temp_path = f"{output}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    if since is not None:
+        shutil.copyfile(previous, temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        if since is None:
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version = {BUNDLE_SCHEMA_VERSION}")
+
+        with connection:
+            written = _write_rows(connection, iter_export_rows(types, since), batch_size)
+            deleted = _delete_missing(connection, types) if since is not None else 0
+            total = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                ('built_at', built_at.isoformat()),
+                ('schema_version', str(BUNDLE_SCHEMA_VERSION)),
+                ('entry_count', str(total)),
+            ])
+
+        # Merge the FTS segments and drop free pages, so the shipped file is compact
+        connection.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    os.replace(temp_path, output)
+    return {
+        'incremental': since is not None,
+        'written': written,
+        'deleted': deleted,
+        'total': total,
+        'size': os.path.getsize(output),
+    }
+
+
+def benchmark_bundle(path, samples=1000, seed=0):
+    """
+    Measure lookup latency against a bundle, as the offline readers would query it.
+
+    Args:
+        path (str): Path of the bundle
+        samples (int): Number of lookups of each kind
+        seed (int): Seed for picking the sample headwords
+
+    Returns:
+        dict: For each lookup kind, a dict with the 'median' and 'p95' latency in microseconds
+    """
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        headwords = [row[0] for row in connection.execute("SELECT gurmukhi FROM entries WHERE gurmukhi != ''")]
+        romans = [row[0] for row in connection.execute("SELECT roman FROM entries WHERE roman != ''")]
+        if not headwords:
+            return {}
+        rng = random.Random(seed)
+        picked = [rng.choice(headwords) for _ in range(samples)]
+        picked_roman = [rng.choice(romans) for _ in range(samples)] if romans else []
+
+        def prefix_lookup(word):
+            start = gurmukhi_collation_bytes(word[:2])
+            return connection.execute(
+                "SELECT id, gurmukhi FROM entries WHERE type = 'dictionary_entry' "
+                "AND collation_key >= ? AND collation_key < ? ORDER BY collation_key LIMIT 20",
+                (start, start + b'\xff\xff'),
+            ).fetchall()
+
+        lookups = {
+            'exact headword': lambda word: connection.execute(
+                "SELECT data FROM entries WHERE type = 'dictionary_entry' AND collation_key = ?",
+                (gurmukhi_collation_bytes(word),),
+            ).fetchall(),
+            'prefix (2 letters)': prefix_lookup,
+            'full-text': lambda word: connection.execute(
+                "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ? ORDER BY rank LIMIT 20",
+                ('"' + word.replace('"', '""') + '"',),
+            ).fetchall(),
+        }
+
+        results = {}
+        for name, lookup in lookups.items():
+            results[name] = time_lookups(lookup, picked)
+        if picked_roman:
+            results['roman (case-insensitive)'] = time_lookups(lambda word: connection.execute(
+                "SELECT id FROM entries WHERE roman = ? COLLATE NOCASE", (word,)
+            ).fetchall(), picked_roman)
+        return results
+    finally:
+        connection.close()
+
+
+def time_lookups(lookup, words):
+    """
+    Time lookup(word) for each word.
+
+    Returns:
+        dict: The 'median' and 'p95' latency in microseconds
+    """
+    timings = []
+    for word in words:
+        start = time.perf_counter()
+        lookup(word)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    timings.sort()
+    return {
+        'median': statistics.median(timings),
+        'p95': timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0],
+    }
@@ -0,0 +1,43 @@
+"""
+System checks of the settings home relies on.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Cache backends that keep their data in each process, so other processes never see it
+PER_PROCESS_CACHE_BACKENDS = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+]
+
+
+def is_shared_cache(alias='default'):
+    """
+    Return whether a cache is seen by every process of the site.
+
+    Args:
+        alias (str): Name of the cache in settings.CACHES
+
+    Returns:
+        bool: False for the per-process backends (local memory, dummy)
+    """
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    return backend not in PER_PROCESS_CACHE_BACKENDS
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The generation counters of the cached search results (home.searching) and
+    of the in-memory indexes (home.process_index) are bumped by the process
+    that handles a publish, and must be seen by all the others.
+    """
+    if is_shared_cache():
+        return []
+    return [Warning(
+        "The default cache is not shared between processes.",
+        hint="Other processes keep serving search results and indexes from before a page was "
+             "published. Use a shared backend such as RedisCache in production.",
+        id='home.W001',
+    )]
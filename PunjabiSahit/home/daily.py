@@ -0,0 +1,68 @@
+"""
+Daily picks, such as the phrase of the day shown on the homepage.
+
+The pick is a deterministic function of the model, the date and the number
+of live pages: the position hash(model, date) modulo the page count in id
+order. Every worker picks the same page without coordination, and the pick
+only changes if pages are published or unpublished that day. The id of the
+pick is cached until the end of the day, so serving it is a lookup by
+primary key.
+"""
+
+import hashlib
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def daily_index(label, date, count):
+    """
+    Position of the day's pick among `count` pages.
+
+    Args:
+        label (str): Model label, e.g. 'home.PhrasePage'
+        date: The day
+        count (int): Number of pages to pick from
+
+    Returns:
+        int: Position between 0 and count - 1
+    """
+    digest = hashlib.sha256(f"{label}:{date.isoformat()}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+
+def seconds_until_tomorrow():
+    """Return the number of seconds until local midnight"""
+    now = timezone.localtime()
+    tomorrow = timezone.make_aware(datetime.combine(now.date() + timedelta(days=1), time.min))
+    return max(int((tomorrow - now).total_seconds()), 1)
+
+
+def get_page_of_the_day(model):
+    """
+    Return today's pick among the live pages of a model.
+
+    Args:
+        model: Page model, e.g. PhrasePage
+
+    Returns:
+        Page: The pick, or None if the model has no live pages
+    """
+    pages = model.objects.live().public()
+    today = timezone.localdate()
+    cache_key = f"page_of_the_day:{model._meta.label_lower}:{today.isoformat()}"
+
+    page_id = cache.get(cache_key)
+    if page_id is not None:
+        page = pages.filter(pk=page_id).first()
+        if page is not None:
+            return page
+
+    # Not cached yet, or the pick has been unpublished since
+    count = pages.count()
+    if not count:
+        return None
+    page_id = pages.order_by('pk').values_list('pk', flat=True)[daily_index(model._meta.label, today, count)]
+    cache.set(cache_key, page_id, seconds_until_tomorrow())
+    return pages.filter(pk=page_id).first()
@@ -0,0 +1,160 @@
+"""
+Streaming NDJSON export of the dictionary, idioms and phrases.
+
+Every live page is written as one JSON object per line. Rows are read with
+.values() and .iterator(chunk_size=...) (a server-side cursor on PostgreSQL),
+so memory use stays flat however large the corpus is. Used by the
+/api/export/ view and the export_content management command.
+
+Incremental exports (with `since`) also list the pages unpublished or
+deleted since then, as {"type": ..., "id": ..., "removed": true} lines.
+
+The view is only available to staff users and to clients sending one of the
+EXPORT_API_KEYS settings as a bearer token.
+"""
+
+import json
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import DictionaryEntryPage, IdiomPage, PhrasePage, RemovedPage
+
+# Number of rows fetched from the database at a time
+EXPORT_CHUNK_SIZE = 2000
+
+# Page fields included for every type
+COMMON_FIELDS = ['id', 'title', 'slug', 'url_path', 'first_published_at', 'last_published_at']
+
+# Columns that are only used internally, or not public
+EXCLUDED_FIELDS = {'gurmukhi_sort_key', 'first_letter', 'has_synonyms', 'has_antonyms', 'has_examples', 'view_count'}
+
+# Exported page types, in export order
+EXPORT_TYPES = {
+    'dictionary_entry': DictionaryEntryPage,
+    'idiom': IdiomPage,
+    'phrase': PhrasePage,
+}
+
+
+def export_fields(model):
+    """
+    List the columns exported for a page type: the common page fields plus the
+    model's own content fields (relations and internal columns are left out).
+
+    Args:
+        model: A page model
+
+    Returns:
+        list: Field names
+    """
+    own_fields = [
+        field.name for field in model._meta.local_concrete_fields
+        if not field.is_relation and field.name not in EXCLUDED_FIELDS
+    ]
+    return COMMON_FIELDS + own_fields
+
+
+def is_export_allowed(request):
+    """
+    Check whether a request may download the export.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        bool: True for staff users and for an `Authorization: Bearer <key>`
+              header with one of the EXPORT_API_KEYS
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+
+    scheme, _, key = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return bool(key) and scheme.lower() == 'bearer' and any(
+        constant_time_compare(key, allowed) for allowed in getattr(settings, 'EXPORT_API_KEYS', [])
+    )
+
+
+def parse_since(value):
+    """
+    Parse the `since` parameter of an export.
+
+    Args:
+        value (str): An ISO 8601 date or datetime. Times without a timezone are
+                     taken to be in the current timezone.
+
+    Returns:
+        datetime: The timezone-aware datetime
+
+    Raises:
+        ValueError: If the value is not a date or datetime
+    """
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f"Invalid date: {value!r}")
+        since = datetime.combine(date, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def iter_export_rows(types=None, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the exported fields of every live page, one dict at a time.
+
+    Args:
+        types (list): Page types to export (see EXPORT_TYPES), or None for all
+        since (datetime): Only export pages published after this time
+        chunk_size (int): Number of rows fetched from the database at a time
+
+    Yields:
+        dict: The page's fields, with its page type under 'type'. With since,
+              pages removed after it follow as {'type', 'id', 'removed': True, 'removed_at'}.
+    """
+    for type_name in types or EXPORT_TYPES:
+        model = EXPORT_TYPES[type_name]
+        live = model.objects.live().public()
+        queryset = live
+        if since is not None:
+            queryset = queryset.filter(last_published_at__gt=since)
+
+        rows = queryset.order_by('pk').values(*export_fields(model)).iterator(chunk_size=chunk_size)
+        for row in rows:
+            row['type'] = type_name
+            yield row
+
+        if since is not None:
+            # Pages republished since are in the rows above
+            removed = (
+                RemovedPage.objects
+                .filter(content_type=ContentType.objects.get_for_model(model), removed_at__gt=since)
+                .exclude(page_id__in=live.values('pk'))
+                .order_by('page_id')
+                .values_list('page_id', 'removed_at')
+            )
+            for page_id, removed_at in removed.iterator(chunk_size=chunk_size):
+                yield {'type': type_name, 'id': page_id, 'removed': True, 'removed_at': removed_at}
+
+
+def generate_export_lines(types=None, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the export, one NDJSON line per live (or, with since, removed) page.
+
+    Args:
+        types (list): Page types to export (see EXPORT_TYPES), or None for all
+        since (datetime): Only export pages published after this time
+        chunk_size (int): Number of rows fetched from the database at a time
+
+    Yields:
+        str: A JSON object followed by a newline
+    """
+    for row in iter_export_rows(types, since, chunk_size):
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from home.models import DictionaryEntryPage, IdiomPage, PhrasePage, BookPage
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the derived columns stored on content pages (see `derived_fields`
+    on GurmukhiSortedPage and its subclasses).
+
+    Pages keep these columns up to date when they are saved, so this only needs
+    to run after a migration adds a new column or changes how one is computed.
+
+    Usage: python manage.py backfill_page_fields [--batch-size 500]
+    """
+    help = 'Recomputes derived columns (such as Gurmukhi sort keys) on content pages.'
+
+    models = [DictionaryEntryPage, IdiomPage, PhrasePage, BookPage]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of rows to update per query.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for model in self.models:
+            fields = model.derived_fields
+            updated_count = 0
+            batch = []
+
+            for page in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+                before = [getattr(page, field) for field in fields]
+                page.update_derived_fields()
+                if [getattr(page, field) for field in fields] != before:
+                    batch.append(page)
+
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, fields)
+                    updated_count += len(batch)
+                    batch = []
+
+            if batch:
+                model.objects.bulk_update(batch, fields)
+                updated_count += len(batch)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.verbose_name_plural}: updated {updated_count} page(s)."
+            ))
@@ -0,0 +1,82 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from wagtail.search.backends import get_search_backend
+
+from home.bundle import time_lookups
+from home.models import DictionaryEntryPage
+from home.utils import GURMUKHI_PRECOMPOSED_LETTERS
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the configured search backend (home.search_backend) on the live
+    dictionary entries, through the same queries the site runs.
+
+    Sample headwords are picked from the database. The command reports the
+    latency of whole-word searches, and of partial (three-letter) searches with
+    and without the pg_trgm indexes. It then respells each sample with
+    precomposed nukta letters or a zero-width joiner, and counts how many
+    respellings still find their entry. Import the corpus to measure first
+    (e.g. with import_words) - the numbers only mean something at that size.
+
+    PostgreSQL only. Usage: python manage.py benchmark_search [--samples 200]
+    """
+    help = 'Benchmarks full-text and partial search on the dictionary entries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=200, help='Number of lookups of each kind.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for picking the sample headwords.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The search benchmark needs a PostgreSQL database.")
+
+        entries = DictionaryEntryPage.objects.live()
+        headwords = list(entries.exclude(headword_gurmukhi='').values_list('pk', 'headword_gurmukhi'))
+        if not headwords:
+            raise CommandError("There are no live dictionary entries to search.")
+        self.stdout.write(f"Searching {len(headwords)} live dictionary entries.")
+
+        rng = random.Random(options['seed'])
+        samples = options['samples']
+        picked = [rng.choice(headwords) for _ in range(samples)]
+        backend = get_search_backend()
+
+        def search(word):
+            return [page.pk for page in backend.search(word, entries)[:20]]
+
+        def partial(word):
+            return search(word[1:4])
+
+        def partial_without_index(word):
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_bitmapscan = off")
+                    cursor.execute("SET LOCAL enable_indexscan = off")
+                return partial(word)
+
+        words = [headword for pk, headword in picked]
+        results = {
+            'full-text': time_lookups(search, words),
+            'partial (trigram index)': time_lookups(partial, words),
+            # Sequential scans are slow, so fewer of them are timed
+            'partial (sequential scan)': time_lookups(partial_without_index, words[:max(samples // 10, 1)]),
+        }
+        for name, timing in results.items():
+            self.stdout.write(f"  {name:.<40} median {timing['median']:10.1f} µs   p95 {timing['p95']:10.1f} µs")
+
+        # Spelling variants of stored headwords, as users type them
+        found = sum(pk in search(self.spelling_variant(headword)) for pk, headword in picked)
+        self.stdout.write(f"  Spelling variants found: {found}/{samples}.")
+
+    def spelling_variant(self, headword):
+        """Respell a headword with precomposed nukta letters, or else with a zero-width joiner"""
+        variant = headword
+        for precomposed, letter in GURMUKHI_PRECOMPOSED_LETTERS.items():
+            variant = variant.replace(letter, precomposed)
+        if variant == headword:
+            variant = headword[:1] + '\u200d' + headword[1:]
+        return variant
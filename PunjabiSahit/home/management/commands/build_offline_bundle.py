@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from home.bundle import benchmark_bundle, build_bundle
+
+
+class Command(BaseCommand):
+    """
+    Compiles live dictionary entries, idioms and phrases into a single read-only
+    SQLite file for the mobile/offline readers (see home.bundle).
+
+    With --previous, the earlier bundle is copied and only pages published since
+    it was built are rewritten (pages that are no longer live are removed), so
+    nightly rebuilds only touch what changed.
+
+    Usage: python manage.py build_offline_bundle punjabi_sahit.sqlite3
+               [--previous punjabi_sahit.sqlite3] [--benchmark]
+    """
+    help = 'Builds the offline SQLite bundle of the dictionary, idioms and phrases.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', type=str, help='Path of the bundle to write.')
+        parser.add_argument('--previous', type=str, help='Earlier bundle to update incrementally.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows inserted per statement.')
+        parser.add_argument('--benchmark', action='store_true', help='Measure lookup latency against the new bundle.')
+        parser.add_argument('--samples', type=int, default=1000, help='Number of lookups of each kind to benchmark.')
+
+    def handle(self, *args, **options):
+        stats = build_bundle(options['output'], options['previous'], options['batch_size'])
+
+        mode = 'Updated' if stats['incremental'] else 'Built'
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode} {options['output']}: {stats['written']} written, {stats['deleted']} removed, "
+            f"{stats['total']} entries, {stats['size'] / 1024:.0f} KB."
+        ))
+
+        if options['benchmark']:
+            results = benchmark_bundle(options['output'], options['samples'])
+            if not results:
+                self.stdout.write(self.style.WARNING("The bundle is empty; nothing to benchmark."))
+            for name, timing in results.items():
+                self.stdout.write(f"  {name:.<40} median {timing['median']:8.1f} µs   p95 {timing['p95']:8.1f} µs")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from home.models import SimilarEntry
+from home.similarity import SIMILAR_ENTRIES_PER_ENTRY, load_similarity_data, save_similar_entries
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the precomputed related words of every live dictionary entry
+    (the SimilarEntry table).
+
+    Entries refresh their own related words when they are published, except
+    inside bulk_publishing() (import_words runs this command when it is done).
+    Run it periodically (e.g. nightly) to pick up view count changes and
+    entries that stopped being similar.
+
+    Usage: python manage.py build_similar_entries [--batch-size 1000] [--limit 12]
+    """
+    help = 'Rebuilds the precomputed related words of all dictionary entries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of entries to write per transaction.')
+        parser.add_argument('--limit', type=int, default=SIMILAR_ENTRIES_PER_ENTRY, help='Number of related words to keep per entry.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        limit = options['limit']
+
+        data = load_similarity_data()
+        self.stdout.write(f"Loaded {len(data.entries)} live entries.")
+
+        entry_ids = sorted(data.entries)
+        row_count = 0
+        for start in range(0, len(entry_ids), batch_size):
+            batch = {entry_id: data.neighbours(entry_id, limit) for entry_id in entry_ids[start:start + batch_size]}
+            save_similar_entries(batch)
+            row_count += sum(len(pairs) for pairs in batch.values())
+
+        # Drop the lists of entries that are no longer live
+        deleted, _ = SimilarEntry.objects.exclude(entry_id__in=entry_ids).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {row_count} related words for {len(entry_ids)} entries ({deleted} stale rows removed)."
+        ))
@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from home.export import EXPORT_CHUNK_SIZE, EXPORT_TYPES, generate_export_lines, parse_since
+
+
+class Command(BaseCommand):
+    """
+    Exports all live dictionary entries, idioms and phrases as NDJSON (one JSON
+    object per line), streaming rows so memory use stays constant.
+
+    Usage: python manage.py export_content [--output FILE] [--since 2025-01-01T00:00:00Z]
+                                           [--types dictionary_entry,idiom,phrase]
+    """
+    help = 'Exports live dictionary entries, idioms and phrases as NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=str, help='File to write to (default: standard output).')
+        parser.add_argument('--since', type=str, help='Only export pages published after this ISO date or datetime.')
+        parser.add_argument('--types', type=str, default='', help='Comma-separated page types to export.')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Number of rows fetched per query.')
+
+    def handle(self, *args, **options):
+        exported_at = timezone.now()
+
+        since = None
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        types = [name for name in options['types'].split(',') if name]
+        unknown = [name for name in types if name not in EXPORT_TYPES]
+        if unknown:
+            raise CommandError(f"Unknown types: {', '.join(unknown)}. Choose from: {', '.join(EXPORT_TYPES)}")
+
+        lines = generate_export_lines(types, since, options['chunk_size'])
+        count = 0
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                for line in lines:
+                    f.write(line)
+                    count += 1
+        else:
+            for line in lines:
+                sys.stdout.write(line)
+                count += 1
+
+        # Reported on stderr so it never mixes with the exported lines
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {count} pages. Use --since {exported_at.isoformat()} for the next incremental export."
+        ))
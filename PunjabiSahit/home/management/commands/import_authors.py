@@ -1,6 +1,7 @@
 import json
 from django.core.management.base import BaseCommand, CommandError
 from home.models import Author
+from home.prerender import bulk_publishing
 
 class Command(BaseCommand):
     help = 'Imports authors from JSON file into Wagtail.'
@@ -8,6 +9,7 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('json_file_path', type=str, help='Path to authors.json')
 
+    @bulk_publishing()
     def handle(self, *args, **options):
         json_file_path = options['json_file_path']
         self.stdout.write(self.style.NOTICE(f"Starting author import from {json_file_path}"))
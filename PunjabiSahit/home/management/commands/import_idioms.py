@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from home.models import IdiomsIndexPage, IdiomPage
+from home.prerender import bulk_publishing
 
 class Command(BaseCommand):
     help = 'Imports idioms from a JSON file into Wagtail.'
@@ -10,6 +11,7 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('json_file_path', type=str, help='The path to the idioms.json file.')
 
+    @bulk_publishing()
     @transaction.atomic
     def handle(self, *args, **options):
         json_file_path = options['json_file_path']
@@ -2,6 +2,7 @@ import json
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from home.models import PhrasesIndexPage, PhrasePage
+from home.prerender import bulk_publishing
 
 class Command(BaseCommand):
     help = 'Imports phrases from a JSON file into Wagtail.'
@@ -9,6 +10,7 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('json_file_path', type=str, help='The path to the phrases.json file.')
 
+    @bulk_publishing()
     @transaction.atomic
     def handle(self, *args, **options):
         json_file_path = options['json_file_path']
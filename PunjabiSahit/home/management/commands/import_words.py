@@ -1,10 +1,12 @@
 import json
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 # Make sure your models are correctly imported from the 'home' app
 try:
     from home.models import DictionaryIndexPage, DictionaryEntryPage
+    from home.prerender import bulk_publishing
 except ImportError:
     raise ImportError(
         "Could not import models from 'home.models'. "
@@ -16,12 +18,18 @@ class Command(BaseCommand):
     Imports dictionary words from a specified JSON file into Wagtail.
     
     Usage: python manage.py import_words <path_to_words.json>
+
+    Each entry's derived columns (sort key, first letter and content presence
+    flags) are filled in when the page is saved, so imported words are
+    immediately available to the dictionary filters and sorts. Related words
+    are rebuilt once at the end (build_similar_entries), not per word.
     """
     help = 'Imports dictionary words from a JSON file into Wagtail.'
 
     def add_arguments(self, parser):
         parser.add_argument('json_file_path', type=str, help='The full path to the words.json file.')
 
+    @bulk_publishing()
     def handle(self, *args, **options):
         json_file_path = options['json_file_path']
         self.stdout.write(self.style.NOTICE(f"Attempting to import words from: {json_file_path}"))
@@ -97,4 +105,7 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(
             f"\nImport complete! Created: {created_count} new words. Skipped: {skipped_count} (already existed)."
-        ))
\ No newline at end of file
+        ))
+
+        if created_count:
+            call_command('build_similar_entries', stdout=self.stdout)
\ No newline at end of file
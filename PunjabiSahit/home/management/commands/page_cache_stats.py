@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from home.page_cache import PAGE_CACHE_ENABLED, get_page_cache_stats, purge_all, reset_page_cache_stats
+
+
+class Command(BaseCommand):
+    """
+    Reports the hit and miss counts of the full-page cache (see
+    home.page_cache), and optionally resets them or purges the cache.
+
+    Usage: python manage.py page_cache_stats [--reset] [--purge]
+    """
+    help = 'Reports the hit rate of the full-page cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counts after reporting them.')
+        parser.add_argument('--purge', action='store_true', help='Purge every cached page.')
+
+    def handle(self, *args, **options):
+        if not PAGE_CACHE_ENABLED:
+            self.stdout.write(self.style.WARNING("The page cache is disabled (PAGE_CACHE_ENABLED = False)."))
+
+        stats = get_page_cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else "n/a"
+        self.stdout.write(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {hit_rate}")
+
+        if options['reset']:
+            reset_page_cache_stats()
+            self.stdout.write("Counts reset.")
+        if options['purge']:
+            purge_all()
+            self.stdout.write(self.style.SUCCESS("Purged every cached page."))
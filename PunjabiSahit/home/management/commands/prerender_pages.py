@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from home.prerender import PRERENDER_ROOT, init_worker, prerendered_pages, render_pages
+
+
+class Command(BaseCommand):
+    """
+    Pre-renders the dictionary, idiom, phrase, book and author detail pages
+    to PRERENDER_ROOT for nginx to serve (see home.prerender). Pages whose
+    live revision was already rendered are skipped, unless --force is given.
+
+    Usage: python manage.py prerender_pages [--workers 4] [--force]
+    """
+    help = 'Pre-renders detail pages to static files for the front proxy.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes.')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Number of pages per worker task.')
+        parser.add_argument('--force', action='store_true', help='Render every page, even if it has not changed.')
+
+    def handle(self, *args, **options):
+        if not PRERENDER_ROOT:
+            raise CommandError("Set PRERENDER_ROOT to the directory to pre-render pages to.")
+
+        page_ids = list(prerendered_pages().order_by('pk').values_list('pk', flat=True))
+        chunk_size = options['chunk_size']
+        chunks = [page_ids[i:i + chunk_size] for i in range(0, len(page_ids), chunk_size)]
+        self.stdout.write(f"Pre-rendering {len(page_ids)} pages with {options['workers']} workers...")
+
+        totals = [0, 0, 0]
+        if options['workers'] > 1 and len(chunks) > 1:
+            # Workers must open their own database connections rather than share this one
+            connections.close_all()
+            with ProcessPoolExecutor(options['workers'], initializer=init_worker) as executor:
+                results = executor.map(render_pages, chunks, [PRERENDER_ROOT] * len(chunks), [options['force']] * len(chunks))
+                for counts in results:
+                    totals = [total + count for total, count in zip(totals, counts)]
+        else:
+            for chunk in chunks:
+                counts = render_pages(chunk, PRERENDER_ROOT, options['force'])
+                totals = [total + count for total, count in zip(totals, counts)]
+
+        rendered, skipped, failed = totals
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} pages, skipped {skipped} unchanged or uncacheable."))
+        if failed:
+            self.stdout.write(self.style.ERROR(f"{failed} pages failed, see the log."))
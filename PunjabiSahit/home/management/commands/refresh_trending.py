@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from home.trending import TRENDING_HALF_LIFE, refresh_trending_scores
+from home.view_counts import view_counts
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the time-decayed trending scores shown on the homepage from
+    the hourly page views (see home.trending). Run it hourly.
+
+    Usage: python manage.py refresh_trending [--half-life 24]
+    """
+    help = 'Recomputes the trending scores from recent page views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--half-life', type=float, default=TRENDING_HALF_LIFE, help='Hours after which a view counts half.')
+
+    def handle(self, *args, **options):
+        view_counts.flush()
+        count = refresh_trending_scores(options['half_life'])
+        self.stdout.write(self.style.SUCCESS(f"Updated the trending scores of {count} pages."))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from home.search_stats import get_search_report
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the cached search report (popular searches and searches that
+    found nothing) and prints it.
+
+    The search page recomputes the report when its cache entry expires; run
+    this periodically (e.g. hourly) so no visitor has to wait for it. Searches
+    are counted by the web processes, which write their buffered counts in
+    batches (see home.buffering), so the latest searches may not be in it yet.
+
+    Usage: python manage.py search_report [--quiet]
+    """
+    help = 'Recomputes the popular and zero-result search report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiet', action='store_true', help='Only refresh the cache.')
+
+    def handle(self, *args, **options):
+        report = get_search_report(refresh=True)
+
+        if options['quiet']:
+            return
+
+        self.stdout.write(self.style.SUCCESS("Popular searches:"))
+        for query in report['popular']:
+            self.stdout.write(f"  {query}")
+
+        self.stdout.write(self.style.SUCCESS("Searches that found nothing:"))
+        for query, hits in report['zero_results']:
+            self.stdout.write(f"  {hits:>6}  {query}")
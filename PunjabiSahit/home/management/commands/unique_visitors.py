@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from wagtail.models import Page
+
+from home.models import PageVisitorSketch
+from home.visitors import VISITOR_PERIODS, rank_by_unique_visitors
+
+
+class Command(BaseCommand):
+    """
+    Lists the pages with the most unique visitors over a day, week or month,
+    estimated from the daily HyperLogLog sketches (see home.visitors), and
+    optionally deletes sketches older than a number of days.
+
+    Usage: python manage.py unique_visitors [--period week] [--limit 20] [--prune 90]
+    """
+    help = 'Lists the pages with the most unique visitors.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', choices=list(VISITOR_PERIODS), default='week', help='Period to count visitors over.')
+        parser.add_argument('--limit', type=int, default=20, help='Number of pages to list.')
+        parser.add_argument('--prune', type=int, metavar='DAYS', help='Delete sketches older than this many days.')
+
+    def handle(self, *args, **options):
+        if options['prune']:
+            cutoff = timezone.localdate() - timedelta(days=options['prune'])
+            deleted, _ = PageVisitorSketch.objects.filter(date__lt=cutoff).delete()
+            self.stdout.write(f"Deleted {deleted} sketches from before {cutoff}.")
+
+        pages = rank_by_unique_visitors(Page.objects.live(), options['period'], options['limit'])
+        self.stdout.write(self.style.SUCCESS(f"Unique visitors this {options['period']}:"))
+        for page in pages:
+            self.stdout.write(f"  {page.unique_visitors:>8}  {page.url_path}")
@@ -0,0 +1,92 @@
+"""
+Middleware serving Wagtail pages to anonymous visitors from the page cache.
+
+See home.page_cache for what is cached and how entries are purged.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+
+from home.checks import is_shared_cache
+from home.middleware.views import get_viewed_keys
+from home.page_cache import (
+    cache_response,
+    get_cached_response,
+    is_cacheable_request,
+    page_cache_key,
+    page_cache_stats,
+)
+
+
+class PageCacheMiddleware:
+    """
+    Middleware answering anonymous GET requests for Wagtail pages from the
+    page cache, and storing the pages it renders.
+
+    It must come after LocaleMiddleware and AuthenticationMiddleware (the
+    key depends on the active language, and only anonymous requests are
+    cached), and after PageViewCounterMiddleware, which counts the views of
+    the pages served from the cache.
+
+    Responses carry an X-Page-Cache header (HIT or MISS). Only active when
+    the PAGE_CACHE_ENABLED setting is True, and then the default cache must be
+    shared by all processes: purges and hit counts are written by whichever
+    process handles them, and a per-process cache would keep serving purged
+    pages from every other worker.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response: The next middleware or view in the chain
+        """
+        # Read here rather than at import, so tests can enable the cache with override_settings
+        if not getattr(settings, 'PAGE_CACHE_ENABLED', False):
+            raise MiddlewareNotUsed
+        if not is_shared_cache():
+            raise ImproperlyConfigured(
+                "PAGE_CACHE_ENABLED needs a default cache shared by all processes, such as RedisCache."
+            )
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Serve the request from the page cache, or render it and cache the page.
+
+        Args:
+            request: The HTTP request object
+
+        Returns:
+            HttpResponse: The cached or rendered response
+        """
+        if not is_cacheable_request(request) or not self.is_page_request(request):
+            return self.get_response(request)
+
+        key = page_cache_key(request)
+        cached = get_cached_response(request, key)
+        if cached is not None:
+            response, page_id, viewed = cached
+            request.page_cache_hit = (page_id, viewed)
+            page_cache_stats.add('hit')
+            response['X-Page-Cache'] = 'HIT'
+            return response
+
+        response = self.get_response(request)
+
+        page = getattr(request, 'wagtail_page', None)
+        if page is not None and not getattr(request, 'is_preview', False):
+            page_cache_stats.add('miss')
+            if cache_response(key, response, page.pk, get_viewed_keys(page)):
+                response['X-Page-Cache'] = 'MISS'
+        return response
+
+    @staticmethod
+    def is_page_request(request):
+        """Check whether the request is routed to Wagtail's page serving view"""
+        try:
+            return resolve(request.path_info).url_name == 'wagtail_serve'
+        except Resolver404:
+            return False
@@ -1,24 +1,60 @@
 """
 Middleware for tracking page view counts in the Punjabi Sahit application.
 
-This middleware automatically increments the view_count field for any page
-that inherits from BaseContentPage when it's successfully viewed.
+This middleware automatically counts a view for any page that inherits
+from BaseContentPage when it's successfully viewed. Views are buffered and
+added to the view_count fields in batches (see home.view_counts), and the
+visitor is added to the page's daily unique visitor sketch (see home.visitors).
 """
 
-from django.db.models import F
-from home.models import BaseContentPage
+from home.view_counts import count_views
+from home.visitors import count_visit
+
+
+def get_viewed_objects(page):
+    """
+    Return the objects whose view_count a view of a page adds to.
+
+    Pages can name them in a get_viewed_objects() method (e.g. an author
+    detail page counts a view of its Author); otherwise a page with a
+    view_count field counts its own views.
+
+    Args:
+        page: The page that was viewed
+
+    Returns:
+        list: Objects with a view_count field
+    """
+    if hasattr(page, 'get_viewed_objects'):
+        return page.get_viewed_objects()
+    return [page] if hasattr(page, 'view_count') else []
+
+
+def get_viewed_keys(page):
+    """Return the (model label, id) of each object a view of a page counts for"""
+    return [(obj._meta.label, obj.pk) for obj in get_viewed_objects(page)]
+
+
+def count_page_view(request, page_id, viewed_keys):
+    """Count a view of the objects a page view counts for, and a visit to the page"""
+    if viewed_keys:
+        count_views(viewed_keys)
+        count_visit(request, page_id)
 
 
 class PageViewCounterMiddleware:
     """
     Middleware to automatically track page views for content pages.
 
-    This middleware increments the view_count field for any page that has it
-    (typically pages inheriting from BaseContentPage). The increment is done
-    atomically using F() expressions to avoid race conditions.
+    This middleware counts a view for any page that has a view_count field
+    (typically pages inheriting from BaseContentPage). The view is added to a
+    per-worker buffer, so a request never waits on a write or a row lock.
+
+    Pages can also count their views for other objects, such as the Author of
+    an AuthorDetailPage (see get_viewed_objects).
 
     The counter only increments for:
-    - GET requests
+    - GET requests (not HEAD)
     - Successful responses (status 200)
     - Non-preview requests
     - Pages with a view_count field
@@ -46,21 +82,20 @@ class PageViewCounterMiddleware:
         response = self.get_response(request)
 
         # We only want to count views for GET requests that are successful (status 200)
-        # and are not in the admin preview.
+        # and are not in the admin preview. HEAD requests are not views.
         if (
-            response.status_code == 200
+            request.method == 'GET'
+            and response.status_code == 200
             and hasattr(request, 'wagtail_page')
-            and not request.is_preview
+            and not getattr(request, 'is_preview', False)
         ):
             # Get the actual page object
             page = request.wagtail_page
+            count_page_view(request, page.pk, get_viewed_keys(page))
+
+        # Pages served by the page cache (home.middleware.page_cache) are not
+        # routed, so the cache entry records what to count
+        elif request.method == 'GET' and hasattr(request, 'page_cache_hit'):
+            count_page_view(request, *request.page_cache_hit)
 
-            # Check if this page is one of our content types by seeing if
-            # it has the 'view_count' attribute. This is a simple and effective check.
-            if hasattr(page, 'view_count'):
-                # Use F() expression to perform an atomic update, which is highly
-                # efficient and avoids race conditions.
-                page_model = page.specific_class
-                page_model.objects.filter(pk=page.pk).update(view_count=F('view_count') + 1)
-        
         return response
\ No newline at end of file
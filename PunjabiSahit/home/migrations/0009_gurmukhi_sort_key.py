@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0008_userbookstatus'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookpage',
+            name='gurmukhi_sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Gurmukhi collation key, automatically updated when the page is saved.', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='dictionaryentrypage',
+            name='gurmukhi_sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Gurmukhi collation key, automatically updated when the page is saved.', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='idiompage',
+            name='gurmukhi_sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Gurmukhi collation key, automatically updated when the page is saved.', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='phrasepage',
+            name='gurmukhi_sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Gurmukhi collation key, automatically updated when the page is saved.', max_length=255),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0009_gurmukhi_sort_key'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        ('wagtailcore', '0095_groupsitepermission'),
+        ('wagtaildocs', '0014_alter_document_file_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dictionaryentrypage',
+            name='first_letter',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='First Gurmukhi letter of the headword, used by the alphabet navigation.', max_length=4),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(fields=['first_letter', 'gurmukhi_sort_key'], name='home_dict_letter_sort_idx'),
+        ),
+    ]
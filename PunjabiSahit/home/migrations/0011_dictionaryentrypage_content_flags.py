@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0010_dictionaryentrypage_first_letter'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        ('wagtailcore', '0095_groupsitepermission'),
+        ('wagtaildocs', '0014_alter_document_file_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dictionaryentrypage',
+            name='has_antonyms',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='dictionaryentrypage',
+            name='has_examples',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='dictionaryentrypage',
+            name='has_synonyms',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(condition=models.Q(('has_synonyms', True)), fields=['gurmukhi_sort_key'], name='home_dict_syn_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(condition=models.Q(('has_synonyms', True)), fields=['-view_count'], name='home_dict_syn_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(condition=models.Q(('has_antonyms', True)), fields=['gurmukhi_sort_key'], name='home_dict_ant_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(condition=models.Q(('has_antonyms', True)), fields=['-view_count'], name='home_dict_ant_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(condition=models.Q(('has_examples', True)), fields=['gurmukhi_sort_key'], name='home_dict_ex_sort_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=models.Index(condition=models.Q(('has_examples', True)), fields=['-view_count'], name='home_dict_ex_views_idx'),
+        ),
+    ]
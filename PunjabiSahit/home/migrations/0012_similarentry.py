@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0011_dictionaryentrypage_content_flags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(help_text='Higher scores are more similar')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_entries', to='home.dictionaryentrypage')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='home.dictionaryentrypage')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entry', '-score'], name='home_similar_entry_score_idx')],
+                'unique_together': {('entry', 'similar')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:20
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0012_similarentry'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['headword_gurmukhi', 'headword_shahmukhi', 'headword_roman_simple'], name='home_dict_headword_trgm_idx', opclasses=['gin_trgm_ops', 'gin_trgm_ops', 'gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='idiompage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['idiom_gurmukhi', 'idiom_shahmukhi'], name='home_idiom_trgm_idx', opclasses=['gin_trgm_ops', 'gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='phrasepage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['phrase_gurmukhi', 'phrase_shahmukhi'], name='home_phrase_trgm_idx', opclasses=['gin_trgm_ops', 'gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='bookpage',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title_gurmukhi', 'title_english'], name='home_book_title_trgm_idx', opclasses=['gin_trgm_ops', 'gin_trgm_ops']),
+        ),
+    ]
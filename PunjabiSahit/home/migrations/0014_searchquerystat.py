@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0013_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(help_text='Normalized search query', max_length=255)),
+                ('date', models.DateField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('zero_result_hits', models.PositiveIntegerField(default=0, help_text='Searches that found nothing')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='home_search_stat_date_idx')],
+                'unique_together': {('query', 'date')},
+            },
+        ),
+    ]
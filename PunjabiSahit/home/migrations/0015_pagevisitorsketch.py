@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0014_searchquerystat'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageVisitorSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('sketch', models.BinaryField(default=b'', help_text='zlib-compressed HyperLogLog registers')),
+                ('visitors', models.PositiveIntegerField(default=0, help_text='Estimated unique visitors')),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.page')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='home_visitor_sketch_date_idx')],
+                'unique_together': {('page', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('home', '0015_pagevisitorsketch'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(help_text='Start of the hour')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.page')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='home_view_bucket_hour_idx')],
+                'unique_together': {('page', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='wagtailcore.page')),
+                ('score', models.FloatField(default=0)),
+                ('hour', models.DateTimeField(help_text='Views before this hour are included in the score')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['content_type', '-score'], name='home_trending_type_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0016_pageviewbucket_trendingscore'),
+        ('wagtailcore', '0095_groupsitepermission'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='homepage',
+            name='featured_item',
+            field=models.ForeignKey(blank=True, help_text='Optional: Manually select a page to feature. If empty, the Phrase of the Day will be chosen.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.page'),
+        ),
+    ]
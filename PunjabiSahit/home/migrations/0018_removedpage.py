@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('home', '0017_alter_homepage_featured_item'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RemovedPage',
+            fields=[
+                ('page_id', models.PositiveIntegerField(help_text='Id of the page, which may no longer exist', primary_key=True, serialize=False)),
+                ('removed_at', models.DateTimeField(db_index=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:40
+
+import django.contrib.postgres.indexes
+import home.searching
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0018_removedpage'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dictionaryentrypage',
+            name='home_dict_headword_trgm_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='idiompage',
+            name='home_idiom_trgm_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='phrasepage',
+            name='home_phrase_trgm_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bookpage',
+            name='home_book_title_trgm_idx',
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('name_gurmukhi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('name_english'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('name_hindi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('name_shahmukhi'), name='gin_trgm_ops'), name='home_author_name_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dictionaryentrypage',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('headword_gurmukhi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('headword_shahmukhi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('headword_roman_simple'), name='gin_trgm_ops'), name='home_dict_headword_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='idiompage',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('idiom_gurmukhi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('idiom_shahmukhi'), name='gin_trgm_ops'), name='home_idiom_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='phrasepage',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('phrase_gurmukhi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('phrase_shahmukhi'), name='gin_trgm_ops'), name='home_phrase_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookpage',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('title_gurmukhi'), name='gin_trgm_ops'), django.contrib.postgres.indexes.OpClass(home.searching.NormalizedText('title_english'), name='gin_trgm_ops'), name='home_book_title_norm_idx'),
+        ),
+    ]
@@ -1,13 +1,21 @@
 # home/models.py
 
 from django.db import models
-from django.db.models import Avg, F
+from django.db.models import Avg, Count, Q
 from django.utils import timezone
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.utils.html import strip_tags
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.auth.models import User
 
-from .utils import gurmukhi_sort_key, sort_gurmukhi_items
+from .daily import get_page_of_the_day, seconds_until_tomorrow
+from .pagination import paginate_index
+from .searching import NormalizedSearchField, NormalizedText, filter_by_search
+from .spelling import suggest_spelling
+from .trending import get_trending_pages
+from .utils import GURMUKHI_ALPHABET_ORDER, gurmukhi_collation_key, extract_first_letter_gurmukhi
 
 from modelcluster.fields import ParentalKey, ParentalManyToManyField
 from modelcluster.contrib.taggit import ClusterTaggableManager
@@ -32,7 +40,14 @@ class BaseContentPage(Page):
     """
     An abstract base model that all content-specific pages will inherit from.
     It includes a view counter for tracking trending content.
+
+    Subclasses list the fields shown on their search result cards in
+    `search_card_fields`, and the field summarised as the result's snippet in
+    `search_snippet_field` (see home.searching.load_search_results).
     """
+    search_card_fields = []
+    search_snippet_field = None
+
     view_count = models.PositiveIntegerField(
         default=0,
         editable=False,
@@ -43,6 +58,41 @@ class BaseContentPage(Page):
         abstract = True # This tells Django not to create a database table for this model
 
 
+class GurmukhiSortedPage(BaseContentPage):
+    """
+    An abstract base for content pages that are listed in Gurmukhi alphabetical order.
+    Subclasses set `gurmukhi_sort_field` to the field holding their Gurmukhi text;
+    its collation key is stored on save so index pages can sort in the database.
+    """
+    gurmukhi_sort_field = None
+
+    gurmukhi_sort_key = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=True,
+        help_text="Gurmukhi collation key, automatically updated when the page is saved."
+    )
+
+    # Columns computed from other fields in update_derived_fields()
+    derived_fields = ['gurmukhi_sort_key']
+
+    class Meta:
+        abstract = True
+
+    def update_derived_fields(self):
+        """Recompute the columns listed in `derived_fields`"""
+        self.gurmukhi_sort_key = gurmukhi_collation_key(getattr(self, self.gurmukhi_sort_field, ''))
+
+    def save(self, *args, **kwargs):
+        self.update_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.derived_fields)
+        super().save(*args, **kwargs)
+
+
 # ===================================================================
 # Reusable StreamField Blocks & Snippets (Unchanged)
 # ===================================================================
@@ -58,10 +108,11 @@ class QuoteBlock(blocks.StructBlock):
     class Meta: icon = "openquote"; label = "Quote"
 
 @register_snippet
-class Author(models.Model):
+class Author(index.Indexed, models.Model):
     """
     Author model for writers, poets, scholars, etc.
     Registered as a snippet so it can be referenced across different content types.
+    Indexed for search, so the site search finds authors alongside pages.
     """
     # Legacy Core Fields (for backward compatibility)
     author_id = models.CharField(max_length=100, unique=True, help_text="Original ID from JSON", default='temp_id')
@@ -126,6 +177,18 @@ class Author(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
 
+    search_fields = [
+        NormalizedSearchField('name_gurmukhi', partial_match=True, boost=5),
+        NormalizedSearchField('name_english', partial_match=True, boost=5),
+        NormalizedSearchField('name_hindi', partial_match=True, boost=5),
+        NormalizedSearchField('name_shahmukhi', partial_match=True, boost=5),
+        NormalizedSearchField('name', boost=4),
+        NormalizedSearchField('biography_gurmukhi'),
+        NormalizedSearchField('biography_english'),
+        NormalizedSearchField('biography_hindi'),
+        NormalizedSearchField('bio'),
+    ]
+
     panels = [
         MultiFieldPanel([
             FieldPanel('author_id'),
@@ -185,6 +248,10 @@ class Author(models.Model):
         verbose_name = "Author"
         verbose_name_plural = "Authors"
         ordering = ['name']
+        indexes = [
+            # Trigram index for partial matches on the names (see home.search_backend)
+            GinIndex(OpClass(NormalizedText('name_gurmukhi'), name='gin_trgm_ops'), OpClass(NormalizedText('name_english'), name='gin_trgm_ops'), OpClass(NormalizedText('name_hindi'), name='gin_trgm_ops'), OpClass(NormalizedText('name_shahmukhi'), name='gin_trgm_ops'), name='home_author_name_norm_idx'),
+        ]
 
     def __str__(self):
         return self.name_english or self.name or self.name_gurmukhi or "Unnamed Author"
@@ -212,6 +279,136 @@ class DictionaryIndexPage(Page):
     content_panels = Page.content_panels + [FieldPanel('intro')]
     subpage_types = ['home.DictionaryEntryPage']
 
+    entries_per_page = 20
+    sort_fields = {
+        'alpha_asc': 'gurmukhi_sort_key',
+        'alpha_desc': '-gurmukhi_sort_key',
+        'popular': '-view_count',
+        'recent': '-first_published_at',
+    }
+    letter_counts_cache_timeout = 60 * 60 * 24
+
+    @property
+    def letter_counts_cache_key(self):
+        return f"dictionary_letter_counts:{self.pk}"
+
+    def get_letter_counts(self):
+        """
+        Returns a dict mapping each first letter to the number of live entries
+        under this page. Cached until an entry is published or unpublished.
+        """
+        letter_counts = cache.get(self.letter_counts_cache_key)
+        if letter_counts is None:
+            letter_counts = dict(
+                DictionaryEntryPage.objects.live().public().child_of(self)
+                .order_by()
+                .values_list('first_letter')
+                .annotate(count=Count('pk'))
+            )
+            cache.set(self.letter_counts_cache_key, letter_counts, self.letter_counts_cache_timeout)
+        return letter_counts
+
+    def clear_letter_counts(self):
+        cache.delete(self.letter_counts_cache_key)
+
+    def get_letter_navigation(self):
+        """
+        Returns the non-empty letters in alphabetical order, each with its entry
+        count and the page it starts on when sorted alphabetically (A → Z).
+        Entries without a first letter (see extract_first_letter_gurmukhi)
+        sort after all the others, so they don't move any start page.
+        """
+        letter_counts = self.get_letter_counts()
+        letters = sorted(
+            (letter for letter in letter_counts if letter in GURMUKHI_ALPHABET_ORDER),
+            key=GURMUKHI_ALPHABET_ORDER.get
+        )
+
+        navigation = []
+        offset = 0
+        for letter in letters:
+            navigation.append({
+                'letter': letter,
+                'count': letter_counts[letter],
+                'start_page': offset // self.entries_per_page + 1,
+            })
+            offset += letter_counts[letter]
+        return navigation
+
+    # Part of speech options shown in the filter sidebar
+    pos_facets = ['noun', 'verb', 'adjective', 'adverb']
+
+    # "Has content" checkboxes and the entries they match
+    content_facets = {
+        'has_synonyms': Q(has_synonyms=True),
+        'has_antonyms': Q(has_antonyms=True),
+        'has_examples': Q(has_examples=True),
+        'has_audio': Q(sound__isnull=False),
+    }
+
+    def get_facet_filters(self, request):
+        """
+        Returns a dict mapping each facet selected in the request
+        ('pos', 'origin' or a content facet) to its filter condition.
+        """
+        facet_filters = {}
+
+        pos = request.GET.get('pos')
+        if pos:
+            facet_filters['pos'] = Q(parts_of_speech__icontains=pos)
+
+        origin = request.GET.get('origin')
+        if origin:
+            facet_filters['origin'] = Q(origin=origin)
+
+        for name, condition in self.content_facets.items():
+            if request.GET.get(name) == 'true':
+                facet_filters[name] = condition
+
+        return facet_filters
+
+    def get_facet_counts(self, entries, facet_filters):
+        """
+        Counts how many entries each facet option would give, for every facet
+        in a single aggregate query.
+
+        Each facet's counts apply all the selected filters except its own, so
+        the sidebar shows what switching to another option would return.
+
+        Args:
+            entries: Entries before any facet filters are applied
+            facet_filters (dict): Selected facets, as returned by get_facet_filters
+
+        Returns:
+            dict: {'pos': {value: count}, 'origin': {value: count}, '<content facet>': count}
+        """
+        def other_filters(facet):
+            condition = Q()
+            for name, facet_condition in facet_filters.items():
+                if name != facet:
+                    condition &= facet_condition
+            return condition
+
+        origin_values = [value for value, label in DictionaryEntryPage._meta.get_field('origin').choices]
+
+        aggregates = {}
+        for value in self.pos_facets:
+            aggregates[f'pos_{value}'] = Count('pk', filter=Q(parts_of_speech__icontains=value) & other_filters('pos'))
+        for value in origin_values:
+            aggregates[f'origin_{value}'] = Count('pk', filter=Q(origin=value) & other_filters('origin'))
+        for name, condition in self.content_facets.items():
+            aggregates[f'{name}_count'] = Count('pk', filter=condition & other_filters(name))
+
+        totals = entries.order_by().aggregate(**aggregates)
+
+        facet_counts = {
+            'pos': {value: totals[f'pos_{value}'] for value in self.pos_facets},
+            'origin': {value: totals[f'origin_{value}'] for value in origin_values},
+        }
+        for name in self.content_facets:
+            facet_counts[name] = totals[f'{name}_count']
+        return facet_counts
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
@@ -219,73 +416,56 @@ class DictionaryIndexPage(Page):
         all_entries = DictionaryEntryPage.objects.live().public().child_of(self)
 
         # === FILTERS ===
-        # Letter filter
-        letter = request.GET.get('letter')
-        if letter:
-            all_entries = all_entries.filter(headword_gurmukhi__startswith=letter)
-
         # Search query
         search_query = request.GET.get('q')
         if search_query:
-            all_entries = all_entries.search(search_query)
+            all_entries = filter_by_search(all_entries, search_query)
 
-        # Part of speech filter
-        pos = request.GET.get('pos')
-        if pos:
-            all_entries = all_entries.filter(parts_of_speech__icontains=pos)
+        # Letter filter
+        letter = request.GET.get('letter')
+        if letter:
+            all_entries = all_entries.filter(first_letter=letter)
 
-        # Origin filter
-        origin = request.GET.get('origin')
-        if origin:
-            all_entries = all_entries.filter(origin=origin)
-
-        # Has content filters
-        if request.GET.get('has_synonyms') == 'true':
-            all_entries = all_entries.exclude(synonyms_gurmukhi='')
-        if request.GET.get('has_antonyms') == 'true':
-            all_entries = all_entries.exclude(antonyms_gurmukhi='')
-        if request.GET.get('has_examples') == 'true':
-            all_entries = all_entries.exclude(example_sentences_gurmukhi='')
-        if request.GET.get('has_audio') == 'true':
-            all_entries = all_entries.exclude(sound__isnull=True)
+        # Facet filters (part of speech, origin, has content)
+        facet_filters = self.get_facet_filters(request)
+        facet_counts = self.get_facet_counts(all_entries, facet_filters)
+        for condition in facet_filters.values():
+            all_entries = all_entries.filter(condition)
 
         # === SORTING ===
+        # Alphabetical sorts use the precomputed phonetic Gurmukhi collation key
         sort_by = request.GET.get('sort', 'alpha_asc')
-        if sort_by == 'alpha_asc':
-            # Use phonetic Gurmukhi sorting
-            all_entries_list = list(all_entries)
-            all_entries = sort_gurmukhi_items(all_entries_list, key_func=lambda x: x.headword_gurmukhi)
-        elif sort_by == 'alpha_desc':
-            # Use phonetic Gurmukhi sorting (reversed)
-            all_entries_list = list(all_entries)
-            sorted_entries = sort_gurmukhi_items(all_entries_list, key_func=lambda x: x.headword_gurmukhi)
-            all_entries = list(reversed(sorted_entries))
-        elif sort_by == 'popular':
-            all_entries = all_entries.order_by('-view_count')
-        elif sort_by == 'recent':
-            all_entries = all_entries.order_by('-first_published_at')
+        sort_field = self.sort_fields.get(sort_by)
 
         # === PAGINATION ===
-        paginator = Paginator(all_entries, 20)
-        page = request.GET.get('page')
-        try:
-            dictionary_entries = paginator.page(page)
-        except PageNotAnInteger:
-            dictionary_entries = paginator.page(1)
-        except EmptyPage:
-            dictionary_entries = paginator.page(paginator.num_pages)
+        dictionary_entries = paginate_index(request, all_entries, self.entries_per_page, sort_field)
 
         context['dictionary_entries'] = dictionary_entries
+        context['letter_navigation'] = self.get_letter_navigation()
+        # The letters' start pages are only right for the unfiltered A → Z listing
+        context['letter_jump'] = not search_query and not facet_filters and sort_by == 'alpha_asc'
+        context['facet_counts'] = facet_counts
         context['current_letter'] = letter
         context['current_sort'] = sort_by
         context['search_query'] = search_query
 
+        # Suggest a spelling correction when a search finds nothing
+        if search_query and not len(dictionary_entries) and not dictionary_entries.has_previous():
+            context['spelling_suggestion'] = suggest_spelling(search_query)
+
         return context
 class IdiomsIndexPage(Page):
     intro = RichTextField(blank=True)
     content_panels = Page.content_panels + [FieldPanel('intro')]
     subpage_types = ['home.IdiomPage']
 
+    sort_fields = {
+        'alpha_asc': 'gurmukhi_sort_key',
+        'alpha_desc': '-gurmukhi_sort_key',
+        'popular': '-view_count',
+        'recent': '-first_published_at',
+    }
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
@@ -296,30 +476,14 @@ class IdiomsIndexPage(Page):
         # Search query
         search_query = request.GET.get('q')
         if search_query:
-            all_idioms = all_idioms.search(search_query)
+            all_idioms = filter_by_search(all_idioms, search_query)
 
         # === SORTING ===
         sort_by = request.GET.get('sort', 'alpha_asc')
-        if sort_by == 'alpha_asc':
-            all_idioms = all_idioms.order_by('idiom_gurmukhi')
-        elif sort_by == 'alpha_desc':
-            all_idioms = all_idioms.order_by('-idiom_gurmukhi')
-        elif sort_by == 'popular':
-            all_idioms = all_idioms.order_by('-view_count')
-        elif sort_by == 'recent':
-            all_idioms = all_idioms.order_by('-first_published_at')
-        else:
-            all_idioms = all_idioms.order_by('title')
+        sort_field = self.sort_fields.get(sort_by, 'title')
 
         # === PAGINATION ===
-        paginator = Paginator(all_idioms, 20)
-        page = request.GET.get('page')
-        try:
-            idioms = paginator.page(page)
-        except PageNotAnInteger:
-            idioms = paginator.page(1)
-        except EmptyPage:
-            idioms = paginator.page(paginator.num_pages)
+        idioms = paginate_index(request, all_idioms, 20, sort_field)
 
         context['idioms'] = idioms
         context['current_sort'] = sort_by
@@ -331,6 +495,13 @@ class PhrasesIndexPage(Page):
     content_panels = Page.content_panels + [FieldPanel('intro')]
     subpage_types = ['home.PhrasePage']
 
+    sort_fields = {
+        'alpha_asc': 'gurmukhi_sort_key',
+        'alpha_desc': '-gurmukhi_sort_key',
+        'popular': '-view_count',
+        'recent': '-first_published_at',
+    }
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
@@ -341,7 +512,7 @@ class PhrasesIndexPage(Page):
         # Search query
         search_query = request.GET.get('q')
         if search_query:
-            all_phrases = all_phrases.search(search_query)
+            all_phrases = filter_by_search(all_phrases, search_query)
 
         # Category filter
         category = request.GET.get('category')
@@ -350,26 +521,10 @@ class PhrasesIndexPage(Page):
 
         # === SORTING ===
         sort_by = request.GET.get('sort', 'alpha_asc')
-        if sort_by == 'alpha_asc':
-            all_phrases = all_phrases.order_by('phrase_gurmukhi')
-        elif sort_by == 'alpha_desc':
-            all_phrases = all_phrases.order_by('-phrase_gurmukhi')
-        elif sort_by == 'popular':
-            all_phrases = all_phrases.order_by('-view_count')
-        elif sort_by == 'recent':
-            all_phrases = all_phrases.order_by('-first_published_at')
-        else:
-            all_phrases = all_phrases.order_by('title')
+        sort_field = self.sort_fields.get(sort_by, 'title')
 
         # === PAGINATION ===
-        paginator = Paginator(all_phrases, 20)
-        page = request.GET.get('page')
-        try:
-            phrases = paginator.page(page)
-        except PageNotAnInteger:
-            phrases = paginator.page(1)
-        except EmptyPage:
-            phrases = paginator.page(paginator.num_pages)
+        phrases = paginate_index(request, all_phrases, 20, sort_field)
 
         context['phrases'] = phrases
         context['current_sort'] = sort_by
@@ -382,6 +537,12 @@ class BlogIndexPage(Page):
     content_panels = Page.content_panels + [FieldPanel('intro')]
     subpage_types = ['home.BlogPostPage']
 
+    sort_fields = {
+        'recent': '-first_published_at',
+        'popular': '-view_count',
+        'title': 'title',
+    }
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
@@ -392,7 +553,7 @@ class BlogIndexPage(Page):
         # Search query
         search_query = request.GET.get('q')
         if search_query:
-            all_posts = all_posts.search(search_query)
+            all_posts = filter_by_search(all_posts, search_query)
 
         # Tag filter
         tag = request.GET.get('tag')
@@ -401,22 +562,10 @@ class BlogIndexPage(Page):
 
         # === SORTING ===
         sort_by = request.GET.get('sort', 'recent')
-        if sort_by == 'recent':
-            all_posts = all_posts.order_by('-first_published_at')
-        elif sort_by == 'popular':
-            all_posts = all_posts.order_by('-view_count')
-        elif sort_by == 'title':
-            all_posts = all_posts.order_by('title')
+        sort_field = self.sort_fields.get(sort_by)
 
         # === PAGINATION ===
-        paginator = Paginator(all_posts, 12)
-        page = request.GET.get('page')
-        try:
-            blog_posts = paginator.page(page)
-        except PageNotAnInteger:
-            blog_posts = paginator.page(1)
-        except EmptyPage:
-            blog_posts = paginator.page(paginator.num_pages)
+        blog_posts = paginate_index(request, all_posts, 12, sort_field)
 
         # Get all tags for filter dropdown
         from home.models import BlogPostPageTag
@@ -445,36 +594,26 @@ class EventsIndexPage(Page):
         # Search query
         search_query = request.GET.get('q')
         if search_query:
-            all_events = all_events.search(search_query)
+            all_events = filter_by_search(all_events, search_query)
 
         # Time filter (upcoming/past/all)
         time_filter = request.GET.get('time', 'upcoming')
         if time_filter == 'upcoming':
             all_events = all_events.filter(start_datetime__gte=now)
-            sort_order = 'start_datetime'  # Soonest first
+            sort_field = 'start_datetime'  # Soonest first
         elif time_filter == 'past':
             all_events = all_events.filter(start_datetime__lt=now)
-            sort_order = '-start_datetime'  # Most recent first
+            sort_field = '-start_datetime'  # Most recent first
         else:  # all
-            sort_order = '-start_datetime'
+            sort_field = '-start_datetime'
 
         # Location filter
         location = request.GET.get('location')
         if location:
             all_events = all_events.filter(location__icontains=location)
 
-        # === SORTING ===
-        all_events = all_events.order_by(sort_order)
-
         # === PAGINATION ===
-        paginator = Paginator(all_events, 15)
-        page = request.GET.get('page')
-        try:
-            events = paginator.page(page)
-        except PageNotAnInteger:
-            events = paginator.page(1)
-        except EmptyPage:
-            events = paginator.page(paginator.num_pages)
+        events = paginate_index(request, all_events, 15, sort_field)
 
         context['events'] = events
         context['current_time_filter'] = time_filter
@@ -490,34 +629,92 @@ class EventsIndexPage(Page):
 # Home App
 # ===================================================================
 class HomePage(Page):
-    featured_item = models.ForeignKey('wagtailcore.Page', null=True, blank=True, on_delete=models.SET_NULL, related_name='+', help_text="Optional: Manually select a page to feature. If empty, a random Phrase of the Day will be chosen.")
+    featured_item = models.ForeignKey('wagtailcore.Page', null=True, blank=True, on_delete=models.SET_NULL, related_name='+', help_text="Optional: Manually select a page to feature. If empty, the Phrase of the Day will be chosen.")
     content_panels = Page.content_panels + [FieldPanel('featured_item')]
     subpage_types = ['home.DictionaryIndexPage', 'home.IdiomsIndexPage', 'home.PhrasesIndexPage', 'home.BlogIndexPage', 'home.EventsIndexPage']
 
+    # Homepage blocks are cached, each until a page of one of these types is
+    # published, unpublished or deleted (see home.signals). Trending is also
+    # cleared by the hourly trending refresh and expires after an hour, and the
+    # featured page expires at midnight.
+    cached_blocks = {
+        'featured': ['home.PhrasePage'],
+        'trending': ['home.DictionaryEntryPage', 'home.IdiomPage', 'home.PhrasePage'],
+        'most_visited': ['home.DictionaryEntryPage', 'home.IdiomPage', 'home.PhrasePage'],
+        'stats': ['home.DictionaryEntryPage', 'home.IdiomPage', 'home.PhrasePage', 'home.BlogPostPage'],
+        'latest_blog_posts': ['home.BlogPostPage'],
+    }
+    block_cache_timeout = 60 * 60 * 24
+    # The trending scores change every hour, so the block never outlives them
+    # (the most visited block is cached as long)
+    trending_block_timeout = 60 * 60
+
+    @staticmethod
+    def block_cache_key(page_id, name):
+        if name == 'latest_blog_posts':
+            # Rendered by a {% cache %} fragment in the template
+            return make_template_fragment_key('homepage_latest_blog_posts', [page_id])
+        return f"homepage:{page_id}:{name}"
+
+    def get_cached_block(self, name, compute, timeout=None):
+        """
+        Returns the value of a homepage block from the cache, computing and
+        caching it when missing.
+        """
+        key = self.block_cache_key(self.pk, name)
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, timeout or self.block_cache_timeout)
+        return value
+
+    @classmethod
+    def clear_cached_blocks(cls, names):
+        """Clears the named blocks of every homepage"""
+        page_ids = cls.objects.values_list('pk', flat=True)
+        cache.delete_many([cls.block_cache_key(page_id, name) for page_id in page_ids for name in names])
+
+    def get_featured_page(self):
+        """
+        Returns the manually featured page if it is live, otherwise the Phrase of the Day.
+        """
+        if self.featured_item_id:
+            featured_item = Page.objects.live().filter(pk=self.featured_item_id).first()
+            if featured_item:
+                return featured_item.specific
+        return get_page_of_the_day(PhrasePage)
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
         # Featured Page (Phrase of the Day)
-        if self.featured_item and self.featured_item.live:
-            featured_page = self.featured_item.specific
-        else:
-            featured_page = PhrasePage.objects.live().public().order_by('?').first()
-        context['featured_page'] = featured_page
-
-        # Trending Content
-        context['trending_words'] = DictionaryEntryPage.objects.live().public().order_by('-view_count')[:3]
-        context['trending_idioms'] = IdiomPage.objects.live().public().order_by('-view_count')[:3]
-        context['trending_phrases'] = PhrasePage.objects.live().public().order_by('-view_count')[:3]
+        context['featured_page'] = self.get_cached_block('featured', self.get_featured_page, seconds_until_tomorrow())
+
+        # Trending Content (time-decayed scores, refreshed hourly by the refresh_trending command)
+        trending = self.get_cached_block('trending', lambda: {
+            'words': get_trending_pages(DictionaryEntryPage),
+            'idioms': get_trending_pages(IdiomPage),
+            'phrases': get_trending_pages(PhrasePage),
+        }, self.trending_block_timeout)
+        context['trending_words'] = trending['words']
+        context['trending_idioms'] = trending['idioms']
+        context['trending_phrases'] = trending['phrases']
+
+        # Most Visited (unique visitors over the last week, from the daily visitor sketches)
+        from .visitors import rank_by_unique_visitors  # home.visitors imports these models
+        context['most_visited'] = self.get_cached_block('most_visited', lambda: rank_by_unique_visitors(
+            Page.objects.live().public().type(DictionaryEntryPage, IdiomPage, PhrasePage), 'week', 10,
+        ), self.trending_block_timeout)
 
         # Stats for Counter Animation
-        context['stats'] = {
+        context['stats'] = self.get_cached_block('stats', lambda: {
             'words': DictionaryEntryPage.objects.live().public().count(),
             'idioms': IdiomPage.objects.live().public().count(),
             'phrases': PhrasePage.objects.live().public().count(),
             'blog_posts': BlogPostPage.objects.live().public().count(),
-        }
+        })
 
-        # Latest Blog Posts
+        # Latest Blog Posts (lazy: only queried when the template fragment is not cached)
         context['latest_blog_posts'] = BlogPostPage.objects.live().public().order_by('-first_published_at')[:3]
 
         return context
@@ -525,7 +722,11 @@ class HomePage(Page):
 # ===================================================================
 # Dictionary App - NOW INHERITS FROM BaseContentPage
 # ===================================================================
-class DictionaryEntryPage(BaseContentPage):
+class DictionaryEntryPage(GurmukhiSortedPage):
+    gurmukhi_sort_field = 'headword_gurmukhi'
+    search_card_fields = ['headword_gurmukhi', 'headword_roman_simple']
+    search_snippet_field = 'enriched_definition_english'
+    derived_fields = GurmukhiSortedPage.derived_fields + ['first_letter', 'has_synonyms', 'has_antonyms', 'has_examples']
     lemma_gurmukhi = models.CharField(max_length=255, help_text="The base form of the word in Gurmukhi."); headword_gurmukhi = models.CharField(max_length=255); headword_shahmukhi = models.CharField(max_length=255); headword_roman_simple = models.CharField(max_length=255); headword_roman_diacritics = models.CharField(max_length=255, blank=True); headword_roman_ipa = models.CharField(max_length=255, blank=True, verbose_name="Roman (IPA)")
     parts_of_speech = models.CharField(max_length=100); sound = models.ForeignKey('wagtaildocs.Document', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
     enriched_definition_gurmukhi = RichTextField(); enriched_definition_english = RichTextField(); simple_definition_shahmukhi = models.TextField(); simple_definition_hindi = models.TextField(blank=True); simple_definition_urdu = models.TextField(blank=True)
@@ -542,52 +743,52 @@ class DictionaryEntryPage(BaseContentPage):
         ('other', 'Other'),
     ], help_text="Language origin of the word")
     tags = ClusterTaggableManager(through='home.DictionaryEntryTag', blank=True) # view_count is now inherited
-    search_fields = Page.search_fields + [index.SearchField('headword_gurmukhi', partial_match=True, boost=5), index.SearchField('headword_shahmukhi', partial_match=True, boost=5), index.SearchField('headword_roman_simple', partial_match=True, boost=4), index.SearchField('enriched_definition_english', boost=2), index.SearchField('enriched_definition_gurmukhi'), index.SearchField('synonyms_gurmukhi')]
+    first_letter = models.CharField(max_length=4, blank=True, default='', editable=False, db_index=True, help_text="First Gurmukhi letter of the headword, used by the alphabet navigation.")
+
+    # Content presence flags, kept in sync on save so the "has content" filters don't scan text columns
+    has_synonyms = models.BooleanField(default=False, editable=False)
+    has_antonyms = models.BooleanField(default=False, editable=False)
+    has_examples = models.BooleanField(default=False, editable=False)
+    search_fields = Page.search_fields + [NormalizedSearchField('headword_gurmukhi', partial_match=True, boost=5), NormalizedSearchField('headword_shahmukhi', partial_match=True, boost=5), NormalizedSearchField('headword_roman_simple', partial_match=True, boost=4), NormalizedSearchField('enriched_definition_english', boost=2), NormalizedSearchField('enriched_definition_gurmukhi'), NormalizedSearchField('synonyms_gurmukhi')]
     content_panels = Page.content_panels + [MultiFieldPanel([FieldPanel('lemma_gurmukhi'), FieldPanel('headword_gurmukhi'), FieldPanel('headword_shahmukhi')], heading="Headwords"), MultiFieldPanel([FieldPanel('headword_roman_simple'), FieldPanel('headword_roman_diacritics'), FieldPanel('headword_roman_ipa')], heading="Roman Transliteration"), MultiFieldPanel([FieldPanel('parts_of_speech'), FieldPanel('sound'), FieldPanel('tags')], heading="Core Details"), MultiFieldPanel([FieldPanel('enriched_definition_gurmukhi'), FieldPanel('enriched_definition_english'), FieldPanel('simple_definition_shahmukhi'), FieldPanel('simple_definition_hindi'), FieldPanel('simple_definition_urdu')], heading="Definitions"), MultiFieldPanel([FieldPanel('example_sentences_gurmukhi'), FieldPanel('synonyms_gurmukhi'), FieldPanel('antonyms_gurmukhi')], heading="Usage"), MultiFieldPanel([FieldPanel('etymology'), FieldPanel('loaned_from'), FieldPanel('origin')], heading="Origin")]
     parent_page_types = ['home.DictionaryIndexPage']; subpage_types = []
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['first_letter', 'gurmukhi_sort_key'], name='home_dict_letter_sort_idx'),
+            # Partial indexes so each "has content" filter composes with the alphabetical and popular sorts
+            models.Index(fields=['gurmukhi_sort_key'], condition=Q(has_synonyms=True), name='home_dict_syn_sort_idx'),
+            models.Index(fields=['-view_count'], condition=Q(has_synonyms=True), name='home_dict_syn_views_idx'),
+            models.Index(fields=['gurmukhi_sort_key'], condition=Q(has_antonyms=True), name='home_dict_ant_sort_idx'),
+            models.Index(fields=['-view_count'], condition=Q(has_antonyms=True), name='home_dict_ant_views_idx'),
+            models.Index(fields=['gurmukhi_sort_key'], condition=Q(has_examples=True), name='home_dict_ex_sort_idx'),
+            models.Index(fields=['-view_count'], condition=Q(has_examples=True), name='home_dict_ex_views_idx'),
+            # Trigram index for partial matches on the headwords (see home.search_backend)
+            GinIndex(OpClass(NormalizedText('headword_gurmukhi'), name='gin_trgm_ops'), OpClass(NormalizedText('headword_shahmukhi'), name='gin_trgm_ops'), OpClass(NormalizedText('headword_roman_simple'), name='gin_trgm_ops'), name='home_dict_headword_norm_idx'),
+        ]
+
+    def update_derived_fields(self):
+        super().update_derived_fields()
+        self.first_letter = extract_first_letter_gurmukhi(self.headword_gurmukhi)
+        self.has_synonyms = bool(self.synonyms_gurmukhi.strip())
+        self.has_antonyms = bool(self.antonyms_gurmukhi.strip())
+        # Rich text can be empty markup such as '<p></p>'
+        self.has_examples = bool(strip_tags(self.example_sentences_gurmukhi).strip())
+
     def get_similar_words(self, max_words=6):
         """
-        Returns similar dictionary entries based on shared tags, part of speech, or etymology.
-        """
-        from django.db.models import Count, Q
-
-        # Get entries that share tags
-        entry_tags = self.tags.all()
-        similar_words = None
-
-        if entry_tags:
-            tag_ids = [tag.id for tag in entry_tags]
-            similar_words = (
-                DictionaryEntryPage.objects
-                .live()
-                .public()
-                .exclude(pk=self.pk)
-                .filter(tags__in=tag_ids)
-                .annotate(same_tags=Count('pk'))
-                .order_by('-same_tags', '-view_count')
-                .distinct()[:max_words]
-            )
-
-        # If no tag matches, find by part of speech
-        if not similar_words or similar_words.count() < max_words:
-            remaining = max_words - (similar_words.count() if similar_words else 0)
-            pos_similar = (
-                DictionaryEntryPage.objects
-                .live()
-                .public()
-                .exclude(pk=self.pk)
-                .filter(parts_of_speech=self.parts_of_speech)
-                .order_by('-view_count')[:remaining]
-            )
-
-            if similar_words:
-                # Combine querysets
-                similar_words = list(similar_words) + list(pos_similar)
-            else:
-                similar_words = pos_similar
+        Returns similar dictionary entries based on shared tags, lemma, part of speech or etymology.
 
-        return similar_words[:max_words] if similar_words else []
+        Neighbours are precomputed into SimilarEntry (see home.similarity), so this
+        is a single indexed lookup.
+        """
+        return (
+            DictionaryEntryPage.objects
+            .live()
+            .public()
+            .filter(similar_to__entry=self)
+            .order_by('-similar_to__score', '-view_count')[:max_words]
+        )
 
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
@@ -596,11 +797,37 @@ class DictionaryEntryPage(BaseContentPage):
 
 class DictionaryEntryTag(TaggedItemBase):
     content_object = ParentalKey('home.DictionaryEntryPage', on_delete=models.CASCADE, related_name='tagged_items')
+
+
+class SimilarEntry(models.Model):
+    """
+    A precomputed "related word" of a dictionary entry.
+
+    Rows are written by home.similarity: in bulk by the build_similar_entries
+    command, and for a single entry when it is published.
+    """
+    entry = models.ForeignKey(DictionaryEntryPage, on_delete=models.CASCADE, related_name='similar_entries')
+    similar = models.ForeignKey(DictionaryEntryPage, on_delete=models.CASCADE, related_name='similar_to')
+    score = models.PositiveSmallIntegerField(help_text="Higher scores are more similar")
+
+    class Meta:
+        unique_together = ['entry', 'similar']
+        indexes = [
+            models.Index(fields=['entry', '-score'], name='home_similar_entry_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entry_id} ~ {self.similar_id} ({self.score})"
+
     # ===================================================================
 # Idioms App - NOW INHERITS FROM BaseContentPage
 # ===================================================================
 
-class IdiomPage(BaseContentPage):
+class IdiomPage(GurmukhiSortedPage):
+    gurmukhi_sort_field = 'idiom_gurmukhi'
+    search_card_fields = ['idiom_gurmukhi', 'transliteration_roman_simple']
+    search_snippet_field = 'definition_english'
+
     idiom_id = models.PositiveIntegerField(unique=True, help_text="The original ID from the JSON file.")
     idiom_gurmukhi = models.CharField(max_length=500)
     idiom_basic_defintion_gurmukhi = models.TextField(blank=True, help_text="Basic definition in Gurmukhi (note: typo from source JSON)")
@@ -612,17 +839,26 @@ class IdiomPage(BaseContentPage):
     definition_english = models.TextField()
     western_phrase = models.JSONField(help_text="A list of equivalent or similar Western phrases.")
     # view_count is now inherited
-    search_fields = Page.search_fields + [index.SearchField('idiom_gurmukhi', partial_match=True, boost=5), index.SearchField('idiom_shahmukhi', partial_match=True, boost=5), index.SearchField('transliteration_roman_simple', boost=4), index.SearchField('definition_english', boost=2), index.SearchField('idiom_basic_defintion_gurmukhi')]
+    search_fields = Page.search_fields + [NormalizedSearchField('idiom_gurmukhi', partial_match=True, boost=5), NormalizedSearchField('idiom_shahmukhi', partial_match=True, boost=5), NormalizedSearchField('transliteration_roman_simple', boost=4), NormalizedSearchField('definition_english', boost=2), NormalizedSearchField('idiom_basic_defintion_gurmukhi')]
     content_panels = Page.content_panels + [FieldPanel('idiom_id'), MultiFieldPanel([FieldPanel('idiom_gurmukhi'), FieldPanel('idiom_basic_defintion_gurmukhi'), FieldPanel('idiom_shahmukhi'), FieldPanel('transliteration_roman_simple'), FieldPanel('transliteration_roman')], heading="Idiom Text"), MultiFieldPanel([FieldPanel('definition_gurmukhi'), FieldPanel('definition_shahmukhi'), FieldPanel('definition_english')], heading="Definitions"), FieldPanel('western_phrase')]
     parent_page_types = ['home.IdiomsIndexPage']
     subpage_types = []
 
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(NormalizedText('idiom_gurmukhi'), name='gin_trgm_ops'), OpClass(NormalizedText('idiom_shahmukhi'), name='gin_trgm_ops'), name='home_idiom_norm_idx'),
+        ]
+
 
 # ===================================================================
 # Phrases App - NOW INHERITS FROM BaseContentPage
 # ===================================================================
 
-class PhrasePage(BaseContentPage):
+class PhrasePage(GurmukhiSortedPage):
+    gurmukhi_sort_field = 'phrase_gurmukhi'
+    search_card_fields = ['phrase_gurmukhi', 'roman_simple']
+    search_snippet_field = 'meaning_english'
+
     # IDs from JSON
     phrase_id = models.PositiveIntegerField(unique=True, null=True, blank=True, help_text="The original ID from the JSON file.")
 
@@ -670,13 +906,13 @@ class PhrasePage(BaseContentPage):
 
     # view_count is now inherited
     search_fields = Page.search_fields + [
-        index.SearchField('phrase_gurmukhi', partial_match=True, boost=5),
-        index.SearchField('phrase_shahmukhi', partial_match=True, boost=5),
-        index.SearchField('roman_simple', boost=4),
-        index.SearchField('meaning_english', boost=3),
-        index.SearchField('enriched_definition_english', boost=2),
-        index.SearchField('definition_gurmukhi'),
-        index.SearchField('synonyms_gurmukhi')
+        NormalizedSearchField('phrase_gurmukhi', partial_match=True, boost=5),
+        NormalizedSearchField('phrase_shahmukhi', partial_match=True, boost=5),
+        NormalizedSearchField('roman_simple', boost=4),
+        NormalizedSearchField('meaning_english', boost=3),
+        NormalizedSearchField('enriched_definition_english', boost=2),
+        NormalizedSearchField('definition_gurmukhi'),
+        NormalizedSearchField('synonyms_gurmukhi')
     ]
 
     content_panels = Page.content_panels + [
@@ -713,6 +949,11 @@ class PhrasePage(BaseContentPage):
     parent_page_types = ['home.PhrasesIndexPage']
     subpage_types = []
 
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(NormalizedText('phrase_gurmukhi'), name='gin_trgm_ops'), OpClass(NormalizedText('phrase_shahmukhi'), name='gin_trgm_ops'), name='home_phrase_norm_idx'),
+        ]
+
 
 # ===================================================================
 # Blog App - NOW INHERITS FROM BaseContentPage
@@ -722,6 +963,9 @@ class BlogPostPageTag(TaggedItemBase):
     content_object = ParentalKey('home.BlogPostPage', on_delete=models.CASCADE, related_name='tagged_items')
 
 class BlogPostPage(BaseContentPage):
+    search_card_fields = ['featured_image']
+    search_snippet_field = 'excerpt'
+
     # IDs from JSON
     post_id = models.CharField(max_length=100, unique=True, blank=True, null=True, help_text="Original ID from JSON")
     uuid = models.UUIDField(blank=True, null=True, help_text="UUID from original post")
@@ -912,6 +1156,9 @@ class EventPageTag(TaggedItemBase):
     content_object = ParentalKey('home.EventPage', on_delete=models.CASCADE, related_name='tagged_items')
 
 class EventPage(BaseContentPage):
+    search_card_fields = ['start_datetime', 'location']
+    search_snippet_field = 'description'
+
     start_datetime = models.DateTimeField()
     end_datetime = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=255)
@@ -959,20 +1206,22 @@ class AuthorsIndexPage(Page):
 
     subpage_types = ['home.AuthorDetailPage']
 
+    sort_fields = {
+        'name': 'name_gurmukhi',
+        'birth_year': 'birth_date',
+        'popular': '-view_count',
+    }
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
         # Get all authors from the snippet
-        all_authors = Author.objects.prefetch_related('detail_pages').all()
+        all_authors = Author.objects.all()
 
-        # Search filter
+        # Search filter (names in all scripts and biographies)
         search_query = request.GET.get('q')
         if search_query:
-            all_authors = all_authors.filter(
-                models.Q(name_gurmukhi__icontains=search_query) |
-                models.Q(name_english__icontains=search_query) |
-                models.Q(name_hindi__icontains=search_query)
-            )
+            all_authors = filter_by_search(all_authors, search_query)
 
         # Genre/style filter
         style = request.GET.get('style')
@@ -981,22 +1230,10 @@ class AuthorsIndexPage(Page):
 
         # Sort
         sort_by = request.GET.get('sort', 'name')
-        if sort_by == 'name':
-            all_authors = all_authors.order_by('name_gurmukhi')
-        elif sort_by == 'birth_year':
-            all_authors = all_authors.order_by('birth_date')
-        elif sort_by == 'popular':
-            all_authors = all_authors.order_by('-view_count')
+        sort_field = self.sort_fields.get(sort_by)
 
         # Pagination
-        paginator = Paginator(all_authors, 24)
-        page = request.GET.get('page')
-        try:
-            authors = paginator.page(page)
-        except PageNotAnInteger:
-            authors = paginator.page(1)
-        except EmptyPage:
-            authors = paginator.page(paginator.num_pages)
+        authors = paginate_index(request, all_authors.prefetch_related('detail_pages'), 24, sort_field)
 
         context['authors'] = authors
         context['search_query'] = search_query
@@ -1031,11 +1268,15 @@ class AuthorDetailPage(Page):
             context['blog_posts'] = self.author.get_blog_posts()[:10]
             context['events'] = self.author.get_events()[:10]
 
-            # Increment view count
-            Author.objects.filter(pk=self.author.pk).update(view_count=F('view_count') + 1)
-
         return context
 
+    def get_viewed_objects(self):
+        """
+        A view of this page counts as a view of its author, recorded by
+        PageViewCounterMiddleware.
+        """
+        return [self.author] if self.author else []
+
 
 # ===================================================================
 # Books App
@@ -1055,6 +1296,14 @@ class BooksIndexPage(Page):
 
     subpage_types = ['home.BookPage']
 
+    sort_fields = {
+        'title': 'gurmukhi_sort_key',
+        'author': 'author__name_gurmukhi',
+        'year': '-publication_year',
+        'popular': '-view_count',
+        'recent': '-first_published_at',
+    }
+
     def get_context(self, request, *args, **kwargs):
         context = super().get_context(request, *args, **kwargs)
 
@@ -1064,7 +1313,7 @@ class BooksIndexPage(Page):
         # Search filter
         search_query = request.GET.get('q')
         if search_query:
-            all_books = all_books.search(search_query)
+            all_books = filter_by_search(all_books, search_query)
 
         # Author filter
         author_id = request.GET.get('author')
@@ -1091,28 +1340,12 @@ class BooksIndexPage(Page):
         if tag:
             all_books = all_books.filter(tags__name=tag)
 
-        # Sort
+        # Sort (defaults to most recent)
         sort_by = request.GET.get('sort', 'recent')
-        if sort_by == 'title':
-            all_books = all_books.order_by('title_gurmukhi')
-        elif sort_by == 'author':
-            all_books = all_books.order_by('author__name_gurmukhi')
-        elif sort_by == 'year':
-            all_books = all_books.order_by('-publication_year')
-        elif sort_by == 'popular':
-            all_books = all_books.order_by('-view_count')
-        else:  # recent
-            all_books = all_books.order_by('-first_published_at')
+        sort_field = self.sort_fields.get(sort_by, '-first_published_at')
 
         # Pagination
-        paginator = Paginator(all_books, 24)
-        page = request.GET.get('page')
-        try:
-            books = paginator.page(page)
-        except PageNotAnInteger:
-            books = paginator.page(1)
-        except EmptyPage:
-            books = paginator.page(paginator.num_pages)
+        books = paginate_index(request, all_books, 24, sort_field)
 
         # Get all authors for filter dropdown
         all_authors = Author.objects.all().order_by('name_gurmukhi')
@@ -1125,8 +1358,11 @@ class BooksIndexPage(Page):
         return context
 
 
-class BookPage(BaseContentPage):
+class BookPage(GurmukhiSortedPage):
     """Individual book page"""
+    gurmukhi_sort_field = 'title_gurmukhi'
+    search_card_fields = ['title_gurmukhi', 'cover_image']
+    search_snippet_field = 'description_english'
 
     # Cover image
     cover_image = models.ForeignKey(
@@ -1180,10 +1416,10 @@ class BookPage(BaseContentPage):
     # view_count is inherited from BaseContentPage
 
     search_fields = Page.search_fields + [
-        index.SearchField('title_gurmukhi', partial_match=True, boost=5),
-        index.SearchField('title_english', partial_match=True, boost=5),
-        index.SearchField('description_english', boost=2),
-        index.SearchField('description_gurmukhi'),
+        NormalizedSearchField('title_gurmukhi', partial_match=True, boost=5),
+        NormalizedSearchField('title_english', partial_match=True, boost=5),
+        NormalizedSearchField('description_english', boost=2),
+        NormalizedSearchField('description_gurmukhi'),
     ]
 
     content_panels = Page.content_panels + [
@@ -1221,6 +1457,11 @@ class BookPage(BaseContentPage):
     parent_page_types = ['home.BooksIndexPage']
     subpage_types = []
 
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(NormalizedText('title_gurmukhi'), name='gin_trgm_ops'), OpClass(NormalizedText('title_english'), name='gin_trgm_ops'), name='home_book_title_norm_idx'),
+        ]
+
     def get_similar_books(self, max_books=6):
         """Get similar books based on author, category, or tags"""
         from django.db.models import Count, Q
@@ -1332,4 +1573,116 @@ class UserBookStatus(models.Model):
         """Calculate reading progress as percentage"""
         if self.book.pages and self.current_page:
             return min(int((self.current_page / self.book.pages) * 100), 100)
-        return 0
\ No newline at end of file
+        return 0
+
+# ===================================================================
+# Search Statistics
+# ===================================================================
+
+class SearchQueryStat(models.Model):
+    """
+    Daily hit counts of a normalized search query.
+
+    Rows are written in batches by home.search_stats, from hits buffered in
+    memory by each worker.
+    """
+    query = models.CharField(max_length=255, help_text="Normalized search query")
+    date = models.DateField()
+    hits = models.PositiveIntegerField(default=0)
+    zero_result_hits = models.PositiveIntegerField(default=0, help_text="Searches that found nothing")
+
+    class Meta:
+        unique_together = ['query', 'date']
+        indexes = [
+            models.Index(fields=['date'], name='home_search_stat_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.query} ({self.date}: {self.hits})"
+
+
+# ===================================================================
+# Visitor Statistics
+# ===================================================================
+
+class PageVisitorSketch(models.Model):
+    """
+    HyperLogLog sketch of the distinct visitors of a page on one day.
+
+    Rows are merged in batches by home.visitors, from visits buffered in
+    memory by each worker; `visitors` is the sketch's estimate.
+    """
+    page = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    sketch = models.BinaryField(default=b'', help_text="zlib-compressed HyperLogLog registers")
+    visitors = models.PositiveIntegerField(default=0, help_text="Estimated unique visitors")
+
+    class Meta:
+        unique_together = ['page', 'date']
+        indexes = [
+            models.Index(fields=['date'], name='home_visitor_sketch_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.page_id} ({self.date}: ~{self.visitors})"
+
+
+class PageViewBucket(models.Model):
+    """
+    Views of a page in one hour.
+
+    Rows are written in batches by home.view_counts, alongside the view_count
+    fields, and read by the hourly trending refresh (home.trending).
+    """
+    page = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+')
+    hour = models.DateTimeField(help_text="Start of the hour")
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['page', 'hour']
+        indexes = [
+            models.Index(fields=['hour'], name='home_view_bucket_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.page_id} ({self.hour:%Y-%m-%d %H}h: {self.views})"
+
+
+class TrendingScore(models.Model):
+    """
+    Time-decayed view score of a recently viewed page.
+
+    Recomputed hourly from PageViewBucket by home.trending, which keeps only
+    the top pages of each content type.
+    """
+    page = models.OneToOneField('wagtailcore.Page', on_delete=models.CASCADE, primary_key=True, related_name='+')
+    content_type = models.ForeignKey('contenttypes.ContentType', on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(default=0)
+    hour = models.DateTimeField(help_text="Views before this hour are included in the score")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['content_type', '-score'], name='home_trending_type_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.page_id} ({self.score:.1f})"
+
+
+# ===================================================================
+# Content Export
+# ===================================================================
+
+class RemovedPage(models.Model):
+    """
+    A dictionary entry, idiom or phrase that was unpublished or deleted.
+
+    Recorded by home.signals, so incremental exports (home.export) can tell
+    their consumers which pages to drop.
+    """
+    page_id = models.PositiveIntegerField(primary_key=True, help_text="Id of the page, which may no longer exist")
+    content_type = models.ForeignKey('contenttypes.ContentType', on_delete=models.CASCADE, related_name='+')
+    removed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.page_id} (removed {self.removed_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,213 @@
+"""
+Full-page cache of Wagtail pages for anonymous visitors.
+
+PageCacheMiddleware (home.middleware.page_cache) stores the gzip-compressed
+response of anonymous GET requests for Wagtail pages, keyed on the host,
+active language, path and query string, and serves later requests from it
+without routing, querying or rendering. Clients that accept gzip get the
+compressed body as is.
+
+Entries are never deleted one by one. Each key includes a version number of
+its path, bumped when the page at that path changes (home.signals purges the
+page, its parent index page and the homepage when a page is published,
+unpublished or deleted), and a global version, bumped when an author is
+saved or deleted, as authors appear on many pages. Old entries then expire.
+
+The cache is opt-in: set PAGE_CACHE_ENABLED = True, with a default cache
+shared by all processes (see CACHES). Hits and misses are counted (buffered
+per worker) and reported by the page_cache_stats command.
+"""
+
+import gzip
+import hashlib
+import time
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.translation import get_language
+
+from .buffering import HitBuffer
+
+PAGE_CACHE_ENABLED = getattr(settings, 'PAGE_CACHE_ENABLED', False)
+
+# Cached responses expire after this long (seconds), even without a purge
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 60)
+
+GLOBAL_VERSION_KEY = 'page_cache:version'
+
+# Cache keys of the hit and miss counters
+PAGE_CACHE_STATS_KEYS = {'hit': 'page_cache:hits', 'miss': 'page_cache:misses'}
+
+# Response headers that are not stored
+UNCACHED_HEADERS = {'set-cookie', 'content-length', 'content-encoding'}
+
+
+def _path_version_key(path):
+    return 'page_cache:version:' + hashlib.sha1(path.encode()).hexdigest()
+
+
+def _new_version():
+    # A version that was evicted from the cache must not come back with an old value
+    return time.time_ns()
+
+
+def is_cacheable_request(request):
+    """
+    Check whether a request may be answered from, or stored in, the page cache.
+
+    Only anonymous GET requests without a session are cached, so nothing
+    personal (messages, CSRF tokens, reading lists) is ever shared.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        bool: True if the request can be cached
+    """
+    user = getattr(request, 'user', None)
+    return (
+        request.method == 'GET'
+        and (user is None or not user.is_authenticated)
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def page_cache_key(request):
+    """
+    Return the cache key of a request's response.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        str: The key, which changes whenever the request's path or the whole cache is purged
+    """
+    path_key = _path_version_key(request.path)
+    versions = cache.get_many([GLOBAL_VERSION_KEY, path_key])
+    missing = {key: _new_version() for key in (GLOBAL_VERSION_KEY, path_key) if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+
+    digest = hashlib.sha1(f"{request.get_host()}|{get_language()}|{request.get_full_path()}".encode()).hexdigest()
+    return f"page_cache:{versions[GLOBAL_VERSION_KEY]}:{versions[path_key]}:{digest}"
+
+
+def get_cached_response(request, key):
+    """
+    Return the cached response for a request, or None.
+
+    Args:
+        request: The HTTP request
+        key (str): The request's cache key (see page_cache_key)
+
+    Returns:
+        tuple: (response, page id, viewed objects as (model label, id) pairs), or None
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+
+    if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+        response = HttpResponse(entry['content'], status=entry['status'])
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(entry['content']), status=entry['status'])
+    for header, value in entry['headers']:
+        response[header] = value
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response, entry['page_id'], entry['viewed']
+
+
+def cache_response(key, response, page_id, viewed):
+    """
+    Store a rendered page response, unless it is personal or not a plain 200 response.
+
+    Args:
+        key (str): The request's cache key (see page_cache_key)
+        response: The response
+        page_id (int): Id of the page that was served
+        viewed (list): (model label, id) pairs of the objects a view counts for
+
+    Returns:
+        bool: True if the response was stored
+    """
+    if (
+        response.status_code != 200
+        or response.streaming
+        or response.cookies
+        or response.has_header('Content-Encoding')
+        or 'private' in response.get('Cache-Control', '')
+        or 'no-store' in response.get('Cache-Control', '')
+    ):
+        return False
+
+    cache.set(key, {
+        'status': response.status_code,
+        'headers': [(header, value) for header, value in response.items() if header.lower() not in UNCACHED_HEADERS],
+        'content': gzip.compress(response.content),
+        'page_id': page_id,
+        'viewed': viewed,
+    }, PAGE_CACHE_TIMEOUT)
+    return True
+
+
+def purge_pages(pages):
+    """
+    Purge the cached responses of pages, whatever their query string or language.
+
+    Args:
+        pages: The pages to purge
+    """
+    keys = set()
+    for page in pages:
+        url_parts = page.get_url_parts()
+        if url_parts:
+            # Page URLs are percent-encoded, request paths are not
+            keys.add(_path_version_key(unquote(url_parts[2])))
+
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+
+
+def purge_all():
+    """Purge every cached response"""
+    cache.set(GLOBAL_VERSION_KEY, _new_version(), None)
+
+
+def _add_stats(counts):
+    for outcome, hits in counts.items():
+        try:
+            cache.incr(PAGE_CACHE_STATS_KEYS[outcome], hits)
+        except ValueError:
+            cache.add(PAGE_CACHE_STATS_KEYS[outcome], 0, None)
+            cache.incr(PAGE_CACHE_STATS_KEYS[outcome], hits)
+
+
+page_cache_stats = HitBuffer(_add_stats, max_hits=100)
+
+
+def get_page_cache_stats():
+    """
+    Return the hit and miss counts of the page cache.
+
+    Returns:
+        dict: 'hits', 'misses' and 'hit_rate' (None before any request)
+    """
+    page_cache_stats.flush()
+    counts = cache.get_many(PAGE_CACHE_STATS_KEYS.values())
+    hits = counts.get(PAGE_CACHE_STATS_KEYS['hit'], 0)
+    misses = counts.get(PAGE_CACHE_STATS_KEYS['miss'], 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else None}
+
+
+def reset_page_cache_stats():
+    """Set the hit and miss counts to zero"""
+    cache.delete_many(PAGE_CACHE_STATS_KEYS.values())
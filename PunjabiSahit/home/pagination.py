@@ -0,0 +1,312 @@
+"""
+Pagination for the Punjabi Sahit index pages.
+
+Index pages support two modes:
+- Numbered pages (the default), using Django's Paginator with OFFSET and COUNT(*)
+- Cursor pages, used when the request has a `cursor` parameter. Each page is
+  fetched with a keyset condition on the active sort field (with the pk as a
+  tie-breaker), so deep pages cost the same as the first one.
+
+Both kinds of page have `previous_querystring` and `next_querystring` for
+their links. When the listing has a sort field, the links of numbered pages
+carry cursors too, so following "next" (as crawlers do) never goes deeper
+with OFFSET; only the page numbers themselves do.
+"""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import F, Q, QuerySet
+from django.http import QueryDict
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _json_default(value):
+    # Keep full precision, so the cursor compares equal to the stored value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(direction, value, pk):
+    """
+    Encode a position in a sorted listing as an opaque, URL-safe string.
+
+    Args:
+        direction (str): 'next' for rows after the position, 'prev' for rows before it
+        value: Sort field value at the position
+        pk: Primary key at the position
+
+    Returns:
+        str: The encoded cursor
+    """
+    payload = json.dumps([direction, value, pk], default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The encoded cursor
+
+    Returns:
+        tuple: (direction, value, pk)
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor(cursor)
+    if direction not in ('next', 'prev') or not isinstance(pk, int):
+        raise InvalidCursor(cursor)
+    return direction, value, pk
+
+
+class KeysetPage:
+    """
+    A single page of results from KeysetPaginator.
+
+    Mirrors the parts of Django's Page that the templates use, plus the
+    querystrings for the previous/next links.
+    """
+    is_cursor_page = True
+
+    def __init__(self, object_list, previous_cursor, next_cursor, querydict=None):
+        self.object_list = object_list
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+        self.querydict = querydict
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_querystring(self):
+        return _querystring(self.querydict, cursor=self.next_cursor) if self.has_next() else ''
+
+    @property
+    def previous_querystring(self):
+        return _querystring(self.querydict, cursor=self.previous_cursor) if self.has_previous() else ''
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the last row shown instead of using
+    OFFSET, and never counts the full result set.
+
+    Args:
+        queryset: The queryset to paginate (filters applied, not yet ordered)
+        per_page (int): Number of rows per page
+        sort_field (str): Field to sort on, prefixed with '-' for descending order.
+                          May follow relations (e.g. 'author__name_gurmukhi').
+    """
+
+    def __init__(self, queryset, per_page, sort_field='pk'):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.descending = sort_field.startswith('-')
+        self.field = sort_field.lstrip('-')
+        self.nullable = self.field != 'pk' and _is_nullable(queryset.model, self.field)
+        self.model_field = _get_field(queryset.model, self.field)
+
+    def _ordering(self, reverse=False):
+        descending = self.descending != reverse
+        # NULLs always come last when reading forwards, whatever the database default
+        nulls = {}
+        if self.nullable:
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        if descending:
+            return [F(self.field).desc(**nulls), F('pk').desc()]
+        return [F(self.field).asc(**nulls), F('pk').asc()]
+
+    def _seek(self, value, pk, forward):
+        """Build the condition for rows after (forward) or before the position (value, pk)"""
+        op = 'gt' if forward != self.descending else 'lt'
+        if value is None:
+            condition = Q(**{f'{self.field}__isnull': True, f'pk__{op}': pk})
+            if not forward:
+                condition |= Q(**{f'{self.field}__isnull': False})
+            return condition
+
+        condition = Q(**{f'{self.field}__{op}': value}) | Q(**{self.field: value, f'pk__{op}': pk})
+        if forward and self.nullable:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+    def _decode(self, cursor):
+        """Decode a cursor, converting its value to the sort field's type"""
+        direction, value, pk = decode_cursor(cursor)
+        if value is not None:
+            try:
+                value = self.model_field.to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise InvalidCursor(cursor)
+        return direction, value, pk
+
+    def position(self, obj):
+        """Return the (sort value, pk) of a row of ordered_queryset()"""
+        return obj.keyset_sort_value, obj.pk
+
+    def ordered_queryset(self):
+        """Return the queryset in the paginator's order, annotated with the sort value of each row"""
+        return self.queryset.annotate(keyset_sort_value=F(self.field)).order_by(*self._ordering())
+
+    def page(self, cursor=None, querydict=None):
+        """
+        Return the page of results described by cursor.
+
+        Args:
+            cursor (str): Cursor from a previous page's links, or None/'' for the first page
+            querydict: The request's GET parameters, used to build the page links
+
+        Returns:
+            KeysetPage: The requested page
+
+        Raises:
+            InvalidCursor: If the cursor is malformed, or its value doesn't fit the sort field
+        """
+        queryset = self.ordered_queryset()
+        forward = True
+
+        if cursor:
+            direction, value, pk = self._decode(cursor)
+            forward = direction == 'next'
+            queryset = queryset.filter(self._seek(value, pk, forward))
+
+        # In the backward direction, read the rows in reverse order and flip them
+        queryset = queryset.order_by(*self._ordering(reverse=not forward))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_previous, has_next = bool(cursor), has_more
+        else:
+            has_previous, has_next = has_more, True
+
+        previous_cursor = encode_cursor('prev', *self.position(rows[0])) if rows and has_previous else None
+        next_cursor = encode_cursor('next', *self.position(rows[-1])) if rows and has_next else None
+
+        return KeysetPage(rows, previous_cursor, next_cursor, querydict)
+
+
+def _querystring(querydict, **params):
+    """Return the querystring of querydict with its pagination parameters replaced by params"""
+    querydict = querydict.copy() if querydict is not None else QueryDict(mutable=True)
+    for name in ('page', 'cursor'):
+        querydict.pop(name, None)
+    for name, value in params.items():
+        querydict[name] = value
+    return querydict.urlencode()
+
+
+def _add_page_links(page, keyset, querydict):
+    """
+    Set the previous/next link querystrings of a numbered page.
+
+    With a keyset paginator the links continue with cursors from the page's
+    first and last rows, otherwise they use page numbers.
+    """
+    page.previous_querystring = page.next_querystring = ''
+    if page.has_previous():
+        if keyset is not None:
+            page.previous_querystring = _querystring(querydict, cursor=encode_cursor('prev', *keyset.position(page[0])))
+        else:
+            page.previous_querystring = _querystring(querydict, page=page.previous_page_number())
+    if page.has_next():
+        if keyset is not None:
+            page.next_querystring = _querystring(querydict, cursor=encode_cursor('next', *keyset.position(page[-1])))
+        else:
+            page.next_querystring = _querystring(querydict, page=page.next_page_number())
+
+
+def _get_field(model, field_path):
+    """Return the model field at the end of a (possibly related) field path"""
+    if field_path == 'pk':
+        return model._meta.pk
+    for name in field_path.split('__'):
+        field = model._meta.get_field(name)
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def _is_nullable(model, field_path):
+    """Check whether any field along a (possibly related) field path can be NULL"""
+    for name in field_path.split('__'):
+        field = model._meta.get_field(name)
+        if field.null:
+            return True
+        if field.is_relation:
+            model = field.related_model
+    return False
+
+
+def paginate_index(request, object_list, per_page, sort_field=None):
+    """
+    Paginate the listing of an index page.
+
+    Uses KeysetPaginator when the request has a `cursor` parameter (an empty
+    value requests the first page) and the listing is a queryset, otherwise
+    Django's Paginator with the `page` parameter.
+
+    Args:
+        request: The HTTP request
+        object_list: Queryset (or list) of the items to list
+        per_page (int): Number of items per page
+        sort_field (str): Field the listing is sorted on ('-' prefix for descending),
+                          or None to keep the queryset's ordering
+
+    Returns:
+        Page or KeysetPage: The requested page
+    """
+    keyset = None
+    if isinstance(object_list, QuerySet):
+        if 'cursor' in request.GET:
+            paginator = KeysetPaginator(object_list, per_page, sort_field or 'pk')
+            try:
+                return paginator.page(request.GET.get('cursor'), request.GET)
+            except InvalidCursor:
+                return paginator.page(None, request.GET)
+
+        if sort_field:
+            # Numbered pages use the same order as cursor pages, so their links can continue with cursors
+            keyset = KeysetPaginator(object_list, per_page, sort_field)
+            object_list = keyset.ordered_queryset()
+
+    paginator = Paginator(object_list, per_page)
+    try:
+        page = paginator.page(request.GET.get('page'))
+    except PageNotAnInteger:
+        page = paginator.page(1)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
+    _add_page_links(page, keyset, request.GET)
+    return page
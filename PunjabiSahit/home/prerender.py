@@ -0,0 +1,252 @@
+"""
+Static pre-rendering of detail pages for the front proxy.
+
+Dictionary entry, idiom, phrase, book and author detail pages only change
+when they are published, so they can be rendered ahead of time and served by
+nginx without reaching Django. Each page is rendered as an anonymous visitor
+in every language of settings.LANGUAGES, to
+
+    PRERENDER_ROOT/<language>/<page path>/index.html
+    PRERENDER_ROOT/<language>/<page path>/index.html.gz
+
+and PRERENDER_ROOT/.revisions/<page id> records the revision and path that
+were rendered, so unchanged pages are skipped and moved or unpublished pages
+can be removed. The prerender_pages command builds the whole tree across a
+process pool; home.signals re-renders a page when it is published and removes
+it when it is unpublished or deleted. Nothing happens unless PRERENDER_ROOT
+is set. Imports publish pages inside bulk_publishing(), which leaves them to
+a prerender_pages run afterwards.
+
+nginx picks the language from the django_language cookie, and passes
+requests with a session (logged-in users, messages) or a query string to
+Django, for example:
+
+    map $cookie_django_language $prerender_language { default en; hi hi; pa pa; }
+    map "$cookie_sessionid$args" $prerender_bypass { "" 0; default 1; }
+
+    location / {
+        error_page 418 = @django;
+        if ($prerender_bypass) { return 418; }
+        gzip_static on;
+        try_files /$prerender_language$uri/index.html @django;
+    }
+
+Requests nginx answers never reach Django, so views of pre-rendered pages
+are not counted: their view_count, trending scores and unique visitors only
+include the requests that were passed to Django.
+"""
+
+import gzip
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.wsgi import WSGIRequest
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+PRERENDER_ROOT = getattr(settings, 'PRERENDER_ROOT', None)
+
+# Page types that are pre-rendered
+PRERENDERED_MODELS = [
+    'home.DictionaryEntryPage',
+    'home.IdiomPage',
+    'home.PhrasePage',
+    'home.BookPage',
+    'home.AuthorDetailPage',
+]
+
+_bulk = threading.local()
+
+
+@contextmanager
+def bulk_publishing():
+    """
+    Publish many pages without pre-rendering each one, e.g. in an import.
+
+    Pages published in this thread meanwhile only have their pre-rendered
+    files removed, so Django serves them until the prerender_pages command
+    renders them with its process pool. Dictionary entries don't recompute
+    their related words either (see build_similar_entries). Also usable as a
+    decorator.
+    """
+    previous = getattr(_bulk, 'active', False)
+    _bulk.active = True
+    try:
+        yield
+    finally:
+        _bulk.active = previous
+
+
+def is_bulk_publishing():
+    """Return whether pages are being published inside bulk_publishing() in this thread"""
+    return getattr(_bulk, 'active', False)
+
+
+def prerendered_file(root, language, page_path):
+    """
+    Return the file a page is pre-rendered to.
+
+    Args:
+        root: The PRERENDER_ROOT directory
+        language (str): Language code
+        page_path (str): URL path of the page, e.g. '/dictionary/paani/'
+
+    Returns:
+        Path: The index.html file
+    """
+    # The proxy looks files up by the decoded path, page URLs are percent-encoded
+    return Path(root, language, unquote(page_path).strip('/'), 'index.html')
+
+
+def _revision_file(root, page_id):
+    return Path(root, '.revisions', str(page_id))
+
+
+def _read_revision(root, page_id):
+    """Return the (revision, path) a page was last rendered with, or (None, None)"""
+    try:
+        revision, page_path = _revision_file(root, page_id).read_text().splitlines()[:2]
+    except (FileNotFoundError, ValueError):
+        return None, None
+    return revision, page_path
+
+
+def _write_file(path, data):
+    """Write a file atomically, so nginx never serves a half-written page"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+def _remove_files(root, page_path):
+    for language, name in settings.LANGUAGES:
+        html = prerendered_file(root, language, page_path)
+        for path in (html, html.with_name('index.html.gz')):
+            path.unlink(missing_ok=True)
+
+
+def _render(page, page_path, language):
+    """Render a page as an anonymous visitor in a language, returning the HTML or None"""
+    meta = page._get_dummy_headers()
+    meta['PATH_INFO'] = page_path
+    request = WSGIRequest(meta)
+    request.user = AnonymousUser()
+    request.LANGUAGE_CODE = language
+
+    with translation.override(language):
+        response = page.serve(request)
+        if hasattr(response, 'render') and callable(response.render):
+            response = response.render()
+
+    # Pages that set cookies or embed a CSRF token are personal and can't be shared
+    if response.status_code != 200 or response.cookies or 'CSRF_COOKIE' in request.META:
+        return None
+    return response.content
+
+
+def render_page(page, root=PRERENDER_ROOT, force=False):
+    """
+    Pre-render a live page in every language, unless its live revision was already rendered.
+
+    Args:
+        page: The page
+        root: The PRERENDER_ROOT directory
+        force (bool): Render even if the revision was already rendered
+
+    Returns:
+        bool: True if the page was rendered
+    """
+    page = page.specific
+    revision = str(page.live_revision_id)
+    rendered_revision, rendered_path = _read_revision(root, page.pk)
+    if rendered_revision == revision and not force:
+        return False
+
+    url_parts = page.get_url_parts()
+    if not url_parts:
+        return False
+    page_path = url_parts[2]
+
+    rendered = {}
+    for language, name in settings.LANGUAGES:
+        html = _render(page, page_path, language)
+        if html is None:
+            logger.warning("Page %s can't be pre-rendered, it will be served by Django", page.pk)
+            remove_page(page.pk, root)
+            return False
+        rendered[language] = html
+
+    for language, html in rendered.items():
+        path = prerendered_file(root, language, page_path)
+        _write_file(path, html)
+        _write_file(path.with_name('index.html.gz'), gzip.compress(html, 9))
+
+    if rendered_path and rendered_path != page_path:
+        _remove_files(root, rendered_path)
+    _write_file(_revision_file(root, page.pk), f"{revision}\n{page_path}\n".encode())
+    return True
+
+
+def remove_page(page_id, root=PRERENDER_ROOT):
+    """
+    Remove a page's pre-rendered files, so the proxy passes its requests to Django.
+
+    Args:
+        page_id (int): Id of the page
+        root: The PRERENDER_ROOT directory
+    """
+    revision, page_path = _read_revision(root, page_id)
+    if page_path is not None:
+        _remove_files(root, page_path)
+    _revision_file(root, page_id).unlink(missing_ok=True)
+
+
+def prerendered_pages():
+    """Return a queryset of the live, public pages that are pre-rendered"""
+    from django.apps import apps
+    from wagtail.models import Page
+
+    models = [apps.get_model(label) for label in PRERENDERED_MODELS]
+    return Page.objects.live().public().type(*models)
+
+
+def init_worker():
+    """Set up Django in a process pool worker"""
+    import django
+
+    django.setup()
+
+
+def render_pages(page_ids, root, force=False):
+    """
+    Pre-render pages by id, in a process pool worker or in the current process.
+
+    Args:
+        page_ids (list): Ids of the pages
+        root: The PRERENDER_ROOT directory
+        force (bool): Render pages even if their revision was already rendered
+
+    Returns:
+        tuple: Numbers of pages (rendered, skipped, failed)
+    """
+    from wagtail.models import Page
+
+    rendered = skipped = failed = 0
+    for page in Page.objects.filter(pk__in=page_ids).specific():
+        try:
+            if render_page(page, root, force):
+                rendered += 1
+            else:
+                skipped += 1
+        except Exception:
+            logger.exception("Failed to pre-render page %s", page.pk)
+            failed += 1
+    return rendered, skipped, failed
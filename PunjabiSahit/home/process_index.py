@@ -0,0 +1,128 @@
+"""
+In-memory indexes that each process builds from the database.
+
+Some lookups (headword autocomplete, spelling suggestions) are answered from
+an index held in memory by every process. A ProcessIndex keeps those copies
+in step:
+
+- Changes (a page published, unpublished or deleted) are recorded with
+  changed() and handled once the transaction commits. All the changes of a
+  transaction, such as a bulk import, bump a generation counter in the cache
+  once, and are applied in place to this process's index.
+- Other processes notice the new generation on their next lookup. They keep
+  answering from the index they have while a background thread rebuilds it,
+  REBUILD_DELAY seconds later so that a burst of changes costs one rebuild.
+  Only the first lookup of a process waits for the index to be built.
+
+The generation counter lives in the default cache, which must be shared by
+all processes (see CACHES in the settings).
+"""
+
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Seconds between noticing a change and rebuilding, so a burst of changes costs one rebuild
+REBUILD_DELAY = 5
+
+# Above this many changes in one transaction, the local index is rebuilt instead of updated in place
+MAX_IN_PLACE_CHANGES = 100
+
+
+class ProcessIndex:
+    """
+    A per-process in-memory index, rebuilt in the background when another
+    process changes its data.
+
+    Args:
+        generation_key (str): Cache key of the generation counter
+        build: Function returning a new index built from the database
+        update: Function called with (index, items) to apply changed items in place
+        max_age (float): Also rebuild the index once it is this many seconds old, or None
+    """
+
+    def __init__(self, generation_key, build, update, max_age=None):
+        self.generation_key = generation_key
+        self._build = build
+        self._update = update
+        self.max_age = max_age
+        self._index = None
+        self._generation = None
+        self._built_at = 0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        # Changes made by this thread's current transaction
+        self._pending = threading.local()
+
+    def get(self):
+        """Return the index, building it on first use and starting a rebuild when it is out of date"""
+        generation = cache.get_or_set(self.generation_key, 0, None)
+        with self._lock:
+            if self._index is None:
+                self._index = self._build()
+                self._generation = generation
+                self._built_at = time.monotonic()
+            elif not self._rebuilding and (
+                generation != self._generation
+                or (self.max_age is not None and time.monotonic() - self._built_at > self.max_age)
+            ):
+                self._rebuilding = True
+                threading.Thread(target=self._rebuild, daemon=True).start()
+            return self._index
+
+    def _rebuild(self):
+        try:
+            time.sleep(REBUILD_DELAY)
+            # Changes made while building bump the generation again, so they are not missed
+            generation = cache.get_or_set(self.generation_key, 0, None)
+            index = self._build()
+            with self._lock:
+                self._index = index
+                self._generation = generation
+                self._built_at = time.monotonic()
+        except Exception:
+            logger.exception("Failed to rebuild the index of %s", self.generation_key)
+        finally:
+            with self._lock:
+                self._rebuilding = False
+            # Database connections are per thread, and this thread is done
+            connection.close()
+
+    def changed(self, item):
+        """
+        Record a change to an item of the index, handled when the current transaction commits.
+
+        Args:
+            item: Hashable identifier of the changed item, as passed to the update function
+        """
+        if not hasattr(self._pending, 'items'):
+            self._pending.items = set()
+        self._pending.items.add(item)
+        # Every change registers the callback, as a rolled back transaction discards it;
+        # the first one to run handles all the pending changes
+        transaction.on_commit(self._apply_pending)
+
+    def _apply_pending(self):
+        items = getattr(self._pending, 'items', None)
+        if not items:
+            return
+        self._pending.items = set()
+
+        try:
+            generation = cache.incr(self.generation_key)
+        except ValueError:
+            cache.set(self.generation_key, 1, None)
+            generation = 1
+
+        with self._lock:
+            if self._index is None or len(items) > MAX_IN_PLACE_CHANGES:
+                return
+            self._update(self._index, items)
+            # Only skip the rebuild if no other change happened in the meantime
+            if self._generation == generation - 1:
+                self._generation = generation
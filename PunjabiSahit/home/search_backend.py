@@ -0,0 +1,137 @@
+"""
+Gurmukhi-aware Wagtail search backend.
+
+Wraps Wagtail's database backend so that:
+
+- Queries are normalized with normalize_gurmukhi before they are parsed,
+  matching the text indexed by NormalizedSearchField (home.searching). Words
+  that differ only in zero-width characters, spacing or nukta forms then
+  find each other.
+- On PostgreSQL, fields declared with partial_match=True are matched as
+  substrings as well as full words. Their stored text is normalized in SQL
+  (home.searching.NormalizedText) and the LIKE is served by the pg_trgm GIN
+  indexes on that expression. Trigram word similarity adds to the rank, so
+  full-word matches still come first. This also applies to an Or of plain
+  text queries, as home.searching builds for the other-script variants of a
+  query (home.transliteration).
+
+Enable it with:
+
+    WAGTAILSEARCH_BACKENDS = {"default": {"BACKEND": "home.search_backend"}}
+"""
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Q
+
+from wagtail.search.backends import database
+from wagtail.search.backends.database.postgres.postgres import (
+    PostgresAutocompleteQueryCompiler,
+    PostgresSearchBackend,
+    PostgresSearchQueryCompiler,
+    PostgresSearchResults,
+)
+from wagtail.search.index import SearchField
+from wagtail.search.query import Or, PlainText
+
+from .searching import NormalizedText
+from .utils import normalize_gurmukhi
+
+
+class NormalizedQueryMixin:
+    """Normalizes query strings before the backend parses them"""
+
+    def _search(self, query_compiler_class, query, model_or_queryset, **kwargs):
+        if isinstance(query, str):
+            query = normalize_gurmukhi(query)
+        return super()._search(query_compiler_class, query, model_or_queryset, **kwargs)
+
+
+class GurmukhiSearchQueryCompiler(PostgresSearchQueryCompiler):
+    """Also matches plain text queries as substrings of the partial_match fields"""
+
+    def get_partial_match_fields(self):
+        """Return the (column, boost) of each partial_match field stored on the searched model"""
+        model = self.queryset.model
+        fields = []
+        for field in model.get_searchable_search_fields():
+            if not isinstance(field, SearchField) or not field.kwargs.get('partial_match'):
+                continue
+            if self.fields is not None and field.field_name not in self.fields:
+                continue
+            try:
+                model._meta.get_field(field.field_name)
+            except FieldDoesNotExist:
+                continue
+            fields.append((field.field_name, field.boost or 1.0))
+        return fields
+
+    def get_query_strings(self):
+        """Return the strings of a PlainText query or an Or of them, or None for other queries"""
+        if isinstance(self.query, PlainText):
+            queries = [self.query]
+        elif isinstance(self.query, Or) and all(isinstance(query, PlainText) for query in self.query.subqueries):
+            queries = self.query.subqueries
+        else:
+            return None
+        return [query.query_string for query in queries if query.query_string] or None
+
+    def search(self, config, start, stop, score_field=None):
+        partial_match_fields = self.get_partial_match_fields()
+        texts = self.get_query_strings() if partial_match_fields else None
+        if not texts:
+            return super().search(config, start, stop, score_field)
+
+        search_query = self.build_tsquery(self.query, config=config)
+        vectors = self.get_search_vectors(search_query)
+        rank_expression = self._build_rank_expression(vectors, config)
+
+        combined_vector = vectors[0][0]
+        for vector, boost in vectors[1:]:
+            combined_vector = combined_vector._combine(vector, "||", False)
+
+        # Stored text isn't normalized, so it is matched in its SQL normalized
+        # form, which is what the trigram indexes are built on
+        texts = [normalize_gurmukhi(text).lower() for text in texts]
+        normalized_fields = {
+            f'_normalized_{field_name}': NormalizedText(field_name) for field_name, boost in partial_match_fields
+        }
+        partial_match = Q()
+        for field_name, boost in partial_match_fields:
+            for text in texts:
+                partial_match |= Q(**{f'_normalized_{field_name}__contains': text})
+                rank_expression += TrigramWordSimilarity(text, NormalizedText(field_name)) * boost
+
+        queryset = self.queryset.annotate(_vector_=combined_vector).alias(**normalized_fields).filter(
+            Q(_vector_=search_query) | partial_match
+        )
+
+        if self.order_by_relevance:
+            queryset = queryset.order_by(rank_expression.desc(), '-pk')
+        elif not queryset.query.order_by:
+            queryset = queryset.order_by('-pk')
+
+        if score_field is not None:
+            queryset = queryset.annotate(**{score_field: rank_expression})
+
+        return queryset[start:stop]
+
+
+class GurmukhiPostgresSearchBackend(NormalizedQueryMixin, PostgresSearchBackend):
+    query_compiler_class = GurmukhiSearchQueryCompiler
+    autocomplete_query_compiler_class = PostgresAutocompleteQueryCompiler
+    results_class = PostgresSearchResults
+
+
+def SearchBackend(params):
+    """
+    Returns the Gurmukhi-aware backend for the 'default' database, like
+    wagtail.search.backends.database does for the stock backends.
+    """
+    if connection.vendor == 'postgresql':
+        return GurmukhiPostgresSearchBackend(params)
+
+    # Other databases (e.g. SQLite in development) only get query normalization
+    backend_class = type(database.SearchBackend(params))
+    return type(f'Gurmukhi{backend_class.__name__}', (NormalizedQueryMixin, backend_class), {})(params)
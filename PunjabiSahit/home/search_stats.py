@@ -0,0 +1,146 @@
+"""
+Search query statistics.
+
+Each search is counted in a per-worker HitBuffer (home.buffering) and written
+to SearchQueryStat in batches, one upsert per flush, so searching never waits
+on a write. The popular searches and the searches that found nothing are
+computed from those counts and cached; the search page renders them from the
+cache, and the search_report command recomputes them.
+
+Visitors see the popular searches, so only searches made by people (see
+home.visitors.is_countable_visit) are counted, and a query has to be searched
+POPULAR_SEARCH_MIN_HITS times before it can be listed.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+
+from .buffering import HitBuffer
+from .models import SearchQueryStat
+from .utils import normalize_gurmukhi
+
+# Number of days of statistics the report covers
+SEARCH_REPORT_DAYS = 30
+
+# Number of popular and zero-result searches in the report
+POPULAR_SEARCHES_COUNT = 10
+ZERO_RESULT_SEARCHES_COUNT = 50
+
+# Number of searches a query needs over the report period to be listed as popular
+POPULAR_SEARCH_MIN_HITS = getattr(settings, 'POPULAR_SEARCH_MIN_HITS', 5)
+
+SEARCH_REPORT_CACHE_KEY = 'search_stats:report'
+SEARCH_REPORT_CACHE_TIMEOUT = 60 * 60
+
+
+def normalize_search_query(query):
+    """
+    Normalize a query for counting, so spelling and case variants are counted together.
+
+    Args:
+        query (str): The query as typed
+
+    Returns:
+        str: The normalized query, truncated to fit SearchQueryStat.query
+    """
+    return normalize_gurmukhi(query).casefold()[:255]
+
+
+def save_search_hits(counts):
+    """
+    Add buffered hits to SearchQueryStat in a single upsert.
+
+    Args:
+        counts (dict): {(normalized query, date, found): hits}
+    """
+    rows = defaultdict(lambda: [0, 0])
+    for (query, date, found), hits in counts.items():
+        row = rows[query, date]
+        row[0] += hits
+        if not found:
+            row[1] += hits
+
+    params = []
+    for (query, date), (hits, zero_result_hits) in rows.items():
+        params.extend([query, date, hits, zero_result_hits])
+
+    table = SearchQueryStat._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (query, date, hits, zero_result_hits) VALUES "
+            + ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+            + f" ON CONFLICT (query, date) DO UPDATE SET hits = {table}.hits + EXCLUDED.hits,"
+            f" zero_result_hits = {table}.zero_result_hits + EXCLUDED.zero_result_hits",
+            params,
+        )
+
+
+search_hits = HitBuffer(save_search_hits)
+
+
+def log_search(query, found):
+    """
+    Count a search.
+
+    Args:
+        query (str): The query as typed
+        found (bool): Whether the search found anything
+    """
+    normalized = normalize_search_query(query)
+    if normalized:
+        search_hits.add((normalized, timezone.localdate(), bool(found)))
+
+
+def build_search_report(days=SEARCH_REPORT_DAYS):
+    """
+    Compute the popular searches and the searches that found nothing.
+
+    Args:
+        days (int): Number of days of statistics to use
+
+    Returns:
+        dict: 'popular': the most searched queries that always found something
+              (searched at least POPULAR_SEARCH_MIN_HITS times), and
+              'zero_results': (query, hits) pairs of queries that found nothing,
+              most searched first
+    """
+    stats = (
+        SearchQueryStat.objects
+        .filter(date__gte=timezone.localdate() - timedelta(days=days))
+        .values('query')
+        .annotate(total=Sum('hits'), zero_results=Sum('zero_result_hits'))
+    )
+    # The popular searches are shown to visitors, so queries that ever found nothing,
+    # or that only a handful of searches made, are left out
+    popular = (
+        stats.filter(zero_results=0, total__gte=POPULAR_SEARCH_MIN_HITS)
+        .order_by('-total', 'query')[:POPULAR_SEARCHES_COUNT]
+    )
+    zero_results = stats.filter(zero_results__gt=0).order_by('-zero_results', 'query')[:ZERO_RESULT_SEARCHES_COUNT]
+    return {
+        'popular': [row['query'] for row in popular],
+        'zero_results': [(row['query'], row['zero_results']) for row in zero_results],
+    }
+
+
+def get_search_report(refresh=False):
+    """
+    Return the search report (see build_search_report), from the cache when possible.
+
+    Args:
+        refresh (bool): Recompute the report even if it is cached
+
+    Returns:
+        dict: The report
+    """
+    report = None if refresh else cache.get(SEARCH_REPORT_CACHE_KEY)
+    if report is None:
+        report = build_search_report()
+        cache.set(SEARCH_REPORT_CACHE_KEY, report, SEARCH_REPORT_CACHE_TIMEOUT)
+    return report
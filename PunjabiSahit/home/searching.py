@@ -0,0 +1,331 @@
+"""
+Helpers for combining full-text search with ordinary queryset filtering.
+
+Search results are cached as ranked lists of (id, score) pairs, keyed on
+the normalized query and the queryset searched (its model and filters). Each
+model has a generation counter in the cache that is part of the key; it is
+bumped whenever a page of that model is published, unpublished or deleted,
+or an author is saved or deleted (see home.signals), so stale results are
+never served. Results and counters live in the default cache, which must be
+shared by all processes (see CACHES in the settings, and check home.W001):
+with a per-process cache, only the process that handled a publish would see
+its counter bumped.
+
+Queries are searched together with their variants in the other scripts
+(home.transliteration), so a Roman or Shahmukhi query finds Gurmukhi text.
+"""
+
+import hashlib
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Func, Prefetch, TextField, Value
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from wagtail.models import Page
+from wagtail.search import index
+from wagtail.search.backends import get_search_backend
+from wagtail.search.query import Or, PlainText
+
+from .transliteration import expand_query
+from .utils import GURMUKHI_PRECOMPOSED_LETTERS, ZERO_WIDTH_CHARACTERS, normalize_gurmukhi
+
+# Maximum number of search matches an index page will list
+SEARCH_RESULTS_LIMIT = 1000
+
+# Cached results are also dropped after this long (seconds)
+SEARCH_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Page fields used to render any search result
+SEARCH_RESULT_PAGE_FIELDS = ['id', 'title', 'url_path', 'search_description', 'content_type']
+
+# Length of a search result's snippet, in words
+SEARCH_SNIPPET_WORDS = 30
+
+
+def _generation_key(model):
+    return f"search_results:generation:{model._meta.label_lower}"
+
+
+def get_search_generation(model):
+    """Return the current generation of cached search results for a model"""
+    return cache.get_or_set(_generation_key(model), 0, None)
+
+
+def bump_search_generation(model):
+    """
+    Invalidate cached search results that a change to an object of this model
+    could affect: searches of the model itself and of its concrete parents
+    (e.g. the global search over Page).
+
+    Args:
+        model: The class of the page or author that changed
+    """
+    for affected in [model] + model._meta.get_parent_list():
+        key = _generation_key(affected)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def search_cache_key(queryset, query, limit):
+    """
+    Build the cache key of a search.
+
+    Args:
+        queryset: Page or Author queryset searched within
+        query (str): The search query
+        limit (int): Maximum number of matches kept
+
+    Returns:
+        str: The cache key
+    """
+    model = queryset.model
+    normalized = normalize_gurmukhi(query).casefold()
+    digest = hashlib.sha1(f"{queryset.query}\0{normalized}\0{limit}".encode('utf-8')).hexdigest()
+    return f"search_scores:{model._meta.label_lower}:{get_search_generation(model)}:{digest}"
+
+
+def build_search_query(query):
+    """
+    Build the query to search for: the query itself, or if it can be written
+    in other scripts, any of its variants (see expand_query).
+
+    Args:
+        query (str): The search query
+
+    Returns:
+        str or Or: The query for the search backend
+    """
+    variants = expand_query(query)
+    if len(variants) < 2:
+        return query
+    return Or([PlainText(variant) for variant in variants])
+
+
+def search_scores(queryset, query, limit=SEARCH_RESULTS_LIMIT):
+    """
+    Return the objects in a queryset that match a search query, best matches
+    first, with their relevance scores. Results are served from the cache
+    when the same search ran since the model last changed.
+
+    Scores are only comparable within one search: they depend on how many
+    fields the model indexes and on their boosts (see federated_search).
+
+    Args:
+        queryset: Page or Author queryset to search within
+        query (str): The search query
+        limit (int): Maximum number of matches to return
+
+    Returns:
+        list: (id, score) pairs
+    """
+    key = search_cache_key(queryset, query, limit)
+    scores = cache.get(key)
+    if scores is None:
+        results = get_search_backend().search(
+            build_search_query(query), queryset.only('pk')
+        ).annotate_score('_score')
+        scores = [(obj.pk, obj._score or 0.0) for obj in results[:limit]]
+        cache.set(key, scores, SEARCH_CACHE_TIMEOUT)
+    return scores
+
+
+def search_page_ids(queryset, query, limit=SEARCH_RESULTS_LIMIT):
+    """
+    Return the ids of the objects in a queryset that match a search query,
+    best matches first (see search_scores).
+
+    Args:
+        queryset: Page or Author queryset to search within
+        query (str): The search query
+        limit (int): Maximum number of matches to return
+
+    Returns:
+        list: Ids
+    """
+    return [pk for pk, score in search_scores(queryset, query, limit)]
+
+
+def federated_search(query, limit=SEARCH_RESULTS_LIMIT):
+    """
+    Search live pages and authors together, in one ranking.
+
+    Both searches are cached (see search_scores). Their raw scores are not
+    comparable, as authors index a few short names while pages index long
+    boosted texts, so each source's scores are scaled to its best match
+    before merging: the best page and the best author both score 1. On equal
+    scaled scores pages keep their order and come before authors.
+
+    Args:
+        query (str): The search query
+        limit (int): Maximum number of matches to return
+
+    Returns:
+        list: ('page' or 'author', id) pairs, best matches first
+    """
+    from .models import Author
+
+    results = [(score, 'page', pk) for pk, score in _scaled_scores(search_scores(Page.objects.live(), query, limit))]
+    results += [(score, 'author', pk) for pk, score in _scaled_scores(search_scores(Author.objects.all(), query, limit))]
+    results.sort(key=lambda result: result[0], reverse=True)
+    return [(kind, pk) for score, kind, pk in results[:limit]]
+
+
+def _scaled_scores(scores):
+    """Scale (id, score) pairs so the best score is 1"""
+    best = max((score for pk, score in scores), default=0)
+    if best <= 0:
+        return [(pk, 0.0) for pk, score in scores]
+    return [(pk, score / best) for pk, score in scores]
+
+
+def filter_by_search(queryset, query, limit=SEARCH_RESULTS_LIMIT):
+    """
+    Restrict a queryset to the pages that match a full-text search query.
+
+    Search results cannot be filtered, ordered or paginated like a queryset,
+    so the search runs first and its matches are applied as a pk filter. The
+    index pages can then keep applying their own filters and sort order.
+
+    Args:
+        queryset: Page queryset to search within
+        query (str): The search query
+        limit (int): Maximum number of matches to keep (best matches first)
+
+    Returns:
+        QuerySet: The queryset filtered to the matching pages
+    """
+    return queryset.filter(pk__in=search_page_ids(queryset, query, limit))
+
+
+def load_search_results(page_ids):
+    """
+    Load search results as their specific pages, with only the fields their
+    result cards use (see BaseContentPage.search_card_fields).
+
+    Pages are fetched with one query per content type, after one query for the
+    content types, instead of one `.specific` query per result. Each page gets
+    a `search_snippet`: the start of its `search_snippet_field` as plain text,
+    or its search description.
+
+    Args:
+        page_ids (list): Ids of the pages to load, best matches first
+
+    Returns:
+        list: The pages, in the order of page_ids
+    """
+    ids_by_content_type = defaultdict(list)
+    for pk, content_type_id in Page.objects.filter(pk__in=page_ids).values_list('pk', 'content_type_id'):
+        ids_by_content_type[content_type_id].append(pk)
+
+    pages = {}
+    for content_type_id, ids in ids_by_content_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        snippet_field = getattr(model, 'search_snippet_field', None)
+        fields = SEARCH_RESULT_PAGE_FIELDS + list(getattr(model, 'search_card_fields', []))
+        if snippet_field:
+            fields.append(snippet_field)
+
+        for page in model.objects.filter(pk__in=ids).only(*fields):
+            snippet = strip_tags(getattr(page, snippet_field) or '') if snippet_field else ''
+            page.search_snippet = Truncator(snippet.strip() or page.search_description).words(SEARCH_SNIPPET_WORDS)
+            pages[page.pk] = page
+
+    return [pages[pk] for pk in page_ids if pk in pages]
+
+
+def load_author_results(author_ids):
+    """
+    Load authors found by a search, with the fields their result cards use.
+
+    Each author gets a `search_kind` of 'author', a `search_snippet` from their
+    biography and a `search_page`: their live detail page, or None.
+
+    Args:
+        author_ids (list): Ids of the authors to load, best matches first
+
+    Returns:
+        list: The authors, in the order of author_ids
+    """
+    from .models import Author, AuthorDetailPage
+
+    detail_pages = AuthorDetailPage.objects.live().only('id', 'title', 'url_path', 'author')
+    authors = (
+        Author.objects.filter(pk__in=author_ids)
+        .only('id', 'name', 'name_english', 'name_gurmukhi', 'bio', 'biography_english', 'biography_gurmukhi')
+        .prefetch_related(Prefetch('detail_pages', queryset=detail_pages))
+        .in_bulk()
+    )
+
+    results = []
+    for pk in author_ids:
+        author = authors.get(pk)
+        if author is None:
+            continue
+        biography = strip_tags(author.biography_english or author.bio or author.biography_gurmukhi)
+        author.search_kind = 'author'
+        author.search_snippet = Truncator(biography.strip()).words(SEARCH_SNIPPET_WORDS)
+        author.search_page = next(iter(author.detail_pages.all()), None)
+        results.append(author)
+    return results
+
+
+def load_federated_results(results):
+    """
+    Load the pages and authors of a federated search (see federated_search).
+
+    Args:
+        results (list): ('page' or 'author', id) pairs, best matches first
+
+    Returns:
+        list: The pages and authors, in the order of results
+    """
+    pages = {page.pk: page for page in load_search_results([pk for kind, pk in results if kind == 'page'])}
+    authors = {author.pk: author for author in load_author_results([pk for kind, pk in results if kind == 'author'])}
+
+    loaded = []
+    for kind, pk in results:
+        obj = (authors if kind == 'author' else pages).get(pk)
+        if obj is not None:
+            loaded.append(obj)
+    return loaded
+
+
+class NormalizedSearchField(index.SearchField):
+    """
+    A SearchField whose text is indexed in normalized form (see normalize_gurmukhi),
+    so spellings that differ only in zero-width characters, spacing or nukta
+    forms index to the same words. Queries are normalized the same way by
+    home.search_backend.
+    """
+
+    def get_value(self, obj):
+        value = super().get_value(obj)
+        if isinstance(value, str):
+            return normalize_gurmukhi(value)
+        return value
+
+
+class NormalizedText(Func):
+    """
+    The SQL equivalent of normalize_gurmukhi(text).lower(): zero-width
+    characters removed, precomposed nukta letters decomposed, runs of
+    whitespace collapsed and letters lowercased. Only immutable functions are
+    used, so the pg_trgm indexes of home.models can be built on it, and
+    home.search_backend matches substrings against it.
+    """
+    function = 'LOWER'
+    output_field = TextField()
+
+    def __init__(self, expression, **extra):
+        text = Func(expression, Value(ZERO_WIDTH_CHARACTERS), Value(''), function='translate')
+        for precomposed, decomposed in GURMUKHI_PRECOMPOSED_LETTERS.items():
+            text = Func(text, Value(precomposed), Value(decomposed), function='replace')
+        text = Func(text, Value(r'\s+'), Value(' '), Value('g'), function='regexp_replace')
+        super().__init__(text, **extra)
@@ -0,0 +1,324 @@
+"""
+Signal handlers that keep cached and precomputed data in step with published content.
+
+Cached data is cleared once the transaction commits (transaction.on_commit).
+Clearing it earlier would let a request made before the commit cache the old
+content again, for as long as the cache entry lives.
+
+Deleting a section deletes every page under it, each with its own post_delete
+signal. Handlers that would otherwise query or write per page queue the pages
+with on_commit_batch() and handle them together.
+"""
+
+import threading
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished
+
+from home.autocomplete import refresh_autocomplete_entry
+from home.page_cache import purge_all, purge_pages
+from home.models import (
+    Author,
+    AuthorDetailPage,
+    BookPage,
+    DictionaryEntryPage,
+    DictionaryIndexPage,
+    HomePage,
+    IdiomPage,
+    PhrasePage,
+    RemovedPage,
+    SimilarEntry,
+)
+from home.prerender import PRERENDER_ROOT, PRERENDERED_MODELS, is_bulk_publishing, remove_page, render_page
+from home.searching import bump_search_generation
+from home.similarity import refresh_similar_entries
+from home.spelling import refresh_spelling_source
+
+_batches = threading.local()
+
+
+class _CommitBatch:
+    """An on_commit callback that calls func once with every item queued for it"""
+
+    def __init__(self, func, callbacks):
+        self.func = func
+        self.items = []
+        # The connection's list of on_commit callbacks when this batch was added.
+        # Django replaces the list when the transaction commits or rolls back,
+        # so the batch is still pending only while the list is the same.
+        self.callbacks = callbacks
+
+    def __call__(self):
+        # Outside a transaction the batch runs at once, and takes no more items
+        self.callbacks = None
+        self.func(self.items)
+
+
+def on_commit_batch(func, item):
+    """
+    Queue an item, and call func with the list of the items queued in the
+    transaction once it commits, instead of once per item.
+
+    Args:
+        func: Function taking a list of items
+        item: The item to add
+    """
+    connection = transaction.get_connection()
+    pending = _batches.__dict__.setdefault('pending', {})
+    batch = pending.get(func)
+    if batch is None or batch.callbacks is not connection.run_on_commit:
+        batch = pending[func] = _CommitBatch(func, connection.run_on_commit)
+        batch.items.append(item)
+        transaction.on_commit(batch)
+    else:
+        batch.items.append(item)
+
+
+@receiver(page_published, sender=DictionaryEntryPage)
+@receiver(page_unpublished, sender=DictionaryEntryPage)
+@receiver(post_delete, sender=DictionaryEntryPage)
+def clear_dictionary_letter_counts(sender, instance, **kwargs):
+    """
+    Clear the cached per-letter counts of the dictionary an entry belongs to.
+
+    Args:
+        sender: The DictionaryEntryPage class
+        instance: The entry that was published, unpublished or deleted
+    """
+    # Look the parent up by path, as it may already be gone when a whole
+    # dictionary is deleted
+    parent_path = instance.path[:-instance.steplen]
+    for index_page in DictionaryIndexPage.objects.filter(path=parent_path):
+        transaction.on_commit(index_page.clear_letter_counts)
+
+
+@receiver(page_published, sender=DictionaryEntryPage)
+@receiver(page_unpublished, sender=DictionaryEntryPage)
+@receiver(post_delete, sender=DictionaryEntryPage)
+def update_dictionary_autocomplete(sender, instance, **kwargs):
+    """
+    Add, update or remove an entry in the headword autocomplete index.
+
+    Args:
+        sender: The DictionaryEntryPage class
+        instance: The entry that was published, unpublished or deleted
+    """
+    refresh_autocomplete_entry(instance)
+
+
+@receiver(page_published, sender=DictionaryEntryPage)
+@receiver(page_unpublished, sender=DictionaryEntryPage)
+@receiver(post_delete, sender=DictionaryEntryPage)
+@receiver(page_published, sender=IdiomPage)
+@receiver(page_unpublished, sender=IdiomPage)
+@receiver(post_delete, sender=IdiomPage)
+@receiver(page_published, sender=PhrasePage)
+@receiver(page_unpublished, sender=PhrasePage)
+@receiver(post_delete, sender=PhrasePage)
+def update_spelling_suggestions(sender, instance, **kwargs):
+    """
+    Add, update or remove the words of a page in the spelling suggestion index.
+
+    Args:
+        sender: The DictionaryEntryPage, IdiomPage or PhrasePage class
+        instance: The page that was published, unpublished or deleted
+    """
+    refresh_spelling_source(instance)
+
+
+@receiver(page_unpublished, sender=DictionaryEntryPage)
+@receiver(post_delete, sender=DictionaryEntryPage)
+@receiver(page_unpublished, sender=IdiomPage)
+@receiver(post_delete, sender=IdiomPage)
+@receiver(page_unpublished, sender=PhrasePage)
+@receiver(post_delete, sender=PhrasePage)
+def record_removed_page(sender, instance, **kwargs):
+    """
+    Record an unpublished or deleted page, for incremental exports.
+
+    Args:
+        sender: The DictionaryEntryPage, IdiomPage or PhrasePage class
+        instance: The page that was unpublished or deleted
+    """
+    on_commit_batch(_record_removed_pages, RemovedPage(
+        page_id=instance.pk, content_type=ContentType.objects.get_for_model(sender), removed_at=timezone.now(),
+    ))
+
+
+def _record_removed_pages(removed_pages):
+    # A page can be unpublished and then deleted in the same transaction
+    latest = {removed_page.page_id: removed_page for removed_page in removed_pages}
+    RemovedPage.objects.bulk_create(
+        latest.values(), update_conflicts=True, unique_fields=['page_id'], update_fields=['content_type', 'removed_at'],
+    )
+
+
+@receiver(page_published, sender=DictionaryEntryPage)
+def update_similar_entries(sender, instance, **kwargs):
+    """
+    Recompute the related words of a published entry. Inside
+    bulk_publishing() this is left to build_similar_entries, which rebuilds
+    them all at once.
+
+    Args:
+        sender: The DictionaryEntryPage class
+        instance: The entry that was published
+    """
+    if not is_bulk_publishing():
+        refresh_similar_entries(instance)
+
+
+@receiver(page_unpublished, sender=DictionaryEntryPage)
+def clear_similar_entries(sender, instance, **kwargs):
+    """
+    Stop listing an unpublished entry as a related word, and drop its own list.
+
+    Args:
+        sender: The DictionaryEntryPage class
+        instance: The entry that was unpublished
+    """
+    SimilarEntry.objects.filter(Q(entry=instance) | Q(similar=instance)).delete()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete)
+@receiver(post_save, sender=Author)
+def invalidate_search_results(sender, instance, **kwargs):
+    """
+    Invalidate the cached search results that a page or author change could affect.
+
+    Args:
+        sender: The class of the page or author (or, for post_delete, of any deleted object)
+        instance: The page that was published, unpublished or deleted, or the author that was saved or deleted
+    """
+    if isinstance(instance, (Page, Author)):
+        model = type(instance)
+        transaction.on_commit(lambda: bump_search_generation(model))
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def clear_homepage_blocks(sender, instance, signal, **kwargs):
+    """
+    Clear the cached homepage blocks that a page change could affect.
+
+    Args:
+        sender: The class of the page
+        instance: The page that was published, unpublished or deleted
+        signal: The signal that was sent
+    """
+    on_commit_batch(_clear_changed_homepage_blocks, (instance, signal is post_delete))
+
+
+def _clear_changed_homepage_blocks(changes):
+    labels = {page.specific_class._meta.label for page, deleted in changes if page.specific_class}
+    if HomePage._meta.label in labels:
+        names = set(HomePage.cached_blocks)
+    else:
+        names = {name for name, block_labels in HomePage.cached_blocks.items() if labels & set(block_labels)}
+
+    if 'featured' not in names:
+        # Deleting a featured page has already set featured_item to NULL
+        if any(deleted for page, deleted in changes) or HomePage.objects.filter(
+            featured_item_id__in=[page.pk for page, deleted in changes]
+        ).exists():
+            names.add('featured')
+
+    if names:
+        HomePage.clear_cached_blocks(names)
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def purge_cached_pages(sender, instance, **kwargs):
+    """
+    Purge the cached responses of a changed page, its parent index page and the homepage.
+
+    Args:
+        sender: The class of the page
+        instance: The page that was published, unpublished or deleted
+    """
+    on_commit_batch(_purge_changed_pages, instance)
+
+
+def _purge_changed_pages(pages):
+    # Look the parents up by path, as they may already be gone when a whole section is deleted
+    parent_paths = {page.path[:-page.steplen] for page in pages}
+    purge_pages([*pages, *Page.objects.filter(path__in=parent_paths), *HomePage.objects.all()])
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def purge_all_cached_pages(sender, instance, **kwargs):
+    """
+    Purge every cached response when an author changes, as authors appear on many pages.
+
+    Args:
+        sender: The Author class
+        instance: The author that was saved or deleted
+    """
+    transaction.on_commit(purge_all)
+
+
+@receiver(page_published)
+def prerender_published_page(sender, instance, **kwargs):
+    """
+    Pre-render a published detail page for the front proxy, once the
+    transaction commits. Inside bulk_publishing() its stale files are only
+    removed, and prerender_pages renders it later.
+
+    Args:
+        sender: The class of the page
+        instance: The page that was published
+    """
+    if not PRERENDER_ROOT or instance._meta.label not in PRERENDERED_MODELS:
+        return
+    if is_bulk_publishing():
+        transaction.on_commit(lambda: remove_page(instance.pk), robust=True)
+    else:
+        transaction.on_commit(lambda: render_page(instance, force=True), robust=True)
+
+
+@receiver(page_unpublished)
+@receiver(post_delete)
+def remove_prerendered_page(sender, instance, **kwargs):
+    """
+    Remove the pre-rendered files of an unpublished or deleted detail page.
+
+    Args:
+        sender: The class of the page (or, for post_delete, of any deleted object)
+        instance: The page that was unpublished or deleted
+    """
+    if PRERENDER_ROOT and isinstance(instance, Page) and instance._meta.label in PRERENDERED_MODELS:
+        page_id = instance.pk
+        transaction.on_commit(lambda: remove_page(page_id), robust=True)
+
+
+@receiver(post_save, sender=Author)
+def prerender_author_pages(sender, instance, **kwargs):
+    """
+    Re-render the pre-rendered author and book pages of an author that was
+    saved, once the transaction commits (see prerender_published_page).
+
+    Args:
+        sender: The Author class
+        instance: The author that was saved
+    """
+    if not PRERENDER_ROOT:
+        return
+    for model in (AuthorDetailPage, BookPage):
+        for page in model.objects.live().public().filter(author=instance):
+            if is_bulk_publishing():
+                transaction.on_commit(lambda page_id=page.pk: remove_page(page_id), robust=True)
+            else:
+                transaction.on_commit(lambda page=page: render_page(page, force=True), robust=True)
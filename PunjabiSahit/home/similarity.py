@@ -0,0 +1,204 @@
+"""
+Precomputed "related words" for dictionary entries.
+
+Two entries are similar when they share tags, a lemma, a part of speech, an
+origin or the language they were loaned from. Each feature adds a fixed weight
+to the pair's score, and every entry keeps its SIMILAR_ENTRIES_PER_ENTRY best
+neighbours in the SimilarEntry table.
+
+The full table is built by the build_similar_entries management command. When
+an entry is published only its own neighbours (and its place in theirs) are
+recomputed, from a handful of small queries; lists of other entries it drops
+out of are corrected by the next full build.
+"""
+
+import heapq
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+# Number of neighbours stored for each entry
+SIMILAR_ENTRIES_PER_ENTRY = 12
+
+# Score added for each shared feature
+TAG_WEIGHT = 3
+LEMMA_WEIGHT = 4
+LOANED_FROM_WEIGHT = 2
+ORIGIN_WEIGHT = 1
+PART_OF_SPEECH_WEIGHT = 1
+
+# Only the most viewed entries of a very common tag or lemma are considered
+MAX_GROUP_SIZE = 500
+
+ENTRY_FIELDS = ['id', 'view_count', 'lemma_gurmukhi', 'parts_of_speech', 'origin', 'loaned_from']
+
+
+class SimilarityData:
+    """
+    Features of a set of entries, grouped so that the candidates for an entry
+    can be found without comparing it to every other entry.
+
+    Args:
+        rows: Iterable of dicts with the ENTRY_FIELDS of each entry
+        tag_pairs: Iterable of (entry id, tag id) pairs
+    """
+
+    def __init__(self, rows, tag_pairs):
+        self.entries = {row['id']: row for row in rows}
+        self.tags = defaultdict(set)
+        self.groups = defaultdict(list)
+
+        for entry_id, tag_id in tag_pairs:
+            if entry_id in self.entries:
+                self.tags[entry_id].add(tag_id)
+                self.groups[('tag', tag_id)].append(entry_id)
+
+        for row in self.entries.values():
+            for key in self._group_keys(row):
+                self.groups[key].append(row['id'])
+
+        # Keep the most viewed members of each group first
+        view_count = lambda entry_id: -self.entries[entry_id]['view_count']
+        for key, members in self.groups.items():
+            members.sort(key=view_count)
+            del members[MAX_GROUP_SIZE:]
+
+    @staticmethod
+    def _group_keys(row):
+        keys = []
+        if row['lemma_gurmukhi']:
+            keys.append(('lemma', row['lemma_gurmukhi']))
+        if row['loaned_from']:
+            keys.append(('loaned_from', row['loaned_from']))
+        if row['parts_of_speech']:
+            keys.append(('pos', row['parts_of_speech']))
+            keys.append(('pos_origin', row['parts_of_speech'], row['origin']))
+        return keys
+
+    def score(self, entry_id, other_id):
+        """Similarity score of two entries (0 if they have nothing in common)"""
+        row, other = self.entries[entry_id], self.entries[other_id]
+        score = TAG_WEIGHT * len(self.tags[entry_id] & self.tags[other_id])
+        if row['lemma_gurmukhi'] and row['lemma_gurmukhi'] == other['lemma_gurmukhi']:
+            score += LEMMA_WEIGHT
+        if row['loaned_from'] and row['loaned_from'] == other['loaned_from']:
+            score += LOANED_FROM_WEIGHT
+        if row['origin'] and row['origin'] == other['origin']:
+            score += ORIGIN_WEIGHT
+        if row['parts_of_speech'] and row['parts_of_speech'] == other['parts_of_speech']:
+            score += PART_OF_SPEECH_WEIGHT
+        return score
+
+    def neighbours(self, entry_id, limit=SIMILAR_ENTRIES_PER_ENTRY):
+        """
+        Find the most similar entries to an entry.
+
+        Args:
+            entry_id (int): The entry
+            limit (int): Maximum number of neighbours
+
+        Returns:
+            list: (similar entry id, score) pairs, most similar first
+        """
+        row = self.entries[entry_id]
+        candidates = set()
+        for tag_id in self.tags[entry_id]:
+            candidates.update(self.groups[('tag', tag_id)])
+        for key in self._group_keys(row):
+            members = self.groups[key]
+            # Part-of-speech groups are large, so only their most viewed entries can fill the list
+            candidates.update(members[:limit + 1] if key[0] in ('pos', 'pos_origin') else members)
+        candidates.discard(entry_id)
+
+        scored = (
+            (self.score(entry_id, other_id), self.entries[other_id]['view_count'], other_id)
+            for other_id in candidates
+        )
+        best = heapq.nlargest(limit, scored)
+        return [(other_id, score) for score, _, other_id in best if score > 0]
+
+
+def _live_entries():
+    from .models import DictionaryEntryPage
+    return DictionaryEntryPage.objects.live().public()
+
+
+def load_similarity_data():
+    """
+    Load the features of all live dictionary entries.
+
+    Returns:
+        SimilarityData: The loaded data
+    """
+    from .models import DictionaryEntryTag
+
+    rows = list(_live_entries().values(*ENTRY_FIELDS))
+    tag_pairs = DictionaryEntryTag.objects.values_list('content_object_id', 'tag_id').iterator()
+    return SimilarityData(rows, tag_pairs)
+
+
+def save_similar_entries(neighbours):
+    """
+    Replace the stored neighbours of some entries.
+
+    Args:
+        neighbours (dict): Maps entry ids to their (similar entry id, score) pairs
+    """
+    from .models import SimilarEntry
+
+    with transaction.atomic():
+        SimilarEntry.objects.filter(entry_id__in=list(neighbours)).delete()
+        SimilarEntry.objects.bulk_create([
+            SimilarEntry(entry_id=entry_id, similar_id=similar_id, score=score)
+            for entry_id, pairs in neighbours.items()
+            for similar_id, score in pairs
+        ])
+
+
+def refresh_similar_entries(entry):
+    """
+    Recompute the neighbours of a newly published entry, and add it to the
+    neighbour lists of the entries it is similar to.
+
+    Args:
+        entry: The DictionaryEntryPage that was published
+    """
+    from .models import DictionaryEntryTag, SimilarEntry
+
+    tag_ids = list(DictionaryEntryTag.objects.filter(content_object_id=entry.pk).values_list('tag_id', flat=True))
+
+    # Candidates are the entries that share a selective feature, plus the most
+    # viewed entries of the same part of speech
+    shared = Q(tags__in=tag_ids)
+    if entry.lemma_gurmukhi:
+        shared |= Q(lemma_gurmukhi=entry.lemma_gurmukhi)
+    if entry.loaned_from:
+        shared |= Q(loaned_from=entry.loaned_from)
+    candidate_ids = set(_live_entries().filter(shared).values_list('pk', flat=True).distinct()[:MAX_GROUP_SIZE])
+    same_pos = _live_entries().filter(parts_of_speech=entry.parts_of_speech).order_by('-view_count')
+    candidate_ids.update(same_pos.values_list('pk', flat=True)[:SIMILAR_ENTRIES_PER_ENTRY + 1])
+    candidate_ids.update(same_pos.filter(origin=entry.origin).values_list('pk', flat=True)[:SIMILAR_ENTRIES_PER_ENTRY + 1])
+    candidate_ids.add(entry.pk)
+
+    rows = list(_live_entries().filter(pk__in=candidate_ids).values(*ENTRY_FIELDS))
+    if not any(row['id'] == entry.pk for row in rows):
+        # Not publicly visible, so it should not be listed anywhere
+        SimilarEntry.objects.filter(Q(entry=entry) | Q(similar=entry)).delete()
+        return
+
+    tag_pairs = DictionaryEntryTag.objects.filter(content_object_id__in=candidate_ids).values_list('content_object_id', 'tag_id')
+    data = SimilarityData(rows, tag_pairs)
+    own = data.neighbours(entry.pk)
+    neighbours = {entry.pk: own}
+
+    # The score is symmetric, so the entry may also belong in its neighbours' lists
+    stored = defaultdict(dict)
+    for row in SimilarEntry.objects.filter(entry_id__in=[similar_id for similar_id, _ in own]):
+        stored[row.entry_id][row.similar_id] = row.score
+    for similar_id, score in own:
+        pairs = stored[similar_id]
+        pairs[entry.pk] = score
+        neighbours[similar_id] = heapq.nlargest(SIMILAR_ENTRIES_PER_ENTRY, pairs.items(), key=lambda pair: pair[1])
+
+    save_similar_entries(neighbours)
@@ -0,0 +1,286 @@
+"""
+"Did you mean" suggestions for search queries.
+
+Each process keeps an in-memory symmetric-delete (SymSpell) index of the
+words in dictionary headwords and lemmas and in idiom and phrase text, in
+all the scripts they are written in. Every word is stored under each string
+obtained by deleting up to SPELLING_MAX_DISTANCE characters from its first
+SPELLING_PREFIX_LENGTH characters. A misspelled word generates its own
+deletes the same way; the words stored under them are the only candidates,
+and their edit distance to the query is checked. A lookup is therefore a
+few dozen dict lookups, whatever the size of the vocabulary.
+
+Like the autocomplete index (home.autocomplete), the index is updated in
+place when an entry, idiom or phrase is published, unpublished or deleted in
+this process, and rebuilt in the background by the other processes (see
+home.process_index).
+"""
+
+import re
+import threading
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from .process_index import ProcessIndex
+from .utils import normalize_gurmukhi
+
+# Cache key of the counter that is bumped whenever the indexed content changes
+SPELLING_GENERATION_KEY = 'spelling_suggestions:generation'
+
+# Largest edit distance of a suggestion
+SPELLING_MAX_DISTANCE = 2
+
+# Only this many leading characters of a word generate deletes, which bounds
+# the size of the index for long words
+SPELLING_PREFIX_LENGTH = 7
+
+# Words shorter than this are too ambiguous to correct
+SPELLING_MIN_WORD_LENGTH = 3
+
+# Anything that is not part of a word, in any of the scripts
+_WORD_SEPARATORS = re.compile(r"[\s\d.,;:!?'\"()\[\]{}<>/\\|\-–—।॥،؛؟۔]+")
+
+
+def normalize_word(word):
+    """Normalize a word for matching"""
+    return normalize_gurmukhi(word).casefold()
+
+
+def split_words(text):
+    """
+    Split text into normalized words.
+
+    Args:
+        text (str): Text in any script
+
+    Returns:
+        list: The words, in order
+    """
+    return [word for word in _WORD_SEPARATORS.split(normalize_word(text)) if word]
+
+
+def edit_distance(first, second, max_distance):
+    """
+    Damerau-Levenshtein (optimal string alignment) distance between two words.
+
+    Args:
+        first (str): A word
+        second (str): Another word
+        max_distance (int): Distances above this are not needed
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (first_char != second_char),
+            )
+            if i > 1 and j > 1 and first_char == second[j - 2] and first[i - 2] == second_char:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def _deletes(word):
+    """The strings obtained by deleting up to SPELLING_MAX_DISTANCE characters from the word's prefix"""
+    prefix = word[:SPELLING_PREFIX_LENGTH]
+    deletes = {prefix}
+    for count in range(1, min(SPELLING_MAX_DISTANCE, len(prefix) - 1) + 1):
+        for positions in combinations(range(len(prefix)), count):
+            deletes.add(''.join(char for i, char in enumerate(prefix) if i not in positions))
+    return deletes
+
+
+class SpellingIndex:
+    """
+    Symmetric-delete index of the words of the indexed content.
+
+    Args:
+        rows: Iterable of (source id, text, ...) tuples; each source is a page
+              and its texts are the fields the words are taken from
+    """
+
+    def __init__(self, rows=()):
+        self.sources = {}
+        self.words = Counter()
+        self.deletes = defaultdict(set)
+        # Lookups run in request threads while sources are added and removed
+        self._lock = threading.RLock()
+
+        for source_id, *texts in rows:
+            self.add(source_id, texts)
+
+    def __len__(self):
+        return len(self.words)
+
+    @staticmethod
+    def _source_words(texts):
+        return {
+            word for text in texts if text for word in split_words(text)
+            if len(word) >= SPELLING_MIN_WORD_LENGTH
+        }
+
+    def add(self, source_id, texts):
+        """Add the words of a source, replacing any previous version of it"""
+        words = self._source_words(texts)
+        with self._lock:
+            self.remove(source_id)
+            self.sources[source_id] = words
+            for word in words:
+                if not self.words[word]:
+                    for delete in _deletes(word):
+                        self.deletes[delete].add(word)
+                self.words[word] += 1
+
+    def remove(self, source_id):
+        """Remove the words of a source if it is in the index"""
+        with self._lock:
+            for word in self.sources.pop(source_id, ()):
+                self.words[word] -= 1
+                if self.words[word]:
+                    continue
+                del self.words[word]
+                for delete in _deletes(word):
+                    self.deletes[delete].discard(word)
+                    if not self.deletes[delete]:
+                        del self.deletes[delete]
+
+    def lookup(self, word, limit=5):
+        """
+        Find the indexed words within SPELLING_MAX_DISTANCE edits of a word.
+
+        Args:
+            word (str): The word as typed
+            limit (int): Maximum number of suggestions to return
+
+        Returns:
+            list: (word, distance) pairs, closest and then most common first;
+                  empty if the word itself is indexed
+        """
+        word = normalize_word(word)
+        if len(word) < SPELLING_MIN_WORD_LENGTH or word in self.words:
+            return []
+
+        with self._lock:
+            candidates = set()
+            for delete in _deletes(word):
+                candidates.update(self.deletes.get(delete, ()))
+
+            suggestions = []
+            for candidate in candidates:
+                distance = edit_distance(word, candidate, SPELLING_MAX_DISTANCE)
+                if distance <= SPELLING_MAX_DISTANCE:
+                    suggestions.append((candidate, distance, self.words[candidate]))
+        suggestions.sort(key=lambda suggestion: (suggestion[1], -suggestion[2], suggestion[0]))
+        return [(candidate, distance) for candidate, distance, count in suggestions[:limit]]
+
+    def suggest(self, query):
+        """
+        Correct the misspelled words of a query.
+
+        Args:
+            query (str): The search query
+
+        Returns:
+            str: The query with each unknown word replaced by its best
+                 suggestion, or None if no word could be corrected
+        """
+        words = split_words(query)
+        corrected = []
+        for word in words:
+            suggestions = self.lookup(word, limit=1)
+            corrected.append(suggestions[0][0] if suggestions else word)
+        if corrected == words:
+            return None
+        return ' '.join(corrected)
+
+
+def _source_fields():
+    from .models import DictionaryEntryPage, IdiomPage, PhrasePage
+
+    return {
+        DictionaryEntryPage: ['lemma_gurmukhi', 'headword_gurmukhi', 'headword_shahmukhi', 'headword_roman_simple'],
+        IdiomPage: ['idiom_gurmukhi', 'idiom_shahmukhi', 'transliteration_roman_simple'],
+        PhrasePage: ['phrase_gurmukhi', 'phrase_shahmukhi', 'roman_simple'],
+    }
+
+
+def _source_rows(model, **filters):
+    return model.objects.live().public().filter(**filters).values_list('id', *_source_fields()[model])
+
+
+def _all_source_rows():
+    for model in _source_fields():
+        yield from _source_rows(model).iterator()
+
+
+def _update_index(index, sources):
+    ids_by_model = defaultdict(set)
+    for model, source_id in sources:
+        ids_by_model[model].add(source_id)
+    for model, source_ids in ids_by_model.items():
+        rows = {source_id: texts for source_id, *texts in _source_rows(model, pk__in=source_ids)}
+        for source_id in source_ids:
+            if source_id in rows:
+                index.add(source_id, rows[source_id])
+            else:
+                index.remove(source_id)
+
+
+spelling_index = ProcessIndex(
+    SPELLING_GENERATION_KEY,
+    build=lambda: SpellingIndex(_all_source_rows()),
+    update=_update_index,
+)
+
+
+def get_spelling_index():
+    """
+    Return this process's spelling index. It is built on first use and
+    rebuilt in the background when another process has changed the indexed
+    content.
+
+    Returns:
+        SpellingIndex: The index
+    """
+    return spelling_index.get()
+
+
+def suggest_spelling(query):
+    """
+    Return a corrected version of a search query that found nothing.
+
+    Args:
+        query (str): The search query
+
+    Returns:
+        str: The suggested query, or None
+    """
+    if not query:
+        return None
+    return get_spelling_index().suggest(query)
+
+
+def refresh_spelling_source(page):
+    """
+    Update the index after a page it covers was published, unpublished or deleted.
+
+    The change is applied when the transaction commits: in place in this
+    process, while other processes rebuild their index.
+
+    Args:
+        page: The DictionaryEntryPage, IdiomPage or PhrasePage that changed
+    """
+    spelling_index.changed((type(page), page.pk))
@@ -1,10 +1,69 @@
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
-from home.models import HomePage
+from home.autocomplete import AutocompleteIndex
+from home.buffering import HitBuffer
+from home.bundle import build_bundle
+from home.checks import check_shared_cache
+from home.daily import daily_index
+from home.export import parse_since
+from home.middleware.page_cache import PageCacheMiddleware
+from home.middleware.views import get_viewed_objects
+from home.models import (
+    Author, AuthorDetailPage, AuthorsIndexPage, DictionaryEntryPage, DictionaryIndexPage, HomePage,
+    PageViewBucket, RemovedPage, SearchQueryStat, SimilarEntry,
+)
+from home.search_stats import POPULAR_SEARCH_MIN_HITS, build_search_report
+from home.searching import bump_search_generation, federated_search, search_cache_key
+from home.similarity import SimilarityData
+from home.spelling import SpellingIndex, edit_distance
+from home.transliteration import expand_query
+from home.trending import TRENDING_HALF_LIFE, decay_factor
+from home.view_counts import save_view_counts, view_counts
+from home.visitors import (
+    HyperLogLog, client_address, is_countable_visit, rank_by_unique_visitors, save_visits,
+)
+from home.page_cache import is_cacheable_request
+from home.prerender import prerendered_file, remove_page, render_page
+from home.process_index import ProcessIndex
+from home.pagination import InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor, paginate_index
+from home.utils import (
+    extract_first_letter_gurmukhi, gurmukhi_collation_bytes, gurmukhi_collation_key,
+    gurmukhi_sort_key, normalize_gurmukhi, sort_gurmukhi_items,
+)
 
-from wagtail.models import Page
+from wagtail.models import Page, Site
+from wagtail.search.backends import get_search_backend
 from wagtail.test.utils import WagtailPageTestCase
 
 
+def add_dictionary_entry(parent, headword, **fields):
+    """Add a live dictionary entry under a dictionary index page, filling the required fields from the headword"""
+    values = {
+        'lemma_gurmukhi': headword, 'headword_shahmukhi': headword, 'headword_roman_simple': headword,
+        'parts_of_speech': 'noun', 'enriched_definition_gurmukhi': f"<p>{headword}</p>",
+        'enriched_definition_english': f"<p>{headword}</p>", 'simple_definition_shahmukhi': headword,
+    }
+    values.update(fields)
+    return parent.add_child(instance=DictionaryEntryPage(title=headword, headword_gurmukhi=headword, **values))
+
+
 class HomeSetUpTests(WagtailPageTestCase):
     """
     Tests for basic page structure setup and HomePage creation.
@@ -33,11 +92,922 @@ class HomeTests(WagtailPageTestCase):
         root_page = Page.objects.get(pk=1)
         self.homepage = HomePage(title="Home")
         root_page.add_child(instance=self.homepage)
+        site = Site.objects.get(is_default_site=True)
+        site.root_page = self.homepage
+        site.save()
+        # The site root paths are cached, and the cache outlives the test's transaction
+        self.addCleanup(cache.clear)
 
     def test_homepage_status_code(self):
-        response = self.client.get(reverse("home"))
+        response = self.client.get(self.homepage.url)
         self.assertEqual(response.status_code, 200)
 
     def test_homepage_template_used(self):
-        response = self.client.get(reverse("home"))
+        response = self.client.get(self.homepage.url)
         self.assertTemplateUsed(response, "home/home_page.html")
+
+    def test_stats_are_cached_until_cleared(self):
+        self.client.get(self.homepage.url)
+        key = HomePage.block_cache_key(self.homepage.pk, 'stats')
+        self.assertIsNotNone(cache.get(key))
+        HomePage.clear_cached_blocks(['stats'])
+        self.assertIsNone(cache.get(key))
+
+    def test_deleted_sections_clear_the_blocks_at_once(self):
+        dictionary = self.homepage.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        for headword in ("ਘਰ", "ਪਾਣੀ", "ਜਲ"):
+            add_dictionary_entry(dictionary, headword)
+
+        with mock.patch.object(HomePage, 'clear_cached_blocks') as clear:
+            with self.captureOnCommitCallbacks(execute=True):
+                dictionary.delete()
+        clear.assert_called_once_with({'trending', 'most_visited', 'stats', 'featured'})
+
+
+class DictionaryLetterTests(WagtailPageTestCase):
+    """
+    Tests for the per-letter counts of the dictionary alphabet navigation.
+    """
+
+    def setUp(self):
+        cache.clear()
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        for headword in ["ਕਮਲ", "ਅੰਬ", "ਕਲਮ", "ਅਜ", "ਘਰ"]:
+            add_dictionary_entry(self.dictionary, headword)
+
+    def test_counts_and_start_pages(self):
+        self.dictionary.entries_per_page = 2
+        self.assertEqual(self.dictionary.get_letter_counts(), {'ਅ': 2, 'ਕ': 2, 'ਘ': 1})
+        self.assertEqual(self.dictionary.get_letter_navigation(), [
+            {'letter': 'ਅ', 'count': 2, 'start_page': 1},
+            {'letter': 'ਕ', 'count': 2, 'start_page': 2},
+            {'letter': 'ਘ', 'count': 1, 'start_page': 3},
+        ])
+
+    def test_entries_outside_the_alphabet_sort_last(self):
+        # Sorts after 'ਘਰ', so it must not be counted under 'ਅ'
+        add_dictionary_entry(self.dictionary, '"ਅਬ"', slug="ab")
+        self.dictionary.entries_per_page = 2
+        self.assertEqual(self.dictionary.get_letter_counts(), {'ਅ': 2, 'ਕ': 2, 'ਘ': 1, '': 1})
+        self.assertEqual([item['start_page'] for item in self.dictionary.get_letter_navigation()], [1, 2, 3])
+        self.assertEqual(
+            DictionaryEntryPage.objects.order_by('gurmukhi_sort_key').last().headword_gurmukhi, '"ਅਬ"'
+        )
+
+    def test_counts_are_cached_until_cleared(self):
+        self.dictionary.get_letter_counts()
+        add_dictionary_entry(self.dictionary, "ਘੜੀ")
+        self.assertEqual(self.dictionary.get_letter_counts()['ਘ'], 1)
+        self.dictionary.clear_letter_counts()
+        self.assertEqual(self.dictionary.get_letter_counts()['ਘ'], 2)
+
+    def test_letters_jump_to_their_page_unless_filtered(self):
+        response = self.client.get(self.dictionary.url)
+        self.assertContains(response, 'href="?page=1&sort=alpha_asc"')
+        response = self.client.get(self.dictionary.url, {'pos': 'noun'})
+        self.assertContains(response, 'href="?letter=ਘ&pos=noun')
+
+
+class DictionaryFacetTests(WagtailPageTestCase):
+    """
+    Tests for the filter sidebar counts of the dictionary.
+    """
+
+    def setUp(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        add_dictionary_entry(self.dictionary, "ਘਰ", parts_of_speech='noun', origin='punjabi', synonyms_gurmukhi="ਮਕਾਨ")
+        add_dictionary_entry(self.dictionary, "ਲਿਖ", parts_of_speech='verb', origin='persian')
+        add_dictionary_entry(self.dictionary, "ਕਿਤਾਬ", parts_of_speech='noun', origin='persian',
+                             example_sentences_gurmukhi="<p>ਕਿਤਾਬ ਪੜ੍ਹੋ</p>")
+
+    def test_each_facet_ignores_its_own_filter(self):
+        facet_filters = self.dictionary.get_facet_filters(RequestFactory().get('/', {'origin': 'persian'}))
+        entries = DictionaryEntryPage.objects.live().child_of(self.dictionary)
+        counts = self.dictionary.get_facet_counts(entries, facet_filters)
+
+        self.assertEqual(counts['pos'], {'noun': 1, 'verb': 1, 'adjective': 0, 'adverb': 0})
+        self.assertEqual(counts['origin']['persian'], 2)
+        self.assertEqual(counts['origin']['punjabi'], 1)
+        self.assertEqual(counts['origin']['arabic'], 0)
+        self.assertEqual(
+            [counts[name] for name in ('has_synonyms', 'has_antonyms', 'has_examples', 'has_audio')],
+            [0, 0, 1, 0],
+        )
+
+
+class SearchBackendTests(WagtailPageTestCase):
+    """
+    Tests for the partial matches of home.search_backend.
+    """
+
+    def test_partial_match_ignores_spelling_variants(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        # Stored with a precomposed nukta letter and a zero-width joiner
+        entry = add_dictionary_entry(dictionary, "\u0a36\u0a39\u200d\u0a3f\u0a30", headword_roman_simple="Shahir")
+        add_dictionary_entry(dictionary, "ਘਰ")
+
+        entries = DictionaryEntryPage.objects.live()
+        for query in ["\u0a38\u0a3c\u0a39\u0a3f", "\u0a36\u0a39\u0a3f", "HAHI"]:
+            with self.subTest(query=query):
+                self.assertEqual([page.pk for page in get_search_backend().search(query, entries)], [entry.pk])
+
+
+class CacheInvalidationTests(WagtailPageTestCase):
+    """
+    Tests for clearing cached data when pages change.
+    """
+
+    def test_caches_are_cleared_when_the_transaction_commits(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        entry = add_dictionary_entry(dictionary, "ਪਾਣੀ")
+        queryset = DictionaryEntryPage.objects.live()
+        key = search_cache_key(queryset, "ਪਾਣੀ", 10)
+        dictionary.get_letter_counts()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            entry.save_revision().publish()
+            # Requests made before the commit must not cache the old content again
+            self.assertEqual(search_cache_key(queryset, "ਪਾਣੀ", 10), key)
+            self.assertIsNotNone(cache.get(dictionary.letter_counts_cache_key))
+
+        self.assertNotEqual(search_cache_key(queryset, "ਪਾਣੀ", 10), key)
+        self.assertIsNone(cache.get(dictionary.letter_counts_cache_key))
+
+    def test_deleted_sections_are_purged_at_once(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        entries = [add_dictionary_entry(dictionary, headword) for headword in ("ਘਰ", "ਪਾਣੀ", "ਜਲ")]
+
+        with mock.patch('home.signals.purge_pages') as purge:
+            with self.captureOnCommitCallbacks(execute=True):
+                dictionary.delete()
+        purge.assert_called_once()
+        purged = {page.pk for page in purge.call_args.args[0]}
+        self.assertTrue({dictionary.pk, site_root.pk, *(entry.pk for entry in entries)} <= purged)
+
+
+class ExportTests(WagtailPageTestCase):
+    """
+    Tests for the NDJSON export API.
+    """
+
+    def setUp(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        self.entry = add_dictionary_entry(self.dictionary, "ਘਰ")
+        self.url = reverse('export_content')
+
+    def export(self, **params):
+        response = self.client.get(self.url, params, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+    def test_requires_staff_or_api_key(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        with override_settings(EXPORT_API_KEYS=['secret']):
+            self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+            self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION="Bearer secret").status_code, 200)
+        self.client.force_login(User.objects.create_user('editor', is_staff=True))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(EXPORT_API_KEYS=['secret'])
+    def test_exports_live_pages_without_view_counts(self):
+        rows = self.export(types='dictionary_entry')
+        self.assertEqual([row['id'] for row in rows], [self.entry.pk])
+        self.assertEqual(rows[0]['headword_gurmukhi'], "ਘਰ")
+        self.assertNotIn('view_count', rows[0])
+
+    @override_settings(EXPORT_API_KEYS=['secret'])
+    def test_incremental_export_lists_removed_pages(self):
+        since = datetime.now(timezone.utc) - timedelta(minutes=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.entry.unpublish()
+        rows = self.export(since=since.isoformat())
+        self.assertEqual(rows, [
+            {'type': 'dictionary_entry', 'id': self.entry.pk, 'removed': True, 'removed_at': rows[0]['removed_at']},
+        ])
+        self.assertEqual(self.export(since=datetime.now(timezone.utc).isoformat()), [])
+
+    def test_removed_pages_are_recorded_at_once(self):
+        other_entry = add_dictionary_entry(self.dictionary, "ਪਾਣੀ")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.entry.unpublish()
+        first_removed_at = RemovedPage.objects.get(page_id=self.entry.pk).removed_at
+
+        with mock.patch.object(RemovedPage.objects, 'bulk_create', wraps=RemovedPage.objects.bulk_create) as record:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.entry.unpublish()
+                self.dictionary.delete()
+        record.assert_called_once()
+        removed = dict(RemovedPage.objects.values_list('page_id', 'removed_at'))
+        self.assertEqual(set(removed), {self.entry.pk, other_entry.pk})
+        self.assertGreater(removed[self.entry.pk], first_removed_at)
+
+    def test_parse_since(self):
+        self.assertEqual(parse_since("2026-10-16T12:30:00+00:00"), datetime(2026, 10, 16, 12, 30, tzinfo=timezone.utc))
+        self.assertEqual(parse_since("2026-10-16").date(), date(2026, 10, 16))
+        with self.assertRaises(ValueError):
+            parse_since("yesterday")
+
+
+class OfflineBundleTests(WagtailPageTestCase):
+    """
+    Tests for building the offline SQLite bundle.
+    """
+
+    def setUp(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        self.house = add_dictionary_entry(self.dictionary, "ਘਰ", headword_roman_simple="ghar",
+                                          enriched_definition_english="<p>house</p>")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'bundle.sqlite3')
+
+    def search(self, text):
+        connection = sqlite3.connect(self.path)
+        try:
+            return [rowid for (rowid,) in connection.execute("SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?", (text,))]
+        finally:
+            connection.close()
+
+    def test_full_then_incremental_build(self):
+        stats = build_bundle(self.path)
+        self.assertEqual((stats['incremental'], stats['written'], stats['total']), (False, 1, 1))
+        self.assertEqual(self.search('house'), [self.house.pk])
+        self.assertEqual(self.search('ਘਰ'), [self.house.pk])
+
+        water = add_dictionary_entry(self.dictionary, "ਪਾਣੀ", headword_roman_simple="paani",
+                                     enriched_definition_english="<p>water</p>")
+        water.save_revision().publish()
+        self.house.unpublish()
+
+        stats = build_bundle(self.path, previous=self.path)
+        self.assertEqual((stats['incremental'], stats['written'], stats['deleted'], stats['total']), (True, 1, 1, 1))
+        self.assertEqual(self.search('water'), [water.pk])
+        self.assertEqual(self.search('ਪਾਣੀ'), [water.pk])
+        self.assertEqual(self.search('house'), [])
+
+
+class ViewCountTests(WagtailPageTestCase):
+    """
+    Tests for counting page views in batches.
+    """
+
+    def setUp(self):
+        cache.clear()
+        view_counts.flush()
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        self.entry = add_dictionary_entry(self.dictionary, "ਪਾਣੀ")
+        self.other_entry = add_dictionary_entry(self.dictionary, "ਘਰ")
+
+    def test_saves_counts_and_hourly_views(self):
+        hour = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+        label = DictionaryEntryPage._meta.label
+        counts = {(label, self.entry.pk, hour): 3, (label, self.other_entry.pk, hour): 1}
+        save_view_counts(counts)
+        save_view_counts(counts)
+
+        self.entry.refresh_from_db()
+        self.other_entry.refresh_from_db()
+        self.assertEqual((self.entry.view_count, self.other_entry.view_count), (6, 2))
+        self.assertEqual(
+            dict(PageViewBucket.objects.filter(hour=hour).values_list('page_id', 'views')),
+            {self.entry.pk: 6, self.other_entry.pk: 2},
+        )
+
+    def test_views_of_deleted_pages_are_dropped(self):
+        hour = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+        label = DictionaryEntryPage._meta.label
+        deleted_pk = self.other_entry.pk
+        self.other_entry.delete()
+
+        save_view_counts({(label, self.entry.pk, hour): 2, (label, deleted_pk, hour): 5})
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.view_count, 2)
+        self.assertEqual(list(PageViewBucket.objects.values_list('page_id', 'views')), [(self.entry.pk, 2)])
+
+    def test_served_pages_are_counted(self):
+        self.client.get(self.entry.url)
+        self.client.head(self.entry.url)
+        view_counts.flush()
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.view_count, 1)
+
+    def test_author_pages_count_views_of_their_author(self):
+        author = Author.objects.create(name="Waris Shah", slug="waris-shah")
+        site_root = Site.objects.get(is_default_site=True).root_page
+        authors = site_root.add_child(instance=AuthorsIndexPage(title="Authors", slug="authors"))
+        author_page = authors.add_child(instance=AuthorDetailPage(title="Waris Shah", author=author))
+
+        self.client.get(author_page.url)
+        self.client.get(author_page.url)
+        view_counts.flush()
+
+        author.refresh_from_db()
+        self.assertEqual(author.view_count, 2)
+
+
+class GurmukhiCollationKeyTests(SimpleTestCase):
+    """
+    Tests for the stored Gurmukhi collation key.
+    """
+
+    def test_key_order_matches_sort_key(self):
+        words = ["ਹਵਾ", "ਅੰਬ", "ਕਮਲ", "ੳਠ", "ਸਰ", "ਕਲਮ", "ਅਜ", ""]
+        by_tuple = sorted(words, key=gurmukhi_sort_key)
+        by_key = sorted(words, key=gurmukhi_collation_key)
+        self.assertEqual(by_tuple, by_key)
+
+    def test_key_is_truncated_to_whole_characters(self):
+        key = gurmukhi_collation_key("ਕ" * 100, max_length=30)
+        self.assertEqual(len(key), 28)
+
+    def test_nukta_letters_sort_after_consonants(self):
+        # 'ਸ਼' written decomposed (ਸ + nukta) and precomposed (U+0A36)
+        words = ["\u0a38\u0a3c\u0a47\u0a30", "\u0a5c\u0a3e", "\u0a36\u0a30", "\u0a38\u0a30"]
+        self.assertEqual(sort_gurmukhi_items(words), ["\u0a38\u0a30", "\u0a5c\u0a3e", "\u0a36\u0a30", "\u0a38\u0a3c\u0a47\u0a30"])
+        self.assertEqual(gurmukhi_collation_bytes("\u0a36"), gurmukhi_collation_bytes("\u0a38\u0a3c"))
+        self.assertEqual(extract_first_letter_gurmukhi("\u0a36\u0a30"), "\u0a38\u0a3c")
+
+    def test_text_outside_the_alphabet_has_no_first_letter(self):
+        self.assertEqual(extract_first_letter_gurmukhi("\u200d\u0a15\u0a2e\u0a32"), "\u0a15")
+        self.assertEqual(extract_first_letter_gurmukhi('"\u0a15\u0a2e\u0a32"'), "")
+        self.assertEqual(extract_first_letter_gurmukhi(""), "")
+
+
+class NormalizeGurmukhiTests(SimpleTestCase):
+    """
+    Tests for the text normalization applied to indexed text and search queries.
+    """
+
+    def test_zero_width_characters_and_spacing(self):
+        self.assertEqual(normalize_gurmukhi(" ਪਾ\u200dਣੀ \t ਦੀ\u200b "), "ਪਾਣੀ ਦੀ")
+
+    def test_nukta_letters_are_decomposed(self):
+        self.assertEqual(normalize_gurmukhi("\u0a36\u0a39\u0a3f\u0a30"), "\u0a38\u0a3c\u0a39\u0a3f\u0a30")
+        self.assertEqual(normalize_gurmukhi("\u0a5b"), normalize_gurmukhi("\u0a1c\u0a3c"))
+
+
+class SearchCacheKeyTests(SimpleTestCase):
+    """
+    Tests for the cache keys of search results.
+    """
+
+    def test_key_uses_normalized_query(self):
+        queryset = Page.objects.live()
+        self.assertEqual(
+            search_cache_key(queryset, "ਪਾ\u200dਣੀ  Water", 10),
+            search_cache_key(queryset, "ਪਾਣੀ water", 10),
+        )
+        self.assertNotEqual(search_cache_key(queryset, "ਪਾਣੀ", 10), search_cache_key(queryset.filter(depth=3), "ਪਾਣੀ", 10))
+
+    def test_publishing_invalidates_parent_model_searches(self):
+        queryset = Page.objects.live()
+        key = search_cache_key(queryset, "ਪਾਣੀ", 10)
+        bump_search_generation(DictionaryEntryPage)
+        self.assertNotEqual(search_cache_key(queryset, "ਪਾਣੀ", 10), key)
+
+    def test_per_process_cache_is_reported(self):
+        self.assertEqual(check_shared_cache(None), [])
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([message.id for message in check_shared_cache(None)], ['home.W001'])
+
+
+class SearchReportTests(TestCase):
+    """
+    Tests for the popular and zero-result search report.
+    """
+
+    def test_popular_searches_only_include_queries_that_found_something(self):
+        today = datetime.now(timezone.utc).date()
+        SearchQueryStat.objects.create(query="ਪਾਣੀ", date=today, hits=5, zero_result_hits=0)
+        SearchQueryStat.objects.create(query="ਪਾਣਿ", date=today, hits=9, zero_result_hits=9)
+        SearchQueryStat.objects.create(query="ਘਰ", date=today, hits=8, zero_result_hits=1)
+
+        report = build_search_report()
+        self.assertEqual(report['popular'], ["ਪਾਣੀ"])
+        self.assertEqual(report['zero_results'], [("ਪਾਣਿ", 9), ("ਘਰ", 1)])
+
+    def test_popular_searches_need_enough_hits(self):
+        today = datetime.now(timezone.utc).date()
+        SearchQueryStat.objects.create(query="ਪਾਣੀ", date=today, hits=POPULAR_SEARCH_MIN_HITS, zero_result_hits=0)
+        SearchQueryStat.objects.create(query="spam", date=today, hits=POPULAR_SEARCH_MIN_HITS - 1, zero_result_hits=0)
+        self.assertEqual(build_search_report()['popular'], ["ਪਾਣੀ"])
+
+    def test_searches_by_crawlers_are_not_counted(self):
+        with mock.patch('search.views.log_search') as log:
+            self.client.get(reverse('search'), {'query': "ਪਾਣੀ"}, HTTP_USER_AGENT="Googlebot/2.1")
+            log.assert_not_called()
+            self.client.get(reverse('search'), {'query': "ਪਾਣੀ"}, HTTP_USER_AGENT="Mozilla/5.0")
+            log.assert_called_once_with("ਪਾਣੀ", found=False)
+
+
+class FederatedSearchTests(SimpleTestCase):
+    """
+    Tests for merging the page and author rankings of the global search.
+    """
+
+    def test_scores_are_scaled_per_source(self):
+        limit = 10
+        # Page scores run far higher than author scores for equally good matches
+        cache.set(search_cache_key(Page.objects.live(), "ਪਾਣੀ", limit), [(1, 40.0), (2, 20.0), (3, 2.0)])
+        cache.set(search_cache_key(Author.objects.all(), "ਪਾਣੀ", limit), [(7, 0.9), (8, 0.3)])
+
+        self.assertEqual(federated_search("ਪਾਣੀ", limit), [
+            ('page', 1), ('author', 7), ('page', 2), ('author', 8), ('page', 3),
+        ])
+
+
+class HitBufferTests(SimpleTestCase):
+    """
+    Tests for the in-memory hit buffer.
+    """
+
+    def test_flushes_when_full(self):
+        flushed = []
+        buffer = HitBuffer(flushed.append, max_hits=3, max_age=60)
+        buffer.add('a')
+        buffer.add('b')
+        self.assertEqual(flushed, [])
+        buffer.add('a')
+        self.assertEqual(flushed, [{'a': 2, 'b': 1}])
+
+    def test_manual_flush_empties_buffer(self):
+        flushed = []
+        buffer = HitBuffer(flushed.append, max_hits=100, max_age=60)
+        buffer.add('a', 5)
+        buffer.flush()
+        buffer.flush()
+        self.assertEqual(flushed, [{'a': 5}])
+
+    def test_flushes_old_batch_without_another_hit(self):
+        flushed = threading.Event()
+        buffer = HitBuffer(lambda counts: flushed.set(), max_hits=100, max_age=0.05)
+        buffer.add('a')
+        self.assertTrue(flushed.wait(5))
+
+
+class ExpandQueryTests(SimpleTestCase):
+    """
+    Tests for the cross-script variants of search queries.
+    """
+
+    def test_other_scripts_to_gurmukhi(self):
+        self.assertEqual(expand_query("پانی"), ("پانی", "ਪਾਨੀ"))
+        self.assertEqual(expand_query("पानी"), ("पानी", "ਪਾਨੀ"))
+        self.assertEqual(expand_query("Pakka"), ("pakka", "ਪੱਕਾ"))
+
+    def test_gurmukhi_to_shahmukhi(self):
+        self.assertEqual(expand_query("ਪਾਣੀ"), ("ਪਾਣੀ", "پاݨی"))
+
+    def test_digits_have_no_variants(self):
+        self.assertEqual(expand_query(" 1947 "), ("1947",))
+
+
+class SpellingIndexTests(SimpleTestCase):
+    """
+    Tests for the "did you mean" spelling suggestion index.
+    """
+
+    def setUp(self):
+        self.index = SpellingIndex([
+            (1, "ਪਾਣੀ", "پاݨی", "paani"),
+            (2, "ਪਾਣੀ ਦੀ ਬੂੰਦ", "", "paani di boond"),
+            (3, "ਕਿਤਾਬ", "کتاب", "kitaab"),
+        ])
+
+    def test_edit_distance_counts_transpositions_once(self):
+        self.assertEqual(edit_distance("ਕਿਤਾਬ", "ਕਤਿਾਬ", 2), 1)
+        self.assertEqual(edit_distance("kitten", "sitting", 2), 3)
+
+    def test_suggests_close_words(self):
+        self.assertEqual(self.index.lookup("ਪਣੀ"), [("ਪਾਣੀ", 1)])
+        self.assertEqual(self.index.suggest("Paanni di kitb"), "paani di kitaab")
+        self.assertIsNone(self.index.suggest("paani"))
+
+    def test_removed_sources_are_forgotten(self):
+        self.index.remove(3)
+        self.assertEqual(self.index.lookup("kitab"), [])
+        self.index.remove(1)
+        self.assertEqual(self.index.lookup("ਪਣੀ"), [("ਪਾਣੀ", 1)])
+
+
+class HyperLogLogTests(SimpleTestCase):
+    """
+    Tests for the unique visitor sketches.
+    """
+
+    def test_estimates_distinct_values(self):
+        sketch = HyperLogLog()
+        for i in range(20000):
+            sketch.add(f"visitor-{i % 10000}")
+        self.assertAlmostEqual(sketch.count(), 10000, delta=500)
+
+    def test_merged_sketches_count_overlap_once(self):
+        monday, tuesday = HyperLogLog(), HyperLogLog()
+        for i in range(3000):
+            monday.add(f"visitor-{i}")
+            tuesday.add(f"visitor-{i + 1000}")
+        monday.merge(HyperLogLog.from_bytes(tuesday.to_bytes()))
+        self.assertAlmostEqual(monday.count(), 4000, delta=200)
+
+    def test_crawlers_and_prefetches_are_not_counted(self):
+        factory = RequestFactory()
+        browser = "Mozilla/5.0 (X11; Linux x86_64) Firefox/130.0"
+        self.assertTrue(is_countable_visit(factory.get('/', HTTP_USER_AGENT=browser)))
+        self.assertFalse(is_countable_visit(factory.get('/', HTTP_USER_AGENT="Googlebot/2.1")))
+        self.assertFalse(is_countable_visit(factory.get('/', HTTP_USER_AGENT=browser, HTTP_SEC_PURPOSE="prefetch")))
+        self.assertFalse(is_countable_visit(factory.get('/')))
+
+    def test_forwarded_for_is_only_trusted_from_our_proxies(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.2', HTTP_X_FORWARDED_FOR='1.2.3.4, 203.0.113.9')
+        self.assertEqual(client_address(request), '10.0.0.2')
+        with mock.patch('home.visitors.TRUSTED_PROXY_COUNT', 1):
+            self.assertEqual(client_address(request), '203.0.113.9')
+        with mock.patch('home.visitors.TRUSTED_PROXY_COUNT', 3):
+            self.assertEqual(client_address(request), '10.0.0.2')
+
+
+class UniqueVisitorTests(WagtailPageTestCase):
+    """
+    Tests for storing and ranking the unique visitor sketches.
+    """
+
+    def test_ranks_pages_by_visitors_over_the_period(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        quiet, busy = add_dictionary_entry(dictionary, "ਘਰ"), add_dictionary_entry(dictionary, "ਪਾਣੀ")
+        today = datetime.now(timezone.utc).date()
+        yesterday = today - timedelta(days=1)
+        visitor = HyperLogLog.hash
+
+        # The busy page's visitors come back the next day, and are counted once
+        save_visits({(busy.pk, yesterday, visitor(f"v{i}")): 1 for i in range(30)})
+        save_visits({(busy.pk, today, visitor(f"v{i}")): 2 for i in range(20, 50)})
+        save_visits({(quiet.pk, today, visitor(f"v{i}")): 1 for i in range(10)})
+        # Visits to a page deleted in the meantime don't fail the batch
+        save_visits({(quiet.pk, today, visitor("v10")): 1, (10 ** 9, today, visitor("v0")): 1})
+
+        ranked = rank_by_unique_visitors(Page.objects.live(), 'week')
+        self.assertEqual([page.pk for page in ranked], [busy.pk, quiet.pk])
+        self.assertAlmostEqual(ranked[0].unique_visitors, 50, delta=2)
+        self.assertAlmostEqual(ranked[1].unique_visitors, 11, delta=1)
+
+        # The homepage and the admin report rank pages the same way
+        homepage = Page.objects.get(pk=1).add_child(instance=HomePage(title="Home", slug="punjabi-sahit"))
+        site = Site.objects.get(is_default_site=True)
+        site.root_page = homepage
+        site.save()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        response = self.client.get(homepage.url)
+        self.assertEqual([page.pk for page in response.context['most_visited']], [busy.pk, quiet.pk])
+        self.client.force_login(User.objects.create_superuser('admin'))
+        response = self.client.get(reverse('unique_visitors_report'), {'period': 'day'})
+        self.assertEqual([page.pk for page in response.context['object_list']], [busy.pk, quiet.pk])
+
+
+class DecayFactorTests(SimpleTestCase):
+    """
+    Tests for the weights of past views in the trending scores.
+    """
+
+    def test_views_count_half_after_half_life(self):
+        self.assertEqual(decay_factor(0), 1)
+        self.assertAlmostEqual(decay_factor(TRENDING_HALF_LIFE), 0.5)
+        self.assertAlmostEqual(decay_factor(3 * TRENDING_HALF_LIFE), 0.125)
+
+
+class ViewedObjectsTests(TestCase):
+    """
+    Tests for which objects a page view is counted for.
+    """
+
+    def test_content_pages_count_their_own_views(self):
+        entry = DictionaryEntryPage(title="ਪਾਣੀ")
+        self.assertEqual(get_viewed_objects(entry), [entry])
+        self.assertEqual(get_viewed_objects(HomePage(title="Home")), [])
+
+    def test_author_pages_count_views_of_their_author(self):
+        author = Author(name="Waris Shah")
+        self.assertEqual(get_viewed_objects(AuthorDetailPage(title="Waris Shah", author=author)), [author])
+        self.assertEqual(get_viewed_objects(AuthorDetailPage(title="Unknown")), [])
+
+
+class DailyIndexTests(SimpleTestCase):
+    """
+    Tests for the deterministic daily picks.
+    """
+
+    def test_same_pick_all_day(self):
+        today = date(2026, 10, 16)
+        self.assertEqual(daily_index('home.PhrasePage', today, 500), daily_index('home.PhrasePage', today, 500))
+        self.assertIn(daily_index('home.PhrasePage', today, 7), range(7))
+
+    def test_pick_changes_between_days(self):
+        picks = {daily_index('home.PhrasePage', date(2026, 10, day), 1000) for day in range(1, 11)}
+        self.assertGreater(len(picks), 1)
+
+
+class PageCacheRequestTests(SimpleTestCase):
+    """
+    Tests for which requests the full-page cache may answer.
+    """
+
+    def test_only_anonymous_gets_without_session_are_cached(self):
+        factory = RequestFactory()
+        self.assertTrue(is_cacheable_request(factory.get('/dictionary/')))
+        self.assertFalse(is_cacheable_request(factory.head('/dictionary/')))
+        self.assertFalse(is_cacheable_request(factory.post('/dictionary/')))
+
+        request = factory.get('/dictionary/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = 'abc'
+        self.assertFalse(is_cacheable_request(request))
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheMiddlewareTests(WagtailPageTestCase):
+    """
+    Tests for serving pages from the full-page cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        site_root = Site.objects.get(is_default_site=True).root_page
+        dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        self.entry = add_dictionary_entry(dictionary, "ਪਾਣੀ")
+        view_counts.flush()
+
+    def test_pages_are_cached_until_published(self):
+        self.assertEqual(self.client.get(self.entry.url)['X-Page-Cache'], 'MISS')
+        response = self.client.get(self.entry.url)
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.entry.save_revision().publish()
+        self.assertEqual(self.client.get(self.entry.url)['X-Page-Cache'], 'MISS')
+
+        # Views served from the cache are counted too
+        view_counts.flush()
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.view_count, 3)
+
+    def test_per_process_cache_is_refused(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(ImproperlyConfigured):
+                PageCacheMiddleware(lambda request: None)
+
+
+class PrerenderedFileTests(SimpleTestCase):
+    """
+    Tests for where pre-rendered pages are written.
+    """
+
+    def test_file_is_under_language_and_path(self):
+        self.assertEqual(
+            prerendered_file('/srv/prerendered', 'pa', '/dictionary/paani/'),
+            Path('/srv/prerendered/pa/dictionary/paani/index.html'),
+        )
+
+    def test_percent_encoded_paths_are_decoded(self):
+        self.assertEqual(
+            prerendered_file('/srv/prerendered', 'pa', '/dictionary/%E0%A8%AA%E0%A8%A3/'),
+            Path('/srv/prerendered/pa/dictionary/ਪਣ/index.html'),
+        )
+
+
+class RenderPageTests(WagtailPageTestCase):
+    """
+    Tests for pre-rendering a page to static files.
+    """
+
+    def setUp(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        self.entry = add_dictionary_entry(dictionary, "ਪਾਣੀ", slug="paani")
+        self.entry.save_revision().publish()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_renders_each_language_once_per_revision(self):
+        self.assertTrue(render_page(self.entry, self.root))
+        page_path = self.entry.get_url_parts()[2]
+        for language, name in settings.LANGUAGES:
+            html = prerendered_file(self.root, language, page_path)
+            self.assertIn("ਪਾਣੀ", html.read_text())
+            self.assertEqual(gzip.decompress(html.with_name('index.html.gz').read_bytes()), html.read_bytes())
+
+        self.assertFalse(render_page(self.entry, self.root))
+        self.assertTrue(render_page(self.entry, self.root, force=True))
+        self.entry.save_revision().publish()
+        self.assertTrue(render_page(DictionaryEntryPage.objects.get(pk=self.entry.pk), self.root))
+
+    def test_removed_pages_leave_no_files(self):
+        render_page(self.entry, self.root)
+        remove_page(self.entry.pk, self.root)
+        self.assertEqual([path for path in Path(self.root).rglob('*') if path.is_file()], [])
+
+
+class CursorTests(SimpleTestCase):
+    """
+    Tests for the opaque cursors used by keyset pagination.
+    """
+
+    def test_round_trip(self):
+        cursor = encode_cursor('next', "0006001e", 42)
+        self.assertEqual(decode_cursor(cursor), ('next', "0006001e", 42))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not-a-cursor")
+
+
+class KeysetPaginatorTests(WagtailPageTestCase):
+    """
+    Tests for paging through listings with cursors.
+    """
+
+    def setUp(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+        published = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for i, headword in enumerate(["ਕਮਲ", "ਅੰਬ", "ਕਲਮ", "ਅਜ", "ਘਰ", "ਘੜੀ", "ਜਲ"]):
+            entry = add_dictionary_entry(self.dictionary, headword)
+            # Ties on both sort fields, and two entries never published
+            Page.objects.filter(pk=entry.pk).update(first_published_at=published + timedelta(days=i % 3) if i < 5 else None)
+            DictionaryEntryPage.objects.filter(pk=entry.pk).update(view_count=i % 2)
+        self.entries = DictionaryEntryPage.objects.child_of(self.dictionary)
+
+    def pages(self, paginator):
+        """Return the ids on each page going forwards, then on each page going backwards from the last"""
+        page = paginator.page()
+        forwards = [[entry.pk for entry in page]]
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            forwards.append([entry.pk for entry in page])
+        backwards = [forwards[-1]]
+        while page.has_previous():
+            page = paginator.page(page.previous_cursor)
+            backwards.append([entry.pk for entry in page])
+        return forwards, backwards[::-1]
+
+    def test_pages_in_both_directions_follow_the_ordering(self):
+        expected = list(self.entries.order_by('-view_count', '-pk').values_list('pk', flat=True))
+        forwards, backwards = self.pages(KeysetPaginator(self.entries, 2, '-view_count'))
+        self.assertEqual(sum(forwards, []), expected)
+        self.assertEqual(backwards, forwards)
+        self.assertEqual([len(ids) for ids in forwards], [2, 2, 2, 1])
+
+    def test_null_sort_values_come_last(self):
+        rows = list(self.entries.values_list('first_published_at', 'pk'))
+        dated = sorted((row for row in rows if row[0] is not None), reverse=True)
+        undated = sorted((row for row in rows if row[0] is None), key=lambda row: row[1], reverse=True)
+        forwards, backwards = self.pages(KeysetPaginator(self.entries, 3, '-first_published_at'))
+        self.assertEqual(sum(forwards, []), [pk for published, pk in dated + undated])
+        self.assertEqual(backwards, forwards)
+
+    def test_tampered_cursors_give_the_first_page(self):
+        factory = RequestFactory()
+        for sort_field in ('-view_count', '-first_published_at'):
+            first_page = [entry.pk for entry in KeysetPaginator(self.entries, 2, sort_field).page()]
+            cursor = encode_cursor('next', 'abc', 1)
+            with self.assertRaises(InvalidCursor):
+                KeysetPaginator(self.entries, 2, sort_field).page(cursor)
+            page = paginate_index(factory.get('/', {'cursor': cursor}), self.entries, 2, sort_field)
+            self.assertEqual([entry.pk for entry in page], first_page)
+
+    def test_numbered_pages_link_to_cursor_pages(self):
+        factory = RequestFactory()
+        expected = list(self.entries.order_by('gurmukhi_sort_key', 'pk').values_list('pk', flat=True))
+        page = paginate_index(factory.get('/', {'sort': 'alpha_asc', 'page': 2}), self.entries, 2, 'gurmukhi_sort_key')
+        self.assertEqual([entry.pk for entry in page], expected[2:4])
+        self.assertIn('sort=alpha_asc', page.next_querystring)
+
+        next_page = paginate_index(factory.get('/?' + page.next_querystring), self.entries, 2, 'gurmukhi_sort_key')
+        self.assertTrue(next_page.is_cursor_page)
+        self.assertEqual([entry.pk for entry in next_page], expected[4:6])
+        previous_page = paginate_index(factory.get('/?' + page.previous_querystring), self.entries, 2, 'gurmukhi_sort_key')
+        self.assertEqual([entry.pk for entry in previous_page], expected[:2])
+
+
+class AutocompleteIndexTests(SimpleTestCase):
+    """
+    Tests for the in-memory headword autocomplete index.
+    """
+
+    def setUp(self):
+        self.index = AutocompleteIndex([
+            {'id': 1, 'url_path': '/', 'view_count': 5, 'headword_gurmukhi': "ਕਮਲ",
+             'headword_shahmukhi': "کمل", 'headword_roman_simple': "kamal"},
+            {'id': 2, 'url_path': '/', 'view_count': 50, 'headword_gurmukhi': "ਕਲਮ",
+             'headword_shahmukhi': "قلم", 'headword_roman_simple': "kalam"},
+            {'id': 3, 'url_path': '/', 'view_count': 10, 'headword_gurmukhi': "ਘਰ",
+             'headword_shahmukhi': "گھر", 'headword_roman_simple': "ghar"},
+        ])
+
+    def test_prefix_in_each_script_ranked_by_views(self):
+        self.assertEqual([row['id'] for row in self.index.lookup("ਕ")], [2, 1])
+        self.assertEqual([row['id'] for row in self.index.lookup("KA")], [2, 1])
+        self.assertEqual([row['id'] for row in self.index.lookup("گ")], [3])
+
+    def test_incremental_updates(self):
+        self.index.lookup("ਕ")
+        self.index.add({'id': 1, 'url_path': '/', 'view_count': 100, 'headword_gurmukhi': "ਕਮਲ",
+                        'headword_shahmukhi': "کمل", 'headword_roman_simple': "kamal"})
+        self.assertEqual([row['id'] for row in self.index.lookup("ਕ")], [1, 2])
+        self.index.remove(2)
+        self.assertEqual([row['id'] for row in self.index.lookup("kal")], [])
+
+
+class ProcessIndexTests(TestCase):
+    """
+    Tests for keeping the in-memory indexes in step with the database.
+    """
+
+    generation_key = 'tests:process_index:generation'
+
+    def setUp(self):
+        cache.delete(self.generation_key)
+        self.builds = []
+        self.updates = []
+        self.index = ProcessIndex(
+            self.generation_key,
+            build=lambda: self.builds.append(True) or {},
+            update=lambda index, items: self.updates.append(items),
+        )
+
+    def test_changes_of_a_transaction_are_applied_together_on_commit(self):
+        self.index.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index.changed(1)
+            self.index.changed(2)
+            self.index.changed(1)
+            self.assertEqual(self.updates, [])
+        self.assertEqual(self.updates, [{1, 2}])
+        self.assertEqual(cache.get(self.generation_key), 1)
+
+        # Changes made in this process don't need a rebuild
+        self.index.get()
+        self.assertEqual(len(self.builds), 1)
+
+
+class SimilarEntryTests(WagtailPageTestCase):
+    """
+    Tests for keeping the related words of dictionary entries up to date.
+    """
+
+    def setUp(self):
+        site_root = Site.objects.get(is_default_site=True).root_page
+        self.dictionary = site_root.add_child(instance=DictionaryIndexPage(title="Dictionary", slug="dictionary"))
+
+    def publish(self, headword):
+        entry = add_dictionary_entry(self.dictionary, headword, lemma_gurmukhi="ਕਰ")
+        entry.save_revision().publish()
+        return entry
+
+    def test_published_entries_refresh_their_related_words(self):
+        first, second = self.publish("ਕਰਨਾ"), self.publish("ਕਰਦਾ")
+        self.assertTrue(SimilarEntry.objects.filter(entry=second, similar=first).exists())
+
+    def test_imports_build_related_words_once(self):
+        words = [
+            {
+                'headword_gurmukhi': headword, 'lemma_gurmukhi': "ਕਰ", 'headword_shahmukhi': headword,
+                'headword_roman_simple': headword, 'parts_of_speech': 'verb', 'simple_definition_shahmukhi': headword,
+                'enriched_definition_gurmukhi': f"<p>{headword}</p>", 'enriched_definition_english': f"<p>{headword}</p>",
+            }
+            for headword in ("ਕਰਨਾ", "ਕਰਦਾ")
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8') as words_file:
+            json.dump(words, words_file)
+            words_file.flush()
+            with mock.patch('home.signals.refresh_similar_entries') as refresh:
+                call_command('import_words', words_file.name, stdout=StringIO())
+        refresh.assert_not_called()
+        self.assertEqual(SimilarEntry.objects.count(), 2)
+
+
+class SimilarityDataTests(SimpleTestCase):
+    """
+    Tests for the related-words scoring used to fill SimilarEntry.
+    """
+
+    def test_neighbours_ranked_by_shared_features(self):
+        rows = [
+            {'id': 1, 'view_count': 0, 'lemma_gurmukhi': "ਕਰ", 'parts_of_speech': 'verb', 'origin': 'punjabi', 'loaned_from': ''},
+            {'id': 2, 'view_count': 0, 'lemma_gurmukhi': "ਕਰ", 'parts_of_speech': 'noun', 'origin': 'punjabi', 'loaned_from': ''},
+            {'id': 3, 'view_count': 9, 'lemma_gurmukhi': "ਜਾ", 'parts_of_speech': 'verb', 'origin': 'punjabi', 'loaned_from': ''},
+            {'id': 4, 'view_count': 0, 'lemma_gurmukhi': "ਘਰ", 'parts_of_speech': 'noun', 'origin': 'persian', 'loaned_from': ''},
+        ]
+        data = SimilarityData(rows, [(1, 10), (3, 10)])
+        # Equal scores are ordered by views
+        self.assertEqual(data.neighbours(1), [(3, 5), (2, 5)])
+        self.assertEqual(data.neighbours(4), [(2, 1)])
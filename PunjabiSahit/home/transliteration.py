@@ -0,0 +1,208 @@
+"""
+Table-driven transliteration of search queries into the other scripts.
+
+Most content is indexed in Gurmukhi, but users also type Roman, Shahmukhi or
+Devanagari. expand_query() turns a query into its variants in the other
+scripts, so a search for 'paani', 'پانی' or 'पानी' also looks for 'ਪਾਨੀ'.
+
+Each scheme is a table from source tokens (one or more characters) to
+output. Vowels have two outputs: the independent letter used at the start
+of a syllable and the vowel sign used after a consonant. Text is read left
+to right taking the longest token that matches, so transliteration is
+O(len(text)). Characters of other scripts are passed through unchanged.
+
+The results are approximate (the scripts do not map one to one), which is
+fine for widening a search: every variant is searched alongside the query.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from .utils import normalize_gurmukhi
+
+# Gurmukhi vowels: (independent letter, vowel sign)
+_GURMUKHI_VOWELS = {
+    'a': ('ਅ', ''), 'aa': ('ਆ', 'ਾ'), 'i': ('ਇ', 'ਿ'), 'ee': ('ਈ', 'ੀ'), 'u': ('ਉ', 'ੁ'),
+    'oo': ('ਊ', 'ੂ'), 'e': ('ਏ', 'ੇ'), 'ai': ('ਐ', 'ੈ'), 'o': ('ਓ', 'ੋ'), 'au': ('ਔ', 'ੌ'),
+}
+
+# Nukta letters are written decomposed, as normalize_gurmukhi leaves them
+_NUKTA = '਼'
+
+
+class TransliterationScheme:
+    """
+    A transliteration table.
+
+    Args:
+        consonants (dict): Token to output
+        vowels (dict): Token to (independent letter, vowel sign)
+        geminate (str): Mark written before a consonant that is doubled in the
+                        source (Gurmukhi addak), or None to write it twice
+        final_vowels (dict): Vowels that are written differently at the end of
+                             the text, e.g. Roman final 'a' as 'ਾ'
+    """
+
+    def __init__(self, consonants, vowels=None, geminate=None, final_vowels=None):
+        self.consonants = consonants
+        self.vowels = vowels or {}
+        self.geminate = geminate
+        self.final_vowels = final_vowels or {}
+        self.max_token_length = max(map(len, [*consonants, *self.vowels]))
+
+    def transliterate(self, text):
+        """
+        Transliterate text, token by token.
+
+        Args:
+            text (str): Text to transliterate
+
+        Returns:
+            str: The transliterated text
+        """
+        output = []
+        after_consonant = False
+        previous = None
+        position = 0
+        length = len(text)
+
+        while position < length:
+            for size in range(min(self.max_token_length, length - position), 0, -1):
+                token = text[position:position + size]
+                if token in self.consonants:
+                    if self.geminate is not None and token == previous and output:
+                        # A doubled consonant is written once, after the geminate mark
+                        output[-1] = self.geminate + output[-1]
+                    else:
+                        output.append(self.consonants[token])
+                    after_consonant = True
+                    break
+                if token in self.vowels:
+                    if position + size == length and token in self.final_vowels:
+                        independent, sign = self.final_vowels[token]
+                    else:
+                        independent, sign = self.vowels[token]
+                    output.append(sign if after_consonant else independent)
+                    after_consonant = False
+                    break
+            else:
+                size = 1
+                token = text[position]
+                output.append(token)
+                after_consonant = False
+            previous = token
+            position += size
+
+        return ''.join(output)
+
+
+ROMAN_TO_GURMUKHI = TransliterationScheme(
+    consonants={
+        'k': 'ਕ', 'kh': 'ਖ', 'g': 'ਗ', 'gh': 'ਘ', 'c': 'ਕ', 'ch': 'ਚ', 'chh': 'ਛ',
+        'j': 'ਜ', 'jh': 'ਝ', 't': 'ਤ', 'th': 'ਥ', 'd': 'ਦ', 'dh': 'ਧ', 'n': 'ਨ', 'p': 'ਪ',
+        'ph': 'ਫ', 'f': 'ਫ' + _NUKTA, 'b': 'ਬ', 'bh': 'ਭ', 'm': 'ਮ', 'y': 'ਯ', 'r': 'ਰ',
+        'rh': 'ੜ', 'l': 'ਲ', 'v': 'ਵ', 'w': 'ਵ', 's': 'ਸ', 'sh': 'ਸ' + _NUKTA, 'h': 'ਹ',
+        'z': 'ਜ' + _NUKTA, 'q': 'ਕ', 'x': 'ਖ' + _NUKTA,
+    },
+    vowels={**_GURMUKHI_VOWELS, 'ii': _GURMUKHI_VOWELS['ee'], 'uu': _GURMUKHI_VOWELS['oo']},
+    geminate='ੱ',
+    # Roman spellings drop the length of word-final vowels: 'pakka' is 'ਪੱਕਾ', 'paani' is 'ਪਾਨੀ'
+    final_vowels={'a': _GURMUKHI_VOWELS['aa'], 'i': _GURMUKHI_VOWELS['ee'], 'u': _GURMUKHI_VOWELS['oo']},
+)
+
+SHAHMUKHI_TO_GURMUKHI = TransliterationScheme(
+    consonants={
+        'ب': 'ਬ', 'بھ': 'ਭ', 'پ': 'ਪ', 'پھ': 'ਫ', 'ت': 'ਤ', 'تھ': 'ਥ', 'ٹ': 'ਟ', 'ٹھ': 'ਠ',
+        'ث': 'ਸ', 'ج': 'ਜ', 'جھ': 'ਝ', 'چ': 'ਚ', 'چھ': 'ਛ', 'ح': 'ਹ', 'خ': 'ਖ' + _NUKTA,
+        'د': 'ਦ', 'دھ': 'ਧ', 'ڈ': 'ਡ', 'ڈھ': 'ਢ', 'ذ': 'ਜ' + _NUKTA, 'ر': 'ਰ', 'ڑ': 'ੜ',
+        'ز': 'ਜ' + _NUKTA, 'ژ': 'ਜ' + _NUKTA, 'س': 'ਸ', 'ش': 'ਸ' + _NUKTA, 'ص': 'ਸ',
+        'ض': 'ਜ' + _NUKTA, 'ط': 'ਤ', 'ظ': 'ਜ' + _NUKTA, 'غ': 'ਗ' + _NUKTA, 'ف': 'ਫ' + _NUKTA,
+        'ق': 'ਕ', 'ک': 'ਕ', 'ك': 'ਕ', 'کھ': 'ਖ', 'گ': 'ਗ', 'گھ': 'ਘ', 'ل': 'ਲ', 'م': 'ਮ',
+        'ن': 'ਨ', 'ݨ': 'ਣ', 'ں': 'ਂ', 'ہ': 'ਹ', 'ه': 'ਹ', 'ھ': 'ਹ', 'ّ': '',
+    },
+    vowels={
+        'ا': ('ਅ', 'ਾ'), 'آ': ('ਆ', 'ਾ'), 'و': ('ਓ', 'ੋ'), 'ی': ('ਈ', 'ੀ'), 'ي': ('ਈ', 'ੀ'),
+        'ے': ('ਏ', 'ੇ'), 'َ': ('ਅ', ''), 'ِ': ('ਇ', 'ਿ'), 'ُ': ('ਉ', 'ੁ'), 'ع': ('ਅ', ''),
+    },
+)
+
+GURMUKHI_TO_SHAHMUKHI = TransliterationScheme(
+    consonants={
+        'ਕ': 'ک', 'ਖ': 'کھ', 'ਗ': 'گ', 'ਘ': 'گھ', 'ਙ': 'ن', 'ਚ': 'چ', 'ਛ': 'چھ', 'ਜ': 'ج',
+        'ਝ': 'جھ', 'ਞ': 'ن', 'ਟ': 'ٹ', 'ਠ': 'ٹھ', 'ਡ': 'ڈ', 'ਢ': 'ڈھ', 'ਣ': 'ݨ', 'ਤ': 'ت',
+        'ਥ': 'تھ', 'ਦ': 'د', 'ਧ': 'دھ', 'ਨ': 'ن', 'ਪ': 'پ', 'ਫ': 'پھ', 'ਬ': 'ب', 'ਭ': 'بھ',
+        'ਮ': 'م', 'ਯ': 'ی', 'ਰ': 'ر', 'ਲ': 'ل', 'ਵ': 'و', 'ੜ': 'ڑ', 'ਸ': 'س', 'ਹ': 'ہ',
+        'ਸ' + _NUKTA: 'ش', 'ਖ' + _NUKTA: 'خ', 'ਗ' + _NUKTA: 'غ', 'ਜ' + _NUKTA: 'ز',
+        'ਫ' + _NUKTA: 'ف', 'ਲ' + _NUKTA: 'ل', 'ੰ': 'ن', 'ਂ': 'ں', 'ੱ': '',
+    },
+    vowels={
+        'ਅ': ('ا', 'ا'), 'ਆ': ('آ', 'آ'), 'ਇ': ('ا', 'ا'), 'ਈ': ('ای', 'ای'), 'ਉ': ('ا', 'ا'),
+        'ਊ': ('او', 'او'), 'ਏ': ('اے', 'اے'), 'ਐ': ('اے', 'اے'), 'ਓ': ('او', 'او'), 'ਔ': ('او', 'او'),
+        'ਾ': ('ا', 'ا'), 'ਿ': ('', ''), 'ੀ': ('ی', 'ی'), 'ੁ': ('', ''), 'ੂ': ('و', 'و'),
+        'ੇ': ('ے', 'ے'), 'ੈ': ('ے', 'ے'), 'ੋ': ('و', 'و'), 'ੌ': ('و', 'و'),
+    },
+)
+
+
+def _devanagari_table():
+    """Map each Devanagari character to the Gurmukhi character of the same name"""
+    table = {}
+    for code_point in range(0x0900, 0x0980):
+        name = unicodedata.name(chr(code_point), '')
+        try:
+            table[code_point] = unicodedata.lookup(name.replace('DEVANAGARI', 'GURMUKHI'))
+        except KeyError:
+            pass
+    # Punjabi does not write conjuncts, so the virama is dropped
+    table[0x094D] = None
+    table[0x0964] = '।'
+    table[0x0965] = '॥'
+    return table
+
+
+_DEVANAGARI_TO_GURMUKHI = _devanagari_table()
+
+
+def devanagari_to_gurmukhi(text):
+    """Transliterate the Devanagari characters of text to Gurmukhi"""
+    return text.translate(_DEVANAGARI_TO_GURMUKHI)
+
+
+_LATIN_WORD = re.compile(r'[a-z]+')
+_SCRIPTS = {
+    'gurmukhi': re.compile('[\u0a00-\u0a7f]'),
+    'shahmukhi': re.compile('[\u0600-\u06ff\u0750-\u077f]'),
+    'devanagari': re.compile('[\u0900-\u097f]'),
+    'roman': re.compile('[a-z]'),
+}
+
+
+@lru_cache(maxsize=4096)
+def expand_query(query):
+    """
+    Expand a search query into its variants in the other scripts.
+
+    Roman, Shahmukhi and Devanagari text is transliterated to Gurmukhi, and
+    Gurmukhi text to Shahmukhi. Results are cached per process, as most
+    traffic repeats a few thousand queries.
+
+    Args:
+        query (str): The search query
+
+    Returns:
+        tuple: The normalized query followed by its distinct variants
+    """
+    query = normalize_gurmukhi(query).casefold()
+    variants = [query]
+
+    if _SCRIPTS['roman'].search(query):
+        variants.append(_LATIN_WORD.sub(lambda match: ROMAN_TO_GURMUKHI.transliterate(match.group()), query))
+    if _SCRIPTS['shahmukhi'].search(query):
+        variants.append(SHAHMUKHI_TO_GURMUKHI.transliterate(query))
+    if _SCRIPTS['devanagari'].search(query):
+        variants.append(devanagari_to_gurmukhi(query))
+    if _SCRIPTS['gurmukhi'].search(query):
+        variants.append(GURMUKHI_TO_SHAHMUKHI.transliterate(query))
+
+    return tuple(dict.fromkeys(normalize_gurmukhi(variant) for variant in variants if variant.strip()))
@@ -0,0 +1,136 @@
+"""
+Time-decayed trending scores.
+
+Page views are recorded per hour (PageViewBucket, written by
+home.view_counts). The refresh_trending command runs refresh_trending_scores
+hourly: it sums the views of the last TRENDING_WINDOW, each weighted by its
+age so that a view counts half as much after TRENDING_HALF_LIFE hours, and
+replaces the TrendingScore rows with the top TRENDING_PAGES_PER_TYPE pages
+of each content type. A page stops trending soon after its views stop.
+
+The homepage reads the top scores of each content type from the
+(content_type, -score) index, so its trending blocks are index lookups
+rather than sorts of whole tables.
+"""
+
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .page_cache import purge_pages
+
+# Hours after which a view counts half as much
+TRENDING_HALF_LIFE = 24
+
+# Views older than this no longer count; hourly buckets are kept as long
+TRENDING_WINDOW = timedelta(days=7)
+
+# Number of pages of each content type that keep a score
+TRENDING_PAGES_PER_TYPE = 50
+
+
+def current_hour():
+    """Return the start of the current hour"""
+    return timezone.now().replace(minute=0, second=0, microsecond=0)
+
+
+def decay_factor(hours, half_life=TRENDING_HALF_LIFE):
+    """
+    Weight of a view made a number of hours ago.
+
+    Args:
+        hours (float): Age of the view in hours
+        half_life (float): Hours after which a view counts half
+
+    Returns:
+        float: The weight, between 0 and 1
+    """
+    return 0.5 ** (hours / half_life)
+
+
+def refresh_trending_scores(half_life=TRENDING_HALF_LIFE):
+    """
+    Recompute the trending scores from the hourly views of the completed
+    hours in TRENDING_WINDOW (see decay_factor), and drop older buckets.
+
+    Args:
+        half_life (float): Hours after which a view counts half
+
+    Returns:
+        int: Number of pages with a score
+    """
+    from wagtail.models import Page
+
+    from .models import HomePage, PageViewBucket, TrendingScore
+
+    now = current_hour()
+    table = TrendingScore._meta.db_table
+    bucket_table = PageViewBucket._meta.db_table
+    page_table = Page._meta.db_table
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Readers keep seeing the previous scores until the transaction commits;
+        # concurrent refreshes wait for each other
+        cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+        cursor.execute(f"DELETE FROM {table}")
+        # The views of an hour count from the end of that hour
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (page_id, content_type_id, score, hour)
+            SELECT page_id, content_type_id, score, %s FROM (
+                SELECT *, row_number() OVER (PARTITION BY content_type_id ORDER BY score DESC) AS position
+                FROM (
+                    SELECT b.page_id, p.content_type_id,
+                           SUM(b.views * power(0.5, (extract(epoch FROM %s - b.hour) / 3600 - 1) / %s)) AS score
+                    FROM {bucket_table} b JOIN {page_table} p ON p.id = b.page_id
+                    WHERE b.hour >= %s AND b.hour < %s AND p.live
+                    GROUP BY b.page_id, p.content_type_id
+                ) AS scores
+            ) AS ranked
+            WHERE position <= %s
+            """,
+            [now, now, half_life, now - TRENDING_WINDOW, now, TRENDING_PAGES_PER_TYPE],
+        )
+        count = cursor.rowcount
+
+    PageViewBucket.objects.filter(hour__lt=now - TRENDING_WINDOW).delete()
+    # The command runs in its own process, so this relies on the cache being
+    # shared with the web processes (see CACHES); the block expires within the
+    # hour either way. The cached homepage responses are purged with it.
+    HomePage.clear_cached_blocks(['trending'])
+    purge_pages(HomePage.objects.all())
+    return count
+
+
+def get_trending_pages(model, limit=3):
+    """
+    Return the live pages of a model with the highest trending scores.
+
+    Until the scores have been computed (or if too few pages have recent
+    views), the list is completed with the most viewed pages of all time.
+
+    Args:
+        model: Page model, e.g. DictionaryEntryPage
+        limit (int): Number of pages to return
+
+    Returns:
+        list: Pages, most trending first
+    """
+    from .models import TrendingScore
+
+    # Over-fetch, in case some of the top pages are no longer live
+    page_ids = list(
+        TrendingScore.objects
+        .filter(content_type=ContentType.objects.get_for_model(model))
+        .order_by('-score')
+        .values_list('page_id', flat=True)[:limit * 2]
+    )
+    pages = model.objects.live().public().in_bulk(page_ids)
+    trending = [pages[page_id] for page_id in page_ids if page_id in pages][:limit]
+
+    if len(trending) < limit:
+        most_viewed = model.objects.live().public().exclude(pk__in=page_ids).order_by('-view_count')
+        trending.extend(most_viewed[:limit - len(trending)])
+    return trending
@@ -4,6 +4,9 @@
 Utility functions for Punjabi Sahit application
 """
 
+import re
+import unicodedata
+
 # Gurmukhi alphabet order for proper sorting
 GURMUKHI_ALPHABET_ORDER = {
     # Independent vowels
@@ -39,6 +42,135 @@ GURMUKHI_ALPHABET_ORDER = {
 }
 
 
+# ===================================================================
+# Collation engine
+# ===================================================================
+#
+# Text is collated by translating each letter (or multi-code-point letter
+# such as 'ਸ਼') to a single character whose code point is its order value,
+# then encoding the result as UTF-16-BE. Every order value is below 0x10000,
+# so this yields two bytes per letter and the bytes compare exactly like the
+# tuple of order values, in C rather than a Python loop.
+
+# Order value for characters that are not in GURMUKHI_ALPHABET_ORDER
+UNKNOWN_CHARACTER_ORDER = 9999
+
+# Key for empty text, sorting it after everything else
+EMPTY_COLLATION_KEY = b'\xff\xff'
+
+# Precomposed nukta letters and their canonical (decomposed) spelling
+GURMUKHI_PRECOMPOSED_LETTERS = {
+    '\u0a33': '\u0a32\u0a3c',  # ਲ਼
+    '\u0a36': '\u0a38\u0a3c',  # ਸ਼
+    '\u0a59': '\u0a16\u0a3c',  # ਖ਼
+    '\u0a5a': '\u0a17\u0a3c',  # ਗ਼
+    '\u0a5b': '\u0a1c\u0a3c',  # ਜ਼
+    '\u0a5e': '\u0a2b\u0a3c',  # ਫ਼
+}
+
+# Zero-width characters, which are ignored when collating
+ZERO_WIDTH_CHARACTERS = '\u200b\u200c\u200d'
+
+# Letters spelled with more than one code point, longest first
+_MULTI_CODE_POINT_LETTERS = sorted(
+    (letter for letter in GURMUKHI_ALPHABET_ORDER if len(letter) > 1),
+    key=len, reverse=True
+)
+
+# Each multi-code-point letter is first replaced by a private-use placeholder
+_PLACEHOLDERS = {
+    letter: chr(0xE000 + index) for index, letter in enumerate(_MULTI_CODE_POINT_LETTERS)
+}
+
+
+class _CollationTable(dict):
+    """Translation table for str.translate, mapping unknown characters to UNKNOWN_CHARACTER_ORDER"""
+
+    def __missing__(self, code_point):
+        self[code_point] = UNKNOWN_CHARACTER_ORDER
+        return UNKNOWN_CHARACTER_ORDER
+
+
+_COLLATION_TABLE = _CollationTable()
+for _letter, _order in GURMUKHI_ALPHABET_ORDER.items():
+    _COLLATION_TABLE[ord(_PLACEHOLDERS.get(_letter, _letter))] = _order
+for _precomposed, _letter in GURMUKHI_PRECOMPOSED_LETTERS.items():
+    _COLLATION_TABLE[ord(_precomposed)] = GURMUKHI_ALPHABET_ORDER[_letter]
+for _char in ZERO_WIDTH_CHARACTERS:
+    _COLLATION_TABLE[ord(_char)] = None
+
+_DECOMPOSE_TABLE = str.maketrans(GURMUKHI_PRECOMPOSED_LETTERS)
+_NUKTA = '\u0a3c'
+_LETTER_PATTERN = re.compile('|'.join(map(re.escape, _MULTI_CODE_POINT_LETTERS)) + '|.', re.DOTALL)
+
+
+def _collation_string(text):
+    """Translate text to a string whose code points are its collation order values"""
+    text = text.strip()
+    # Precomposed letters are in the table; only decomposed ones need replacing
+    if _NUKTA in text:
+        for letter in _MULTI_CODE_POINT_LETTERS:
+            text = text.replace(letter, _PLACEHOLDERS[letter])
+    return text.translate(_COLLATION_TABLE)
+
+
+def tokenize_gurmukhi(text):
+    """
+    Split Gurmukhi text into letters, keeping multi-code-point letters such as
+    'ਸ਼' (consonant + nukta) together. Precomposed nukta letters are returned
+    in their decomposed spelling.
+
+    Args:
+        text (str): Gurmukhi text to tokenize
+
+    Returns:
+        list: The letters (and other characters) of the text
+    """
+    if not text:
+        return []
+    return _LETTER_PATTERN.findall(text.translate(_DECOMPOSE_TABLE))
+
+
+def gurmukhi_collation_bytes(text):
+    """
+    Generate a compact bytes sort key for Gurmukhi text.
+
+    Keys compare with plain bytes comparison, so they can be used with
+    sorted(), bisect or a database bytes/hex column. Each letter takes two
+    bytes (its big-endian order value).
+
+    Args:
+        text (str): Gurmukhi text to generate the key for
+
+    Returns:
+        bytes: The collation key
+    """
+    if not text:
+        return EMPTY_COLLATION_KEY
+    return _collation_string(text).encode('utf-16-be') or EMPTY_COLLATION_KEY
+
+
+def gurmukhi_collation_keys(texts):
+    """
+    Generate bytes sort keys for many strings at once.
+
+    Equivalent to [gurmukhi_collation_bytes(text) for text in texts], with the
+    per-call overhead kept out of the loop for large batches.
+
+    Args:
+        texts: Iterable of Gurmukhi strings
+
+    Returns:
+        list: The bytes collation key of each string
+    """
+    collation_string = _collation_string
+    empty = EMPTY_COLLATION_KEY
+    return [
+        (collation_string(text).encode('utf-16-be') or empty) if text else empty
+        for text in texts
+    ]
+
+
 def gurmukhi_sort_key(text):
     """
     Generate a sort key for Gurmukhi text based on proper Punjabi alphabetical order.
@@ -49,20 +181,35 @@ def gurmukhi_sort_key(text):
     Returns:
         tuple: A tuple of integers representing the sort order
     """
-    if not text:
+    if not text or not text.strip():
         return (999999,)
 
-    # Convert text to lowercase equivalent if needed
-    text = text.strip()
+    return tuple(map(ord, _collation_string(text)))
 
-    # Generate sort key
-    sort_key = []
-    for char in text:
-        # Get the order value for this character
-        order_value = GURMUKHI_ALPHABET_ORDER.get(char, 9999)
-        sort_key.append(order_value)
 
-    return tuple(sort_key)
+# Maximum length of a stored collation key (see gurmukhi_collation_key)
+GURMUKHI_COLLATION_KEY_LENGTH = 255
+
+
+def gurmukhi_collation_key(text, max_length=GURMUKHI_COLLATION_KEY_LENGTH):
+    """
+    Encode the Gurmukhi collation key of text as a string that can be stored
+    in the database, so that ordering by the column gives the same result as
+    sorting with gurmukhi_collation_bytes.
+
+    The key is the hex form of the bytes key (four hex digits per letter), so
+    plain string comparison of two keys matches comparison of the bytes. Keys
+    are truncated to whole letters within max_length.
+
+    Args:
+        text (str): Gurmukhi text to generate the collation key for
+        max_length (int): Maximum length of the returned key
+
+    Returns:
+        str: Fixed-width hex collation key
+    """
+    key = gurmukhi_collation_bytes(text)[:max_length // 4 * 2]
+    return key.hex()
 
 
 def sort_gurmukhi_items(items, key_func=None):
@@ -77,18 +224,24 @@ def sort_gurmukhi_items(items, key_func=None):
     Returns:
         list: Sorted list of items
     """
+    items = list(items)
     if key_func is None:
         # Items are strings
-        return sorted(items, key=gurmukhi_sort_key)
+        keys = gurmukhi_collation_keys(items)
     else:
         # Items need key extraction
-        return sorted(items, key=lambda item: gurmukhi_sort_key(key_func(item)))
+        keys = gurmukhi_collation_keys([key_func(item) for item in items])
+
+    order = sorted(range(len(items)), key=keys.__getitem__)
+    return [items[index] for index in order]
 
 
 def normalize_gurmukhi(text):
     """
     Normalize Gurmukhi text for comparison and searching.
-    Handles variations in representation.
+    Handles variations in representation: zero-width characters, runs of
+    whitespace and precomposed nukta letters (which NFC decomposes, so 'ਸ਼'
+    typed either way gives the same text).
 
     Args:
         text (str): Gurmukhi text to normalize
@@ -104,8 +257,11 @@ def normalize_gurmukhi(text):
     text = text.replace('\u200c', '')  # Zero-width non-joiner
     text = text.replace('\u200d', '')  # Zero-width joiner
 
+    # Canonical form: precomposed nukta letters are decomposed and combining
+    # marks are put in canonical order
+    text = unicodedata.normalize('NFC', text)
+
     # Normalize multiple spaces to single space
-    import re
     text = re.sub(r'\s+', ' ', text)
 
     return text.strip()
@@ -113,25 +269,21 @@ def normalize_gurmukhi(text):
 
 def extract_first_letter_gurmukhi(text):
     """
-    Extract the first significant letter from Gurmukhi text.
-    Useful for alphabetical grouping.
+    Extract the letter Gurmukhi text is collated by, for alphabetical grouping.
+
+    Text that starts with a character outside the alphabet (Latin letters,
+    quotes, ...) sorts after every letter, so it gets no letter rather than
+    the first one found further in.
 
     Args:
         text (str): Gurmukhi text
 
     Returns:
-        str: First significant letter or empty string
+        str: First letter (keeping nukta letters such as 'ਸ਼' whole), or empty string
     """
-    if not text:
-        return ""
-
-    text = normalize_gurmukhi(text)
-
-    # Find first character that's in our alphabet
-    for char in text:
-        if char in GURMUKHI_ALPHABET_ORDER:
-            return char
-
+    letters = tokenize_gurmukhi(normalize_gurmukhi(text))
+    if letters and letters[0] in GURMUKHI_ALPHABET_ORDER:
+        return letters[0]
     return ""
 
 
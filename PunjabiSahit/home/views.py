@@ -5,13 +5,26 @@ View functions for the Punjabi Sahit home application.
 This module contains AJAX endpoints and view handlers for:
 - Book reading status management
 - User interactions with books (favorites, ratings, notes)
+- Dictionary headword autocomplete
+- Streaming NDJSON export of the dictionary, idioms and phrases
+- The admin report of the pages with the most unique visitors
 """
 
 import json
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+import django_filters
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET, require_POST
 from django.contrib.auth.decorators import login_required
+from wagtail.admin.filters import WagtailFilterSet
+from wagtail.admin.ui.tables import Column, TitleColumn
+from wagtail.admin.views.reports import ReportView
+from wagtail.models import Page, Site
+from wagtail.permissions import page_permission_policy
+from .autocomplete import AUTOCOMPLETE_MAX_RESULTS, get_autocomplete_index
+from .export import EXPORT_TYPES, generate_export_lines, is_export_allowed, parse_since
 from .models import UserBookStatus, BookPage
+from .visitors import rank_by_unique_visitors
 
 
 @login_required
@@ -113,3 +126,139 @@ def delete_book_status(request):
 
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
+
+
+def _relative_url(url_path, root_paths):
+    """Turn a page's url_path into a URL relative to the site it belongs to"""
+    for root_path in root_paths:
+        if url_path.startswith(root_path):
+            return url_path[len(root_path) - 1:]
+    return None
+
+
+@require_GET
+def dictionary_autocomplete(request):
+    """
+    AJAX endpoint suggesting dictionary entries for a partly typed headword.
+
+    Matches the start of the Gurmukhi, Shahmukhi and Roman headwords from an
+    in-memory index (see home.autocomplete), most viewed entries first.
+
+    Args:
+        request: HTTP GET request with parameters:
+            - q: The text typed so far
+            - limit: Maximum number of suggestions (default 10)
+
+    Returns:
+        JsonResponse: The query and a list of matching entries
+    """
+    query = request.GET.get('q', '')
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), AUTOCOMPLETE_MAX_RESULTS)
+    except ValueError:
+        limit = 10
+
+    root_paths = [root_path.root_path for root_path in Site.get_site_root_paths()]
+    results = [
+        {
+            'id': row['id'],
+            'gurmukhi': row['headword_gurmukhi'],
+            'shahmukhi': row['headword_shahmukhi'],
+            'roman': row['headword_roman_simple'],
+            'url': _relative_url(row['url_path'], root_paths),
+        }
+        for row in get_autocomplete_index().lookup(query, limit)
+    ]
+
+    return JsonResponse({'query': query, 'results': results})
+
+
+@require_GET
+def export_content(request):
+    """
+    Stream every live dictionary entry, idiom and phrase as NDJSON.
+
+    Only staff users and clients with an API key (see home.export) may export.
+
+    Args:
+        request: HTTP GET request with optional parameters:
+            - since: ISO date or datetime; only pages published (or removed) after it are exported
+            - types: Comma-separated page types (dictionary_entry, idiom, phrase)
+
+    Returns:
+        StreamingHttpResponse: One JSON object per line. The X-Export-Time
+        header holds the time the export started, to pass as `since` next time.
+
+    Raises:
+        400: If `since` or `types` is invalid
+        401: If the request is neither from staff nor has a valid API key
+    """
+    if not is_export_allowed(request):
+        response = JsonResponse({'error': 'Authentication required'}, status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+
+    exported_at = timezone.now()
+
+    since = request.GET.get('since')
+    if since:
+        try:
+            since = parse_since(since)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+    types = [name for name in request.GET.get('types', '').split(',') if name]
+    unknown = [name for name in types if name not in EXPORT_TYPES]
+    if unknown:
+        return JsonResponse({'error': f"Unknown types: {', '.join(unknown)}"}, status=400)
+
+    response = StreamingHttpResponse(
+        generate_export_lines(types, since or None),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
+    response['X-Export-Time'] = exported_at.isoformat()
+    return response
+
+
+class UniqueVisitorsFilterSet(WagtailFilterSet):
+    period = django_filters.ChoiceFilter(
+        choices=[('week', "Last 7 days"), ('day', "Today"), ('month', "Last 30 days")],
+        empty_label=None, method='filter_period',
+    )
+
+    class Meta:
+        model = Page
+        fields = []
+
+    def filter_period(self, queryset, name, value):
+        # The period is applied by the ranking itself (see UniqueVisitorsReportView)
+        return queryset
+
+
+class UniqueVisitorsReportView(ReportView):
+    """
+    Admin report of the live pages with the most unique visitors over a day,
+    week or month, estimated from the daily visitor sketches (home.visitors).
+    The unique_visitors command prints the same ranking.
+    """
+    page_title = "Unique visitors"
+    header_icon = "view"
+    index_url_name = 'unique_visitors_report'
+    index_results_url_name = 'unique_visitors_report_results'
+    filterset_class = UniqueVisitorsFilterSet
+    permission_policy = page_permission_policy
+    any_permission_required = ['add', 'change', 'publish']
+    columns = [
+        TitleColumn('title', label="Title", url_name='wagtailadmin_pages:edit'),
+        Column('url_path', label="Path"),
+        Column('unique_visitors', label="Unique visitors"),
+    ]
+    list_export = ['title', 'url_path', 'unique_visitors']
+    # Number of pages ranked
+    limit = 100
+
+    def get_filtered_queryset(self):
+        period = 'week'
+        if self.filters and self.filters.is_valid():
+            period = self.filters.form.cleaned_data['period'] or period
+        return rank_by_unique_visitors(Page.objects.live(), period, self.limit)
@@ -0,0 +1,281 @@
+"""
+Unique visitor estimates from HyperLogLog sketches.
+
+view_count counts every view, including reloads, bots and prefetches. For
+unique visitors, each page has one HyperLogLog sketch per day
+(PageVisitorSketch): 4096 one-byte registers, zlib-compressed, from which
+the number of distinct visitors is estimated within about 2%. No visitor is
+stored. The sketches of several days merge register by register into the
+sketch of the whole period, so weekly and monthly figures count a visitor
+who came back on several days once.
+
+Visits are buffered per worker in a HitBuffer (home.buffering) as hashes
+of the visitor, and merged into the stored sketches in batches. Requests
+from crawlers and browser prefetches are not counted.
+"""
+
+import hashlib
+import math
+import re
+import zlib
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from wagtail.models import Page
+
+from .buffering import HitBuffer
+from .models import PageVisitorSketch
+
+# Number of reverse proxies in front of Django that append to X-Forwarded-For (see settings)
+TRUSTED_PROXY_COUNT = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+
+# Number of days the named periods cover
+VISITOR_PERIODS = {'day': 1, 'week': 7, 'month': 30}
+
+# Register index bits: 2 ** 12 registers, a standard error of 1.04 / 64
+HLL_PRECISION = 12
+
+# rank_by_unique_visitors merges the sketches of this many times as many
+# candidate pages as it returns
+RANKING_CANDIDATES_FACTOR = 5
+
+# User agents of crawlers, monitors and HTTP libraries
+BOT_USER_AGENTS = re.compile(
+    r'bot|crawl|spider|slurp|archiver|facebookexternalhit|embedly|preview|monitor|pingdom|'
+    r'headless|lighthouse|curl|wget|python-requests|httpx|aiohttp|go-http-client|java/|okhttp|scrapy',
+    re.IGNORECASE,
+)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch of a set of 64-bit hashes.
+
+    Args:
+        registers (bytes): Registers of a stored sketch, or None for an empty sketch
+    """
+
+    size = 1 << HLL_PRECISION
+
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers) if registers else bytearray(self.size)
+
+    @staticmethod
+    def hash(value):
+        """Return the 64-bit hash of a string, the same in every process"""
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
+    def add_hash(self, value_hash):
+        """Add a 64-bit hash to the sketch"""
+        index = value_hash >> (64 - HLL_PRECISION)
+        rest = value_hash & ((1 << (64 - HLL_PRECISION)) - 1)
+        rank = 64 - HLL_PRECISION - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, value):
+        """Add a string to the sketch"""
+        self.add_hash(self.hash(value))
+
+    def merge(self, other):
+        """Add every value of another sketch to this one"""
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        """Estimate the number of distinct values added"""
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Linear counting is more accurate for small sets
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def to_bytes(self):
+        """Serialize the sketch; the registers of sparse sketches compress well"""
+        return zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Load a sketch serialized with to_bytes"""
+        return cls(zlib.decompress(data))
+
+
+def is_countable_visit(request):
+    """
+    Check whether a request comes from a person, rather than a crawler or a prefetch.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        bool: True if the visit should be counted
+    """
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    if not user_agent or BOT_USER_AGENTS.search(user_agent):
+        return False
+    purpose = request.META.get('HTTP_SEC_PURPOSE') or request.META.get('HTTP_PURPOSE') or request.META.get('HTTP_X_MOZ', '')
+    return 'prefetch' not in purpose.lower()
+
+
+def client_address(request):
+    """
+    Return the address of the client that sent a request.
+
+    X-Forwarded-For is only read as far as TRUSTED_PROXY_COUNT proxies of
+    our own wrote it: each appends the address it received the request from,
+    so the entry the outermost one appended is the client. Entries before it
+    were sent by the client and can be anything.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        str: The IP address
+    """
+    if TRUSTED_PROXY_COUNT:
+        forwarded = [address.strip() for address in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        forwarded = [address for address in forwarded if address]
+        if len(forwarded) >= TRUSTED_PROXY_COUNT:
+            return forwarded[-TRUSTED_PROXY_COUNT]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def visitor_hash(request):
+    """
+    Hash identifying the visitor of a request: the user when logged in,
+    otherwise the client address and browser.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        int: 64-bit hash
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        visitor = f'user:{user.pk}'
+    else:
+        visitor = f"{client_address(request)}|{request.META.get('HTTP_USER_AGENT', '')}|{request.META.get('HTTP_ACCEPT_LANGUAGE', '')}"
+    return HyperLogLog.hash(visitor)
+
+
+def save_visits(counts):
+    """
+    Merge buffered visits into the stored daily sketches.
+
+    Args:
+        counts (dict): {(page id, date, visitor hash): views}
+    """
+    sketches = defaultdict(HyperLogLog)
+    for page_id, date, hashed in counts:
+        sketches[page_id, date].add_hash(hashed)
+
+    # Pages deleted since they were visited are skipped, rather than failing the whole batch
+    existing = set(Page.objects.filter(pk__in={page_id for page_id, date in sketches}).values_list('pk', flat=True))
+    keys = sorted(key for key in sketches if key[0] in existing)
+    if not keys:
+        return
+    with transaction.atomic():
+        # Create missing rows first, so the rows can be locked, always in the same order
+        PageVisitorSketch.objects.bulk_create(
+            [PageVisitorSketch(page_id=page_id, date=date) for page_id, date in keys],
+            ignore_conflicts=True,
+        )
+        condition = Q()
+        for date in {date for page_id, date in keys}:
+            condition |= Q(date=date, page_id__in=[page_id for page_id, key_date in keys if key_date == date])
+        rows = PageVisitorSketch.objects.select_for_update().filter(condition).order_by('page_id', 'date')
+
+        for row in rows:
+            sketch = sketches[row.page_id, row.date]
+            if row.sketch:
+                sketch.merge(HyperLogLog.from_bytes(row.sketch))
+            row.sketch = sketch.to_bytes()
+            row.visitors = sketch.count()
+        PageVisitorSketch.objects.bulk_update(rows, ['sketch', 'visitors'])
+
+
+visits = HitBuffer(save_visits)
+
+
+def count_visit(request, page_id):
+    """
+    Count a visit to a page, unless it comes from a crawler or a prefetch.
+
+    Args:
+        request: The HTTP request
+        page_id (int): Id of the page that was viewed
+    """
+    if is_countable_visit(request):
+        visits.add((page_id, timezone.localdate(), visitor_hash(request)))
+
+
+def _period_sketches(page_ids, days):
+    """Merge the sketches of the last `days` days (today included) per page"""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    sketches = defaultdict(HyperLogLog)
+    rows = (
+        PageVisitorSketch.objects
+        .filter(page_id__in=page_ids, date__gte=since)
+        .values_list('page_id', 'sketch')
+    )
+    for page_id, data in rows.iterator():
+        sketches[page_id].merge(HyperLogLog.from_bytes(data))
+    return sketches
+
+
+def get_unique_visitors(page_ids, period='week'):
+    """
+    Estimate the unique visitors of pages over a period.
+
+    Args:
+        page_ids (list): Ids of the pages
+        period (str): 'day', 'week' or 'month' (see VISITOR_PERIODS)
+
+    Returns:
+        dict: {page id: estimated unique visitors}; pages without visits are left out
+    """
+    days = VISITOR_PERIODS[period]
+    return {page_id: sketch.count() for page_id, sketch in _period_sketches(page_ids, days).items()}
+
+
+def rank_by_unique_visitors(queryset, period='week', limit=10):
+    """
+    Return the pages of a queryset with the most unique visitors over a period.
+
+    The sum of the daily estimates (an upper bound of the period's uniques)
+    preselects the candidates, whose sketches are then merged.
+
+    Args:
+        queryset: Page queryset to rank
+        period (str): 'day', 'week' or 'month' (see VISITOR_PERIODS)
+        limit (int): Maximum number of pages to return
+
+    Returns:
+        list: Pages, most unique visitors first, each with a `unique_visitors` attribute
+    """
+    days = VISITOR_PERIODS[period]
+    since = timezone.localdate() - timedelta(days=days - 1)
+    totals = dict(
+        PageVisitorSketch.objects
+        .filter(date__gte=since, page_id__in=queryset.values('pk'))
+        .values('page_id')
+        .annotate(total=Sum('visitors'))
+        .order_by('-total', 'page_id')
+        .values_list('page_id', 'total')[:limit * RANKING_CANDIDATES_FACTOR]
+    )
+    # A single day's estimate needs no merge
+    counts = totals if days == 1 else get_unique_visitors(list(totals), period)
+
+    pages = queryset.in_bulk(list(totals))
+    for page_id, page in pages.items():
+        page.unique_visitors = counts.get(page_id, 0)
+    ranked = sorted(pages.values(), key=lambda page: (-page.unique_visitors, page.pk))
+    return ranked[:limit]
@@ -0,0 +1,46 @@
+from django.urls import path, reverse
+
+from wagtail import hooks
+from wagtail.admin.menu import MenuItem
+from wagtail.permissions import page_permission_policy
+
+from .views import UniqueVisitorsReportView
+
+
+@hooks.register('on_serve_page')
+def remember_served_page(next_serve_page):
+    """
+    Record the page a request is served, as request.wagtail_page, for the
+    view counting and page cache middleware (home.middleware).
+
+    on_serve_page hooks wrap the page's serve() itself, so pages that are not
+    served (e.g. a privacy restriction asks for a password) are not recorded.
+    """
+    def serve_page(page, request, args, kwargs):
+        request.wagtail_page = page
+        return next_serve_page(page, request, args, kwargs)
+
+    return serve_page
+
+
+@hooks.register('register_admin_urls')
+def register_unique_visitors_report_urls():
+    return [
+        path('reports/unique-visitors/', UniqueVisitorsReportView.as_view(), name='unique_visitors_report'),
+        path(
+            'reports/unique-visitors/results/', UniqueVisitorsReportView.as_view(results_only=True),
+            name='unique_visitors_report_results',
+        ),
+    ]
+
+
+class UniqueVisitorsMenuItem(MenuItem):
+    def is_shown(self, request):
+        return page_permission_policy.user_has_any_permission(request.user, UniqueVisitorsReportView.any_permission_required)
+
+
+@hooks.register('register_reports_menu_item')
+def register_unique_visitors_report_menu_item():
+    return UniqueVisitorsMenuItem(
+        "Unique visitors", reverse('unique_visitors_report'), name='unique-visitors', icon_name='view', order=1100,
+    )
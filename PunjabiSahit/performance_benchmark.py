@@ -229,6 +229,40 @@ def check_cache_performance():
 #    print(f"  Dictionary Entry Detail:")
 #    print_metric("    Queries", len(connection.queries), "queries", good_threshold=3, bad_threshold=8)
 
+def _legacy_gurmukhi_sort_key(text):
+    """Character-by-character sort key used before the compiled collation engine"""
+    from home.utils import GURMUKHI_ALPHABET_ORDER
+    if not text:
+        return (999999,)
+    key = []
+    for char in text.strip():
+        key.append(GURMUKHI_ALPHABET_ORDER.get(char, 9999))
+    return tuple(key)
+
+def benchmark_collation(sample_size=50000):
+    """Compare Gurmukhi collation key throughput against the legacy function"""
+    from home.utils import gurmukhi_collation_bytes, gurmukhi_collation_keys
+    import random
+
+    print_header("GURMUKHI COLLATION")
+
+    rng = random.Random(42)
+    letters = [chr(c) for c in range(0x0A05, 0x0A75)] + ['\u0a38\u0a3c', '\u0a16\u0a3c']
+    words = [''.join(rng.choice(letters) for _ in range(rng.randint(2, 12))) for _ in range(sample_size)]
+
+    def throughput(func):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        return f"{sample_size / elapsed:,.0f}"
+
+    print(f"  {sample_size} random words:")
+    print_metric("  - Legacy key (per word)", throughput(lambda: [_legacy_gurmukhi_sort_key(w) for w in words]), "words/s")
+    print_metric("  - Bytes key (per word)", throughput(lambda: [gurmukhi_collation_bytes(w) for w in words]), "words/s")
+    print_metric("  - Bytes keys (batch)", throughput(lambda: gurmukhi_collation_keys(words)), "words/s")
+    print_metric("  - Legacy sort", throughput(lambda: sorted(words, key=_legacy_gurmukhi_sort_key)), "words/s")
+    print_metric("  - Batch sort", throughput(lambda: [w for _, w in sorted(zip(gurmukhi_collation_keys(words), words))]), "words/s")
+
 def generate_summary(page_results):
     """Generate overall performance summary"""
     print_header("PERFORMANCE SUMMARY")
@@ -275,6 +309,7 @@ def main():
     check_n_plus_one()
     check_database_indexes()
     check_cache_performance()
+    benchmark_collation()
     #     analyze_query_complexity()
     generate_summary(page_results)
 
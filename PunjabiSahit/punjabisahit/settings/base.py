@@ -6,7 +6,7 @@ SECRET_KEY = "django-insecure-your-secret-key"
 DEBUG = True
 ALLOWED_HOSTS = ['*']
 
-INSTALLED_APPS = [ "home", "search", "rest_framework", "modelcluster", "taggit", "wagtail", "wagtail.contrib.forms", "wagtail.contrib.redirects", "wagtail.embeds", "wagtail.sites", "wagtail.users", "wagtail.snippets", "wagtail.documents", "wagtail.images", "wagtail.search", "wagtail.admin", "django.contrib.admin", "django.contrib.auth", "django.contrib.contenttypes", "django.contrib.sessions", "django.contrib.messages", "django.contrib.staticfiles" ]
+INSTALLED_APPS = [ "home", "search", "rest_framework", "modelcluster", "taggit", "wagtail", "wagtail.contrib.forms", "wagtail.contrib.redirects", "wagtail.embeds", "wagtail.sites", "wagtail.users", "wagtail.snippets", "wagtail.documents", "wagtail.images", "wagtail.search", "wagtail.admin", "django.contrib.admin", "django.contrib.auth", "django.contrib.contenttypes", "django.contrib.sessions", "django.contrib.messages", "django.contrib.staticfiles", "django.contrib.postgres" ]
 
 MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -20,6 +20,8 @@ MIDDLEWARE = [
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
     # === ADD OUR NEW MIDDLEWARE HERE ===
     "home.middleware.views.PageViewCounterMiddleware",
+    # Full-page cache for anonymous visitors, enabled with PAGE_CACHE_ENABLED
+    "home.middleware.page_cache.PageCacheMiddleware",
 ]
 
 ROOT_URLCONF = "punjabisahit.urls"
@@ -76,6 +78,30 @@ STATIC_URL = "/static/"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 WAGTAIL_SITE_NAME = "Punjabi Sahit"
-WAGTAILSEARCH_BACKENDS = { "default": { "BACKEND": "wagtail.search.backends.database", } }
+WAGTAILSEARCH_BACKENDS = { "default": { "BACKEND": "home.search_backend", } }
 WAGTAILADMIN_BASE_URL = "http://localhost:8000"
-DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
\ No newline at end of file
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+# Page views are buffered per worker and written after this many views or seconds (home.view_counts)
+VIEW_COUNT_FLUSH_HITS = 500
+VIEW_COUNT_FLUSH_INTERVAL = 30
+# Serve Wagtail pages to anonymous visitors from a full-page cache, purged on publish (home.page_cache)
+PAGE_CACHE_ENABLED = False
+PAGE_CACHE_TIMEOUT = 60 * 60
+# Pre-render detail pages to this directory for nginx to serve (home.prerender); None disables it.
+# Views of the pages nginx serves from it are not counted.
+PRERENDER_ROOT = None
+# Number of reverse proxies in front of Django that append the client address to
+# X-Forwarded-For (e.g. 1 for nginx); 0 uses REMOTE_ADDR (home.visitors)
+TRUSTED_PROXY_COUNT = int(os.environ.get("TRUSTED_PROXY_COUNT", "0"))
+# Shared by all processes: the generation counters of the in-memory indexes
+# (home.process_index) and of the cached results must be seen by every worker
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/1"),
+    }
+}
+# Searches a query needs (over the last 30 days) to be listed as a popular search (home.search_stats)
+POPULAR_SEARCH_MIN_HITS = 5
+# Bearer tokens accepted by the /api/export/ view besides staff logins (home.export)
+EXPORT_API_KEYS = [key for key in os.environ.get("EXPORT_API_KEYS", "").split(",") if key]
\ No newline at end of file
@@ -17,6 +17,8 @@ urlpatterns = [
     path("search/", search_views.search, name="search"),
     path("api/books/update-status/", home_views.update_book_status, name="update_book_status"),
     path("api/books/delete-status/", home_views.delete_book_status, name="delete_book_status"),
+    path("api/dictionary/autocomplete/", home_views.dictionary_autocomplete, name="dictionary_autocomplete"),
+    path("api/export/", home_views.export_content, name="export_content"),
     path('i18n/', include('django.conf.urls.i18n')),  # Language switching endpoint
 ]
 
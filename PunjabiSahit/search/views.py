@@ -1,34 +1,30 @@
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.template.response import TemplateResponse
 
-from wagtail.models import Page
-
-# To enable logging of search queries for use with the "Promoted search results" module
-# <https://docs.wagtail.org/en/stable/reference/contrib/searchpromotions.html>
-# uncomment the following line and the lines indicated in the search function
-# (after adding wagtail.contrib.search_promotions to INSTALLED_APPS):
-
-# from wagtail.contrib.search_promotions.models import Query
+from home.search_stats import get_search_report, log_search
+from home.searching import federated_search, load_federated_results
+from home.spelling import suggest_spelling
+from home.visitors import is_countable_visit
 
 
 def search(request):
     search_query = request.GET.get("query", None)
     page = request.GET.get("page", 1)
 
-    # Search
+    # Search pages and authors in one ranking (cached until either changes)
     if search_query:
-        search_results = Page.objects.live().search(search_query)
+        results = federated_search(search_query)
 
-        # To log this query for use with the "Promoted search results" module:
-
-        # query = Query.get(search_query)
-        # query.add_hit()
+        # Count the search once, on its first page, unless a crawler made it
+        # (buffered, written in batches)
+        if str(page) == "1" and is_countable_visit(request):
+            log_search(search_query, found=bool(results))
 
     else:
-        search_results = Page.objects.none()
+        results = []
 
     # Pagination
-    paginator = Paginator(search_results, 10)
+    paginator = Paginator(results, 10)
     try:
         search_results = paginator.page(page)
     except PageNotAnInteger:
@@ -36,11 +32,16 @@ def search(request):
     except EmptyPage:
         search_results = paginator.page(paginator.num_pages)
 
+    # Load only the pages and authors shown, keeping the ranking
+    search_results.object_list = load_federated_results(search_results.object_list)
+
     return TemplateResponse(
         request,
         "search/search.html",
         {
             "search_query": search_query,
             "search_results": search_results,
+            "popular_searches": get_search_report()["popular"],
+            "spelling_suggestion": suggest_spelling(search_query) if search_query and not results else None,
         },
     )